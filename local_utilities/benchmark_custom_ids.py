@@ -0,0 +1,112 @@
+"""Benchmark the serialization of custom IDs.
+
+Compares the previous custom ID methods, which re-split and validated every field through pydantic,
+against the codec which is compiled once per custom ID class, by time per round trip and by length.
+
+Run from the root of the repository with the same environment as the bot, with COMPACT_CUSTOM_IDS=true to
+also compare the lengths of compacted custom IDs:
+    python3.12 local_utilities/benchmark_custom_ids.py
+"""
+
+import sys
+import time
+
+sys.path.insert(0, "src")
+
+from commands.unbind import UnbindCustomID
+from commands.viewbinds import ViewbindsCustomID
+from resources.response import PromptCustomID
+from resources.ui.components import BaseCustomID
+from resources.ui.pagination import PaginatorCustomID
+
+ITERATIONS = 20_000
+USER_ID = 84117866944663552
+MESSAGE_ID = 1205364327380443247
+
+
+def legacy_from_str(cls: type[BaseCustomID], custom_id: str, **kwargs) -> BaseCustomID:
+    parts = custom_id.split(":")
+    attrs_parts = {field_tuple[0]: parts[index] for index, field_tuple in enumerate(cls.model_fields_index())}
+
+    for field_name, value in dict(attrs_parts).items():
+        if value == "":
+            del attrs_parts[field_name]
+
+    return cls(**attrs_parts, **kwargs)
+
+
+def legacy_str(custom_id: BaseCustomID) -> str:
+    field_values: list[str] = []
+
+    for field_name in custom_id.model_fields:
+        field_value = getattr(custom_id, field_name)
+
+        if field_value is None:
+            field_values.append("")
+        else:
+            field_values.append(str(field_value))
+
+    return ":".join(field_values)
+
+
+def legacy_set_fields(custom_id: BaseCustomID, **kwargs) -> BaseCustomID:
+    parts = legacy_str(custom_id).split(":")
+    attrs_parts = {field_tuple[0]: parts[index] for index, field_tuple in enumerate(custom_id.model_fields_index())}
+
+    for field_name, value in dict(attrs_parts).items():
+        if value == "":
+            del attrs_parts[field_name]
+
+    for field_name, value in kwargs.items():
+        setattr(custom_id, field_name, value)
+
+    return custom_id
+
+
+CUSTOM_IDS: list[tuple[type[BaseCustomID], dict]] = [
+    (
+        PromptCustomID,
+        dict(
+            command_name="bind",
+            prompt_name="GroupPrompt",
+            user_id=USER_ID,
+            page_number=2,
+            component_custom_id="criteria_select",
+            prompt_message_id=MESSAGE_ID,
+        ),
+    ),
+    (PaginatorCustomID, dict(command_name="viewbinds", user_id=USER_ID, page_number=3, include_cancel_button=True)),
+    (UnbindCustomID, dict(command_name="unbind", user_id=USER_ID, category="group", id=1337)),
+    (ViewbindsCustomID, dict(command_name="viewbinds", user_id=USER_ID, category="badge", id=MESSAGE_ID)),
+]
+
+
+def round_trip(custom_id_format: type[BaseCustomID], fields: dict, legacy: bool) -> str:
+    """Build a custom ID, serialize it, parse it back and change a field, as a component click does."""
+
+    if legacy:
+        custom_id = legacy_str(custom_id_format(**fields))
+        legacy_set_fields(legacy_from_str(custom_id_format, custom_id), page_number=1)
+    else:
+        custom_id = str(custom_id_format(**fields))
+        custom_id_format.from_str(custom_id).set_fields(page_number=1)
+
+    return custom_id
+
+
+def benchmark(custom_id_format: type[BaseCustomID], fields: dict):
+    for name, legacy in (("before", True), ("after", False)):
+        started_at = time.perf_counter()
+        for _ in range(ITERATIONS):
+            custom_id = round_trip(custom_id_format, fields, legacy)
+        elapsed = time.perf_counter() - started_at
+
+        print(
+            f"{custom_id_format.__name__:<18} {name:<8} {elapsed / ITERATIONS * 1_000_000:8.2f} µs/round trip "
+            f"{len(custom_id):4} characters  {custom_id}"
+        )
+
+
+if __name__ == "__main__":
+    for custom_id_format, fields in CUSTOM_IDS:
+        benchmark(custom_id_format, fields)
@@ -0,0 +1,137 @@
+"""Benchmark the objects that are created for every interaction.
+
+Compares the pydantic models that were previously used for CommandContext, Page and PromptPageData
+against the slotted dataclasses that replaced them, by time and memory allocated per interaction.
+
+Run from the root of the repository with the same environment as the bot:
+    python3.12 local_utilities/benchmark_interaction_objects.py
+"""
+
+import sys
+import time
+import tracemalloc
+from types import SimpleNamespace
+from typing import Annotated, Callable
+
+sys.path.insert(0, "src")
+
+import hikari
+from bloxlink_lib import BaseModel, BaseModelArbitraryTypes
+from pydantic import Field
+
+from resources.commands import CommandContext
+from resources.response import Page, PromptPageData, Response
+
+ITERATIONS = 20_000
+
+
+class LegacyResponse:
+    """Response as it was before it had __slots__."""
+
+    def __init__(self, interaction):
+        self.interaction = interaction
+        self.user_id = interaction.user.id
+        self.responded = False
+        self.deferred = False
+        self.defer_through_rest = False
+
+
+class LegacyCommandContext(BaseModelArbitraryTypes):
+    command_name: str | None
+    subcommand_name: str | None
+    command_id: int | None
+    guild_id: int
+    member: object
+    user: object
+    resolved: object | None
+    options: Annotated[dict[str, str | int | None], Field(default_factory=dict)]
+    interaction: object
+    response: object
+
+
+class LegacyPromptPageData(BaseModel):
+    description: str
+    components: list = Field(default_factory=list)
+    title: str = None
+    fields: list = Field(default_factory=list)
+    color: int = None
+    footer_text: str = None
+
+
+class LegacyPage(BaseModel):
+    func: Callable
+    details: LegacyPromptPageData
+    page_number: int
+    programmatic: bool = False
+    edited: bool = False
+
+
+def fake_interaction() -> SimpleNamespace:
+    user = SimpleNamespace(id=84117866944663552)
+
+    return SimpleNamespace(
+        type=hikari.InteractionType.MESSAGE_COMPONENT,
+        user=user,
+        member=user,
+        guild_id=439265180988211211,
+        command_name="bind",
+        command_id=1,
+        resolved=None,
+        options=None,
+    )
+
+
+def simulate_interaction(interaction, response_cls, context_cls, page_data_cls, page_cls) -> list:
+    """Create the objects of a typical prompt interaction: a response, two contexts and three pages."""
+
+    response = response_cls(interaction)
+    contexts = [
+        context_cls(
+            command_name=interaction.command_name,
+            subcommand_name=None,
+            command_id=interaction.command_id,
+            guild_id=interaction.guild_id,
+            member=interaction.member,
+            user=interaction.user,
+            resolved=interaction.resolved,
+            options={},
+            interaction=interaction,
+            response=response,
+        )
+        for _ in range(2)
+    ]
+    pages = [
+        page_cls(
+            func=simulate_interaction,
+            details=page_data_cls(description="Page description", title="Page title", components=[]),
+            page_number=page_number,
+        )
+        for page_number in range(3)
+    ]
+
+    return [response, contexts, pages]
+
+
+def benchmark(name: str, *classes):
+    interaction = fake_interaction()
+
+    started_at = time.perf_counter()
+    for _ in range(ITERATIONS):
+        simulate_interaction(interaction, *classes)
+    elapsed = time.perf_counter() - started_at
+
+    tracemalloc.start()
+    kept_alive = [simulate_interaction(interaction, *classes) for _ in range(ITERATIONS)]
+    allocated, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del kept_alive
+
+    print(
+        f"{name:<8} {elapsed / ITERATIONS * 1_000_000:8.2f} µs/interaction "
+        f"{allocated / ITERATIONS:10.0f} bytes/interaction"
+    )
+
+
+if __name__ == "__main__":
+    benchmark("before", LegacyResponse, LegacyCommandContext, LegacyPromptPageData, LegacyPage)
+    benchmark("after", Response, CommandContext, PromptPageData, Page)
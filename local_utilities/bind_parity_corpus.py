@@ -0,0 +1,232 @@
+"""Check the local bind evaluator against a corpus of members whose roles and nickname are known.
+
+Every case is a guild with binds, a member, and what the bind API gives that member. The corpus covers each kind
+of bind criteria. Before the evaluator is switched to local mode, add any disagreement that the shadow mode logs
+here, with the bind API's answer as the expected result.
+
+Run from the root of the repository with the same environment as the bot:
+    python3.12 local_utilities/bind_parity_corpus.py
+"""
+
+import sys
+from dataclasses import dataclass, field
+
+sys.path.insert(0, "src")
+
+from bloxlink_lib import GuildBind, GuildData
+
+from resources.bind_evaluator import OwnedItem, compile_binds
+from resources.guild_snapshot import GuildSnapshot, RoleSnapshot
+
+GUILD_ID = 439265180988211211
+GROUP_ID = 3587262
+
+VERIFIED = 10
+UNVERIFIED = 11
+MEMBER = 20
+OFFICER = 21
+ADMIN = 22
+GUEST = 23
+BADGE = 30
+PASS = 31
+BOOSTER = 40  # managed by Discord
+RANK_MEMBER = 50
+RANK_OFFICER = 51
+
+ROLES = {
+    VERIFIED: "Verified",
+    UNVERIFIED: "Unverified",
+    MEMBER: "Member",
+    OFFICER: "Officer",
+    ADMIN: "Admin",
+    GUEST: "Guest",
+    BADGE: "Badge Owner",
+    PASS: "VIP",
+    BOOSTER: "Server Booster",
+    RANK_MEMBER: "Rank: Member",
+    RANK_OFFICER: "Rank: Officer",
+}
+RANK_NAMES = ("Rank: Member", "Rank: Officer", "Rank: Owner")
+
+
+def group_bind(roles: list[int], nickname: str = None, **group) -> dict:
+    return {
+        "roles": [str(role_id) for role_id in roles],
+        "nickname": nickname,
+        "criteria": {"type": "group", "id": GROUP_ID, "group": group},
+    }
+
+
+BINDS = [
+    group_bind([MEMBER], everyone=True),
+    group_bind([OFFICER], nickname="[OFF] {roblox-name}", roleset=-100),
+    group_bind([ADMIN], nickname="[ADM] {roblox-name}", min=200, max=254),
+    group_bind([GUEST], guest=True),
+    group_bind([], dynamicRoles=True),
+    {"roles": [str(BADGE)], "removeRoles": [str(GUEST)], "criteria": {"type": "badge", "id": 2124445682}},
+    {"roles": [str(PASS), str(BOOSTER)], "criteria": {"type": "gamepass", "id": 9040932}},
+]
+
+SETTINGS = dict(
+    verifiedRoleEnabled=True,
+    verifiedRole=str(VERIFIED),
+    unverifiedRoleEnabled=True,
+    unverifiedRole=str(UNVERIFIED),
+    nicknameTemplate="{smart-name}",
+)
+
+
+@dataclass
+class Case:
+    name: str
+    member_roles: set[int]
+    rank: int | None  # None if the member is not verified, 0 if they are not in the group
+    rank_name: str = None
+    owned_items: set[OwnedItem] = field(default_factory=set)
+    add_roles: set[int] = field(default_factory=set)
+    remove_roles: set[int] = field(default_factory=set)
+    missing_roles: set[str] = field(default_factory=set)
+    nickname_template: str | None = None
+    guild_roles: dict[int, str] = field(default_factory=lambda: ROLES)
+    settings: dict = field(default_factory=lambda: SETTINGS)
+
+
+CASES = [
+    Case(
+        "unverified member",
+        member_roles={VERIFIED, MEMBER},
+        rank=None,
+        add_roles={UNVERIFIED},
+        remove_roles={VERIFIED, MEMBER},
+    ),
+    Case(
+        "verified guest",
+        member_roles={UNVERIFIED},
+        rank=0,
+        add_roles={VERIFIED, GUEST},
+        remove_roles={UNVERIFIED},
+        nickname_template="{smart-name}",
+    ),
+    Case(
+        "group member below the officer rank",
+        member_roles={VERIFIED, OFFICER, GUEST},
+        rank=1,
+        rank_name="Rank: Member",
+        add_roles={MEMBER, RANK_MEMBER},
+        remove_roles={OFFICER, GUEST},
+        nickname_template="{smart-name}",
+    ),
+    Case(
+        "officer rank and above",
+        member_roles={VERIFIED, MEMBER, RANK_MEMBER},
+        rank=150,
+        rank_name="Rank: Officer",
+        add_roles={OFFICER, RANK_OFFICER},
+        remove_roles={RANK_MEMBER},
+        nickname_template="[OFF] {roblox-name}",
+    ),
+    Case(
+        "admin range, the nickname of the bind with the highest role",
+        member_roles={VERIFIED},
+        rank=254,
+        rank_name="Rank: Owner",
+        add_roles={MEMBER, OFFICER, ADMIN},
+        missing_roles={"Rank: Owner"},
+        nickname_template="[ADM] {roblox-name}",
+    ),
+    Case(
+        "above the admin range",
+        member_roles={VERIFIED, ADMIN},
+        rank=255,
+        rank_name="Rank: Owner",
+        add_roles={MEMBER, OFFICER},
+        remove_roles={ADMIN},
+        missing_roles={"Rank: Owner"},
+        nickname_template="[OFF] {roblox-name}",
+    ),
+    Case(
+        "badge owner outside the group, guest role removed by the badge bind",
+        member_roles={VERIFIED},
+        rank=0,
+        owned_items={("badge", 2124445682)},
+        add_roles={BADGE},
+        nickname_template="{smart-name}",
+    ),
+    Case(
+        "gamepass owner, managed roles are never changed",
+        member_roles={VERIFIED, GUEST, BOOSTER},
+        rank=0,
+        owned_items={("gamepass", 9040932)},
+        add_roles={PASS},
+        nickname_template="{smart-name}",
+    ),
+    Case(
+        "deleted verified role is created by name",
+        member_roles=set(),
+        rank=0,
+        add_roles={GUEST},
+        missing_roles={"Verified"},
+        nickname_template="{smart-name}",
+        guild_roles={role_id: name for role_id, name in ROLES.items() if role_id != VERIFIED},
+    ),
+    Case(
+        "disabled unverified role",
+        member_roles={UNVERIFIED},
+        rank=None,
+        settings={**SETTINGS, "unverifiedRoleEnabled": False},
+    ),
+]
+
+
+def run_case(case: Case) -> dict[str, tuple]:
+    guild = GuildSnapshot(
+        id=GUILD_ID,
+        name="Bloxlink HQ",
+        owner_id=84117866944663552,
+        roles={
+            role_id: RoleSnapshot(
+                id=role_id, name=name, position=role_id, color=0, is_managed=role_id == BOOSTER, permissions=0
+            )
+            for role_id, name in case.guild_roles.items()
+        },
+    )
+    compiled = compile_binds(
+        [GuildBind(**bind) for bind in BINDS], GuildData(id=GUILD_ID, **case.settings), version="corpus"
+    )
+    group_ranks = None if case.rank is None else {}
+
+    if case.rank:
+        group_ranks[GROUP_ID] = (case.rank, case.rank_name, RANK_NAMES)
+
+    evaluation, nickname_template = compiled.evaluate(guild, case.member_roles, group_ranks, case.owned_items)
+
+    expected = {
+        "add_roles": case.add_roles,
+        "remove_roles": case.remove_roles,
+        "missing_roles": case.missing_roles,
+        "nickname_template": case.nickname_template,
+    }
+    actual = {
+        "add_roles": set(evaluation.add_roles),
+        "remove_roles": set(evaluation.remove_roles),
+        "missing_roles": set(evaluation.missing_roles),
+        "nickname_template": nickname_template,
+    }
+
+    return {key: (expected[key], actual[key]) for key in expected if expected[key] != actual[key]}
+
+
+if __name__ == "__main__":
+    failures = 0
+
+    for case in CASES:
+        differences = run_case(case)
+        failures += bool(differences)
+
+        print(f"{'FAIL' if differences else 'ok':<4} {case.name}")
+
+        for key, (expected, actual) in differences.items():
+            print(f"     {key}: expected {expected}, got {actual}")
+
+    print(f"{len(CASES) - failures}/{len(CASES)} cases agree")
+    sys.exit(1 if failures else 0)
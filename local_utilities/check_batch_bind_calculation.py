@@ -0,0 +1,149 @@
+"""Check the batched bind calculation of /verifyall against a local stub of the bind API.
+
+The stub serves the single and the batched bind endpoints with the same deterministic answer, so every member
+must get the same result from calculate_bound_roles_batch() as from calculate_bound_roles(). It also counts
+the requests and bytes that each path sent for the same chunk of members.
+
+Run from the root of the repository with the same environment as the bot:
+    python3.12 local_utilities/check_batch_bind_calculation.py
+"""
+
+import asyncio
+import json
+import sys
+from collections import Counter
+
+sys.path.insert(0, "src")
+
+import uvicorn
+from blacksheep import Application, Request
+from blacksheep import json as json_response
+from blacksheep.server.routing import Router
+from bloxlink_lib import MemberSerializable, RobloxUser
+
+from config import CONFIG
+from resources.binds import calculate_bound_roles, calculate_bound_roles_batch
+from resources.guild_snapshot import GuildSnapshot, RoleSnapshot
+
+STUB_PORT = 8765
+GUILD_ID = 439265180988211211
+ROLE_COUNT = 250
+MEMBER_COUNT = 100
+
+router = Router()
+stub_api = Application(router=router)
+requests_sent: Counter[str] = Counter()
+bytes_sent: Counter[str] = Counter()
+
+
+def stub_bound_roles(guild_roles: dict, member: dict, roblox_user: dict | None) -> dict:
+    """An answer derived from the request only, so the single and batched endpoints always agree."""
+
+    role_ids = sorted(int(role_id) for role_id in guild_roles)
+    member_id = int(member["id"])
+
+    return {
+        "nickname": f"member {member_id}" if roblox_user else None,
+        "addRoles": [role_ids[member_id % len(role_ids)]] if roblox_user else [],
+        "removeRoles": [] if roblox_user else [role_ids[0]],
+        "missingRoles": ["Verified"] if roblox_user and member_id % 7 == 0 else [],
+    }
+
+
+@router.post("/binds/{guild_id}/{member_id}")
+async def single_binds(request: Request, guild_id: int, member_id: int):
+    body = await request.read()
+    requests_sent["single"] += 1
+    bytes_sent["single"] += len(body)
+
+    payload = await request.json()
+
+    return json_response(stub_bound_roles(payload["guild_roles"], payload["member"], payload["roblox_user"]))
+
+
+@router.post("/binds/{guild_id}")
+async def batch_binds(request: Request, guild_id: int):
+    body = await request.read()
+    requests_sent["batch"] += 1
+    bytes_sent["batch"] += len(body)
+
+    payload = await request.json()
+
+    return json_response(
+        {
+            "results": [
+                stub_bound_roles(payload["guild_roles"], entry["member"], entry["roblox_user"])
+                for entry in payload["members"]
+            ]
+        }
+    )
+
+
+def make_guild() -> GuildSnapshot:
+    roles = {
+        role_id: RoleSnapshot(
+            id=role_id, name=f"Role {role_id}", position=position, color=0, is_managed=False, permissions=0
+        )
+        for position, role_id in enumerate(range(GUILD_ID + 1, GUILD_ID + 1 + ROLE_COUNT))
+    }
+
+    return GuildSnapshot(
+        id=GUILD_ID,
+        name="Bloxlink HQ",
+        owner_id=84117866944663552,
+        roles=roles,
+        role_payloads_json=json.dumps(
+            {
+                str(role_id): {"id": str(role_id), "name": role.name, "position": role.position, "managed": False}
+                for role_id, role in roles.items()
+            }
+        ),
+    )
+
+
+async def main() -> int:
+    server = uvicorn.Server(uvicorn.Config(stub_api, host="127.0.0.1", port=STUB_PORT, log_level="warning"))
+    server_task = asyncio.create_task(server.serve())
+
+    while not server.started:
+        await asyncio.sleep(0.05)
+
+    CONFIG.BOT_API = f"http://127.0.0.1:{STUB_PORT}"
+    CONFIG.BIND_EVALUATION = "remote"
+
+    guild = make_guild()
+    # every other member is verified. Their groups are already synced, so no requests are made to Roblox.
+    members = [
+        (
+            MemberSerializable(
+                id=1_000_000 + index,
+                username=f"member{index}",
+                nickname=None,
+                guild_id=GUILD_ID,
+                role_ids=[],
+            ),
+            RobloxUser(id=2_000_000 + index, username=f"roblox{index}", groups={}) if index % 2 else None,
+        )
+        for index in range(MEMBER_COUNT)
+    ]
+
+    single_results = [await calculate_bound_roles(guild, member, roblox_user) for member, roblox_user in members]
+    batch_results = await calculate_bound_roles_batch(guild, members)
+
+    server.should_exit = True
+    await server_task
+
+    mismatches = [
+        member.id for (member, _), single, batch in zip(members, single_results, batch_results) if single != batch
+    ]
+
+    for path in ("single", "batch"):
+        print(f"{path:<7} {requests_sent[path]:4} requests {bytes_sent[path]:10,} bytes")
+
+    print(f"{MEMBER_COUNT - len(mismatches)}/{MEMBER_COUNT} members have the same result")
+
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -1,6 +1,5 @@
 import argparse
 import logging
-from datetime import timedelta
 from os import environ as env
 
 import hikari
@@ -8,11 +7,12 @@ import uvicorn
 from bloxlink_lib import load_modules, execute_deferred_module_functions, get_environment, Environment
 from bloxlink_lib.database import redis
 
+from resources.api.http_client import http_client
 from resources.bloxlink import bloxlink
 from config import CONFIG
 
 # Load a few modules
-from resources.commands import handle_interaction, sync_commands
+from resources.commands import handle_interaction, sync_commands, load_command_manifest, write_command_manifest
 from resources.constants import MODULES
 from web.webserver import application
 
@@ -21,7 +21,7 @@ parser = argparse.ArgumentParser()
 parser.add_argument(
     "-s", "--sync-commands",
     action="store_true",
-    help="sync commands and bypass the cooldown",
+    help="sync every command scope, even if it has not changed",
     required=False,
     default=False)
 parser.add_argument(
@@ -36,6 +36,12 @@ parser.add_argument(
     help="enable debug logging format",
     required=False,
     default=False)
+parser.add_argument(
+    "-m", "--build-manifest",
+    action="store_true",
+    help="write the command manifest used to load commands lazily, then exit",
+    required=False,
+    default=False)
 args = parser.parse_args()
 
 if args.debug:
@@ -50,12 +56,8 @@ async def handle_start(_):
 
     execute_deferred_module_functions()
 
-    # only sync commands once every hour unless the --sync-commands flag is passed
-    if args.sync_commands or not await redis.get("synced_commands"):
-        await redis.set("synced_commands", "true", expire=timedelta(hours=1))
-        await sync_commands()
-    else:
-        logging.info("Skipping command sync. Run with --sync-commands or -s to force sync.")
+    # only commands that changed since the last sync are pushed unless the --sync-commands flag is passed
+    await sync_commands(force=args.sync_commands)
 
     if get_environment() == Environment.LOCAL and args.clear_redis:
         await redis.flushall()
@@ -67,13 +69,22 @@ async def handle_stop(_):
     """Executes when the bloxlink is stopped"""
 
     await bloxlink.close()
+    await http_client.close()
 
 
 # cannot be in __main__ or the reload won't load the commands and modules
 for interaction_type in (hikari.CommandInteraction, hikari.ComponentInteraction, hikari.AutocompleteInteraction, hikari.ModalInteraction):
     bloxlink.interaction_server.set_listener(interaction_type, handle_interaction)
 
-load_modules(*MODULES, starting_path="src/", execute_deferred_modules=False)
+# commands are imported on first use if the command manifest matches the current code
+if not args.build_manifest and load_command_manifest():
+    load_modules(*[module for module in MODULES if module != "commands"], starting_path="src/", execute_deferred_modules=False)
+else:
+    load_modules(*MODULES, starting_path="src/", execute_deferred_modules=False)
+    write_command_manifest()
+
+    if args.build_manifest:
+        raise SystemExit()
 
 # Initialize the bloxlink http web server
 # IMPORTANT NOTE: blacksheep expects a trailing /
@@ -1,6 +1,7 @@
 from resources.bloxlink import bloxlink
 from resources.commands import CommandContext, GenericCommand
 from resources.constants import DEVELOPER_GUILDS
+from resources.database import invalidate_guild_data
 import hikari
 
 
@@ -17,5 +18,6 @@ class ClearServerDataCommand(GenericCommand):
         guild_id = ctx.guild_id
 
         await bloxlink.mongo.bloxlink["guilds"].delete_one({"_id": str(guild_id)})
+        await invalidate_guild_data(guild_id)
 
         await ctx.response.send("Server data deleted.")
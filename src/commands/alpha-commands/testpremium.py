@@ -1,8 +1,8 @@
 import hikari
-from bloxlink_lib.database import update_guild_data, fetch_guild_data
 from resources.bloxlink import bloxlink
 from resources.commands import CommandContext, GenericCommand
 from resources.constants import DEVELOPER_GUILDS
+from resources.database import fetch_guild_data, update_guild_data
 
 
 @bloxlink.command(
@@ -6,7 +6,7 @@ from bloxlink_lib.models.groups import RobloxGroup
 from thefuzz import process
 
 import resources.ui.modals as modal
-from resources.exceptions import RobloxAPIError
+from resources.api.roblox.entities import resolve_bind_entities
 from resources.response import Prompt
 from resources.ui.components import Button, RoleSelectMenu, TextInput, TextSelectMenu
 
@@ -147,11 +147,7 @@ class PromptComponents:
         if pending_binds is None:
             raise ValueError("A list of pending binds is required.")
 
-        for bind in pending_binds:
-            try:
-                await bind.entity.sync()
-            except RobloxAPIError:
-                pass
+        await resolve_bind_entities(pending_binds)
 
         return TextSelectMenu(
             placeholder="Select which binds to remove here...",
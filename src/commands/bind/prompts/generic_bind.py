@@ -2,10 +2,10 @@ import hikari
 from bloxlink_lib import GuildBind, build_binds_desc, create_entity
 
 from commands.bind.components import PromptComponents
+from resources.api.roblox.entities import resolve_bind_entities
 from resources.binds import create_bind
 from resources.bloxlink import bloxlink
 from resources.constants import GREEN_COLOR
-from resources.exceptions import RobloxAPIError
 from resources.response import Prompt, PromptCustomID, PromptPageData
 from resources.ui.components import Button
 
@@ -64,7 +64,7 @@ class GenericBindPrompt(Prompt[GenericBindPromptCustomID]):
                     for role in bind.pending_new_roles:
                         # Create any new roles.
                         # New roles are stored via the name given, use that name to make the role & store that instead.
-                        new_role = await bloxlink.rest.create_role(
+                        new_role = await bloxlink.create_role(
                             interaction.guild_id,
                             name=role,
                             reason="Creating new role from /bind command input.",
@@ -129,13 +129,10 @@ class GenericBindPrompt(Prompt[GenericBindPromptCustomID]):
                     ),
                 ]
 
-                if new_binds:
-                    try:
-                        for bind in new_binds:
-                            await bind.entity.sync()
-                    except RobloxAPIError:
-                        pass
+                entity_key = (bind_type, int(self.custom_id.entity_id))
+                resolved_entities = await resolve_bind_entities(new_binds, entity_key)
 
+                if new_binds:
                     unsaved_binds = "\n".join([str(bind) for bind in new_binds])
                     # print(unsaved_binds)
 
@@ -149,13 +146,7 @@ class GenericBindPrompt(Prompt[GenericBindPromptCustomID]):
 
                 entity_str = await self.current_data(key_name="entity_str", raise_exception=False)
                 if not entity_str:
-                    roblox_entity = create_entity(bind_type, self.custom_id.entity_id)
-
-                    try:
-                        await roblox_entity.sync()
-                    except RobloxAPIError:
-                        pass
-
+                    roblox_entity = resolved_entities.get(entity_key) or create_entity(bind_type, self.custom_id.entity_id)
                     entity_str = str(roblox_entity).replace("**", "")
 
                     await self.save_stateful_data(entity_str=entity_str)
@@ -3,6 +3,7 @@ from bloxlink_lib import GuildBind, build_binds_desc, get_group
 from bloxlink_lib.models.groups import RobloxGroup
 
 from commands.bind.components import PromptComponents, parse_modal_rank_input
+from resources.api.roblox.entities import resolve_bind_entities
 from resources.binds import create_bind
 from resources.bloxlink import bloxlink
 from resources.constants import GREEN_COLOR
@@ -60,7 +61,7 @@ class GroupPrompt(Prompt[GroupPromptCustomID]):
                     for role in bind.pending_new_roles:
                         # Create any new roles.
                         # New roles are stored via the name given, use that name to make the role & store that instead.
-                        new_role = await bloxlink.rest.create_role(
+                        new_role = await bloxlink.create_role(
                             interaction.guild_id,
                             name=role,
                             reason="Creating new role from /bind command input.",
@@ -125,13 +126,10 @@ class GroupPrompt(Prompt[GroupPromptCustomID]):
                     ),
                 ]
 
-                if new_binds:
-                    try:
-                        for bind in new_binds:
-                            await bind.entity.sync()
-                    except RobloxAPIError:
-                        pass
+                group_key = ("group", int(self.custom_id.group_id))
+                resolved_entities = await resolve_bind_entities(new_binds, group_key)
 
+                if new_binds:
                     unsaved_binds = "\n".join([str(bind) for bind in new_binds])
 
                     prompt_fields.append(
@@ -144,13 +142,8 @@ class GroupPrompt(Prompt[GroupPromptCustomID]):
 
                 group_name = await self.current_data(key_name="group_name", raise_exception=False)
                 if not group_name:
-                    try:
-                        roblox_group = await get_group(self.custom_id.group_id)
-                    except RobloxNotFound:
-                        # Syncing failed for some reason, catch so the prompt doesn't die & cause issues.
-                        pass
-
-                    group_name = str(roblox_group).replace("**", "")
+                    # fall back to the ID if the group could not be fetched, so the prompt doesn't die
+                    group_name = str(resolved_entities.get(group_key, self.custom_id.group_id)).replace("**", "")
 
                     await self.save_stateful_data(group_name=group_name)
 
@@ -835,11 +828,11 @@ class GroupRolesConfirmationPrompt(Prompt[GroupPromptCustomID]):
 
         match fired_component_id:
             case "yes":
-                guild_roles = await bloxlink.fetch_roles(guild_id, key_as_role_name=True)
+                guild_roles = await bloxlink.fetch_guild_snapshot(guild_id)
 
                 for roleset in reversed(group.rolesets.values()):
-                    if roleset.name not in guild_roles:
-                        await bloxlink.rest.create_role(
+                    if not guild_roles.role_by_name(roleset.name):
+                        await bloxlink.create_role(
                             guild_id,
                             name=roleset.name,
                         )
@@ -1,18 +1,24 @@
 import hikari
 from hikari.commands import CommandOption, OptionType
 
-from bloxlink_lib import get_group, CoerciveSet, RobloxAPIError, GroupLock
-from bloxlink_lib.database import fetch_guild_data, update_guild_data
+from bloxlink_lib import get_group, CoerciveSet, GroupLock
+from resources.api.roblox.entities import resolve_entities
 from resources.ui.autocomplete import roblox_group_lookup_autocomplete, roblox_group_roleset_autocomplete, AutocompleteOption
 from resources.ui import TextSelectMenu, Component, component_author_validation, disable_components, BaseCommandCustomID
-from resources.ui.pagination import Paginator, PaginatorCustomID
+from resources.ui.pagination import Paginator, PaginatorCustomID, PaginatorItemCodec
 from resources.bloxlink import bloxlink
 from resources.commands import CommandContext, GenericCommand
+from resources.database import fetch_guild_data, update_guild_data
 from resources.exceptions import RobloxNotFound, Error
 
 
 MAX_GROUPS_PER_PAGE = 5
 
+GROUP_LOCK_PAGINATOR_CODEC: PaginatorItemCodec[tuple[str, GroupLock]] = PaginatorItemCodec(
+    dump=lambda item: [item[0], item[1].model_dump()],
+    load=lambda data: (data[0], GroupLock(**data[1])),
+)
+
 class TextOptionValue(PaginatorCustomID):
     """Represents the value for the text menu."""
 
@@ -65,10 +71,12 @@ async def grouplock_autocomplete(ctx: CommandContext, focused_option: hikari.Aut
             AutocompleteOption(name="No group locks exist.", value="no_group")
         ])
 
+    groups = await resolve_entities(("group", int(group_id)) for group_id in group_lock.keys() if group_id.isdigit())
+
     for group_id in group_lock.keys():
-        try:
-            group = await get_group(group_id)
-        except (RobloxNotFound, RobloxAPIError):
+        group = groups.get(("group", int(group_id))) if group_id.isdigit() else None
+
+        if not group:
             result_list.append(
                 AutocompleteOption(name=group_id, value=group_id)
             )
@@ -179,7 +187,8 @@ async def embed_formatter(
         "return_items": return_paginator_items,
         "format_items": embed_formatter,
         "component_generator": component_generator,
-        "filter_items": None
+        "filter_items": None,
+        "item_codec": GROUP_LOCK_PAGINATOR_CODEC,
     }
 )
 class GroupLockCommand(GenericCommand):
@@ -296,7 +305,9 @@ class GroupLockCommand(GenericCommand):
                 user_id=user_id,
             ),
             include_cancel_button=True,
+            item_codec=GROUP_LOCK_PAGINATOR_CODEC,
         )
+        await paginator.save_snapshot()
 
         embed = await paginator.embed
         components = await paginator.components
@@ -325,7 +336,9 @@ class GroupLockCommand(GenericCommand):
                 # generate_components=False
             ),
             include_cancel_button=False,
+            item_codec=GROUP_LOCK_PAGINATOR_CODEC,
         )
+        await paginator.save_snapshot()
 
         embed = await paginator.embed
         components = await paginator.components
@@ -1,10 +1,10 @@
 import hikari
 from bloxlink_lib import find, get_group
-from bloxlink_lib.database import fetch_guild_data, update_guild_data
 
 from resources.binds import create_bind
 from resources.bloxlink import bloxlink
 from resources.commands import CommandContext, GenericCommand
+from resources.database import fetch_guild_data, update_guild_data
 from resources.constants import BROWN_COLOR, DEFAULTS
 from resources.exceptions import RobloxNotFound
 from resources.response import Prompt, PromptPageData
@@ -464,7 +464,7 @@ class SetupPrompt(Prompt):
             create_verified_role = not guild_data.verifiedRole
 
             if guild_data.verifiedRole:
-                guild = await bloxlink.rest.fetch_guild(self.guild_id)
+                guild = await bloxlink.fetch_guild_snapshot(self.guild_id)
                 verified_role = find(lambda r_id, r: str(r_id) == guild_data.verifiedRole, guild.roles.items())
 
                 if not verified_role:
@@ -474,8 +474,8 @@ class SetupPrompt(Prompt):
 
             if create_verified_role:
                 # verifiedRole might be null but there might be a role named Verified
-                guild_roles = await bloxlink.rest.fetch_roles(self.guild_id)
-                verified_role = find(lambda r: r.name == "Verified", guild_roles) or await bloxlink.rest.create_role(self.guild_id, name="Verified")
+                guild = await bloxlink.fetch_guild_snapshot(self.guild_id)
+                verified_role = guild.role_by_name("Verified") or await bloxlink.create_role(self.guild_id, name="Verified")
                 await update_guild_data(self.guild_id, verifiedRole=str(verified_role.id))
 
             to_change["verifiedRoleName"] = (
@@ -545,10 +545,10 @@ class SetupPrompt(Prompt):
                         pending_db_changes["verifiedRoleEnabled"] = True
 
                         # create role if it doesn't exist
-                        guild = await bloxlink.rest.fetch_guild(self.guild_id)
+                        guild = await bloxlink.fetch_guild_snapshot(self.guild_id)
 
-                        if not find(lambda r: r.name == verified_role_name, guild.roles.values()):
-                            verified_role = await bloxlink.rest.create_role(self.guild_id, name=verified_role_name)
+                        if not guild.role_by_name(verified_role_name):
+                            verified_role = await bloxlink.create_role(self.guild_id, name=verified_role_name)
                             pending_db_changes["verifiedRole"] = str(verified_role.id)
 
                 if pending_db_changes:
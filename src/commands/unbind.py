@@ -3,10 +3,9 @@ from typing import get_args
 import hikari
 from bloxlink_lib import VALID_BIND_TYPES, GuildBind, RobloxNotFound, get_entity
 
-from resources.binds import delete_bind, generate_binds_embed, get_binds
+from resources.binds import BIND_PAGINATOR_CODEC, BindListing, delete_bind, generate_binds_embed, get_binds
 from resources.bloxlink import bloxlink
 from resources.commands import CommandContext, GenericCommand
-from resources.exceptions import RobloxAPIError
 from resources.ui.pagination import Paginator, PaginatorCustomID
 from resources.ui.autocomplete import bind_category_autocomplete, bind_id_autocomplete
 from resources.ui.components import BaseCustomID, Component, TextSelectMenu, component_author_validation, disable_components, BaseCommandCustomID
@@ -30,7 +29,7 @@ class TextOptionValue(BaseCustomID):
 
 
 async def embed_formatter(
-    page_number: int, items: list[GuildBind], _guild_id: str | int, max_pages: int
+    page_number: int, items: list[BindListing], _guild_id: str | int, max_pages: int
 ) -> hikari.Embed:
     """Generates the embed for the page.
 
@@ -68,7 +67,7 @@ async def embed_formatter(
     return embed
 
 
-async def component_generator(items: list[GuildBind], custom_id: UnbindCustomID) -> list[Component] | None:
+async def component_generator(items: list[BindListing], custom_id: UnbindCustomID) -> list[Component] | None:
     """Generate the components for the paginator."""
 
     text_menu = TextSelectMenu(
@@ -78,6 +77,8 @@ async def component_generator(items: list[GuildBind], custom_id: UnbindCustomID)
             category=custom_id.category,
             id=custom_id.id,
             section="sel_discard",
+            page_number=custom_id.page_number,
+            nonce=custom_id.nonce,
         ),
         placeholder="Select which bind should be removed",
         min_values=1,
@@ -88,21 +89,16 @@ async def component_generator(items: list[GuildBind], custom_id: UnbindCustomID)
         return None
 
     for i, bind in enumerate(items):
-        bind_type = bind.type.title()
-        bind_name = str(bind.entity).replace("**", "")
-
-        try:
-            await bind.entity.sync()
-        except RobloxAPIError:
-            pass
+        bind_type = bind["type"].title()
+        bind_name = bind["entity"].replace("**", "")
 
         text_menu.options.append(
             TextSelectMenu.Option(
-                label=bind.short_description.replace("**", "")[:100],
+                label=bind["short_description"].replace("**", "")[:100],
                 value=str(
                     TextOptionValue(
-                        type=bind.type,
-                        id=bind.criteria.id,
+                        type=bind["type"],
+                        id=bind["id"],
                         index=i,
                     )
                 ),
@@ -116,9 +112,8 @@ async def component_generator(items: list[GuildBind], custom_id: UnbindCustomID)
 @component_author_validation(parse_into=UnbindCustomID, defer=False, ephemeral=False)
 async def unbind_pagination_button(ctx: CommandContext, custom_id: UnbindCustomID):
     """Handle the left and right buttons for pagination."""
-    # TODO: Support deferring via yield for paginator.
-    ctx.response.defer_through_rest = True
-    await ctx.response.defer()
+    # the page is returned inline, or edited in over REST if this is deferred for being too slow
+    ctx.response.defer_as_update = True
 
     interaction = ctx.interaction
 
@@ -130,13 +125,11 @@ async def unbind_pagination_button(ctx: CommandContext, custom_id: UnbindCustomI
 
     guild_id = interaction.guild_id
 
-    bindings = await get_binds(guild_id, category=category, bind_id=id_filter)
-
     paginator = Paginator(
         guild_id,
         author_id,
         max_items=MAX_BINDS_PER_PAGE,
-        items=bindings,
+        items=(),
         page_number=page_number,
         custom_formatter=embed_formatter,
         component_generation=component_generator,
@@ -144,12 +137,15 @@ async def unbind_pagination_button(ctx: CommandContext, custom_id: UnbindCustomI
             command_name="unbind", user_id=author_id, category=category, id=id_filter
         ),
         include_cancel_button=True,
+        item_filter=viewbinds_item_filter,
+        item_codec=BIND_PAGINATOR_CODEC,
     )
+    await paginator.load(lambda: get_binds(guild_id, category=category, bind_id=id_filter), nonce=custom_id.nonce)
 
     embed = await paginator.embed
     components = await paginator.components
 
-    await ctx.response.send(embed=embed, components=components, edit_original=True)
+    return await ctx.response.send_first(embed=embed, components=components, edit_original=True)
 
 
 @component_author_validation(parse_into=UnbindCustomID, defer=True)
@@ -166,8 +162,6 @@ async def unbind_discard_binding(ctx: CommandContext, custom_id: UnbindCustomID)
     category = custom_id.category
     id_filter = custom_id.id
 
-    guild_binds = await get_binds(interaction.guild_id, category=category, bind_id=id_filter)
-
     selected_values = interaction.values
 
     bind_deletions: list[GuildBind] = []
@@ -177,7 +171,7 @@ async def unbind_discard_binding(ctx: CommandContext, custom_id: UnbindCustomID)
         guild_id,
         user_id,
         max_items=MAX_BINDS_PER_PAGE,
-        items=guild_binds,
+        items=(),
         page_number=page_number,
         custom_formatter=embed_formatter,
         component_generation=component_generator,
@@ -186,6 +180,10 @@ async def unbind_discard_binding(ctx: CommandContext, custom_id: UnbindCustomID)
         ),
         include_cancel_button=True,
         item_filter=viewbinds_item_filter,
+        item_codec=BIND_PAGINATOR_CODEC,
+    )
+    await paginator.load(
+        lambda: get_binds(interaction.guild_id, category=category, bind_id=id_filter), nonce=custom_id.nonce
     )
 
     for value in selected_values:
@@ -201,6 +199,7 @@ async def unbind_discard_binding(ctx: CommandContext, custom_id: UnbindCustomID)
         bind_deletions.append(bind)
 
     await delete_bind(guild_id, *bind_deletions)
+    await paginator.snapshot.delete()
 
     await response.send("Your chosen bindings have been removed.", ephemeral=True)
     await disable_components(interaction)
@@ -304,7 +303,9 @@ class UnbindCommand(GenericCommand):
             ),
             include_cancel_button=True,
             item_filter=viewbinds_item_filter,
+            item_codec=BIND_PAGINATOR_CODEC,
         )
+        await paginator.save_snapshot()
 
         embed = await paginator.embed
         components = await paginator.components
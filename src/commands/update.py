@@ -19,6 +19,7 @@ from resources.exceptions import Message
         )
     ],
     permissions=hikari.Permissions.MANAGE_GUILD | hikari.Permissions.MANAGE_ROLES,
+    guild_data_fields=["verifiedDM"],
 )
 class UpdateCommand(GenericCommand):
     """update the roles and nickname of a specific user"""
@@ -7,7 +7,8 @@ from resources.commands import CommandContext, GenericCommand
 @bloxlink.command(
     category="Account",
     defer=True,
-    aliases=["getrole"]
+    aliases=["getrole"],
+    guild_data_fields=["verifiedDM", "premium"],
 )
 class VerifyCommand(GenericCommand):
     """Link your Roblox account to your Discord account and get your server roles."""
@@ -46,7 +46,8 @@ async def verify_button_click(ctx: CommandContext):
     permissions=hikari.Permissions.MANAGE_GUILD,
     accepted_custom_ids={
         VERIFY_BUTTON_ID: verify_button_click
-    }
+    },
+    guild_data_fields=["verifiedDM", "premium"],
 )
 class VerifyChannelCommand(GenericCommand):
     """post a message that users can interact with to get their roles"""
@@ -54,7 +55,7 @@ class VerifyChannelCommand(GenericCommand):
     async def __main__(self, ctx: CommandContext):
         guild_id = ctx.guild_id
 
-        guild: hikari.RESTGuild = await bloxlink.rest.fetch_guild(guild_id)
+        guild = await bloxlink.fetch_guild_snapshot(guild_id)
         premium_status = await get_premium_status(guild_id=guild_id, interaction=ctx.interaction)
 
         button_text = "Verify with Bloxlink"
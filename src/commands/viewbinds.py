@@ -3,7 +3,7 @@ from typing import get_args
 import hikari
 from bloxlink_lib import VALID_BIND_TYPES, GuildBind, get_binds
 
-from resources.binds import generate_binds_embed
+from resources.binds import BIND_PAGINATOR_CODEC, BindListing, generate_binds_embed
 from resources.bloxlink import bloxlink
 from resources.commands import CommandContext, GenericCommand
 from resources.ui.pagination import Paginator, PaginatorCustomID
@@ -20,7 +20,7 @@ class ViewbindsCustomID(PaginatorCustomID):
     id: int | None = None
 
 
-async def embed_formatter(page_number: int, items: list[GuildBind], _guild_id: str | int, max_pages: int):
+async def embed_formatter(page_number: int, items: list[BindListing], _guild_id: str | int, max_pages: int):
     """Generates the components for the viewbinds page.
 
     Args:
@@ -63,9 +63,8 @@ def viewbinds_item_filter(items: list[GuildBind]):
 @component_author_validation(parse_into=ViewbindsCustomID, ephemeral=False, defer=False)
 async def viewbinds_button(ctx: CommandContext, custom_id: ViewbindsCustomID):
     """Handle pagination left and right button presses."""
-    # TODO: Support deferring via yield for paginator.
-    ctx.response.defer_through_rest = True
-    await ctx.response.defer()
+    # the page is returned inline, or edited in over REST if this is deferred for being too slow
+    ctx.response.defer_as_update = True
 
     interaction = ctx.interaction
 
@@ -77,13 +76,11 @@ async def viewbinds_button(ctx: CommandContext, custom_id: ViewbindsCustomID):
 
     guild_id = interaction.guild_id
 
-    guild_data = await get_binds(guild_id, bind_id=id_filter, category=category)
-
     paginator = Paginator(
         guild_id,
         author_id,
         max_items=MAX_BINDS_PER_PAGE,
-        items=guild_data,
+        items=(),
         page_number=page_number,
         custom_formatter=embed_formatter,
         custom_id_format=ViewbindsCustomID(
@@ -93,12 +90,14 @@ async def viewbinds_button(ctx: CommandContext, custom_id: ViewbindsCustomID):
             id=id_filter,
         ),
         item_filter=viewbinds_item_filter,
+        item_codec=BIND_PAGINATOR_CODEC,
     )
+    await paginator.load(lambda: get_binds(guild_id, bind_id=id_filter, category=category), nonce=custom_id.nonce)
 
     embed = await paginator.embed
     components = await paginator.components
 
-    await ctx.response.send(embed=embed, components=components, edit_original=True)
+    return await ctx.response.send_first(embed=embed, components=components, edit_original=True)
 
 
 @bloxlink.command(
@@ -164,7 +163,9 @@ class ViewBindsCommand(GenericCommand):
                 id=id_option,
             ),
             item_filter=viewbinds_item_filter,
+            item_codec=BIND_PAGINATOR_CODEC,
         )
+        await paginator.save_snapshot()
 
         embed = await paginator.embed
         components = await paginator.components
@@ -17,6 +17,16 @@ class Config(BLOXLINK_CONFIG):
     #############################
     BOT_API: str
     BOT_API_AUTH: str
+    # where member updates are evaluated: by the bind API, by the bind API while comparing it with this node
+    # (shadow), or by this node with the bind API as a fallback for the binds it can't evaluate (local)
+    BIND_EVALUATION: Literal["remote", "shadow", "local"] = "remote"
+    # calculate the roles of /verifyall members in batches, with one request to the bind API per batch. Only
+    # enable this once the bind API supports batches
+    BATCH_BIND_CALCULATION: bool = False
+    #############################
+    # write snowflakes of custom IDs in base 62. Every node decodes them, so only enable this once every node
+    # runs a version that does
+    COMPACT_CUSTOM_IDS: bool = False
     #############################
     HOST: str
     PORT: Annotated[int, Field(default=8010)]
@@ -0,0 +1,279 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import random
+import time
+from dataclasses import dataclass
+from types import SimpleNamespace
+from typing import Any
+
+import aiohttp
+from bloxlink_lib import BaseModel
+from prometheus_client import Counter, Histogram
+
+from resources.constants import HTTP_CLIENT
+from resources.exceptions import HTTPRequestFailed
+
+
+__all__ = (
+    "HTTPClient",
+    "HTTPResponse",
+    "PreEncodedJSON",
+    "encode_json",
+    "http_client",
+)
+
+
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+RETRY_STATUSES = frozenset({502, 503, 504})  # the server was not reached or was unavailable
+
+http_request_histogram = Histogram(
+    "http_request_seconds",
+    "Time spent on each attempt of an outbound HTTP request, by endpoint template and status",
+    ["endpoint", "method", "status"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2, 3, 5, 10),
+)
+http_connection_histogram = Histogram(
+    "http_connection_seconds",
+    "Time outbound HTTP requests spent waiting for a free connection of the pool (queued) or opening one (connect)",
+    ["endpoint", "phase"],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2, 5),
+)
+http_connections_counter = Counter(
+    "http_connections",
+    "Connections used by outbound HTTP requests, by whether they were reused from the pool or opened",
+    ["endpoint", "result"],
+)
+http_retries_counter = Counter(
+    "http_retries",
+    "Outbound HTTP requests that were retried, by the reason of the retry",
+    ["endpoint", "reason"],
+)
+
+
+@dataclass(slots=True, frozen=True)
+class HTTPResponse:
+    """The status and body of a response. JSON bodies are parsed, other bodies are kept as text."""
+
+    status: int
+    body: Any
+
+    @property
+    def ok(self) -> bool:
+        return 200 <= self.status < 300
+
+
+class PreEncodedJSON:
+    """A value of a request body that was already encoded as JSON, such as a payload which is cached.
+
+    encode_json() places it into the body as is instead of encoding it again.
+    """
+
+    __slots__ = ("encoded",)
+
+    def __init__(self, encoded: bytes):
+        self.encoded = encoded
+
+
+def encode_json(value: Any) -> bytes:
+    """Encode a request body as JSON, placing any PreEncodedJSON values into it without encoding them again."""
+
+    pre_encoded: list[bytes] = []
+
+    def placeholder(item: Any) -> str:
+        if not isinstance(item, PreEncodedJSON):
+            raise TypeError(f"Object of type {type(item).__name__} is not JSON serializable")
+
+        pre_encoded.append(item.encoded)
+
+        # a null character can't be in the names or content that bodies are made of, so this can't collide
+        return f"\0{len(pre_encoded) - 1}"
+
+    encoded = json.dumps(value, default=placeholder, separators=(",", ":")).encode()
+
+    for index, item in enumerate(pre_encoded):
+        encoded = encoded.replace(f'"\\u0000{index}"'.encode(), item, 1)
+
+    return encoded
+
+
+def _endpoint_of(trace_config_ctx: SimpleNamespace) -> str:
+    return (trace_config_ctx.trace_request_ctx or {}).get("endpoint", "other")
+
+
+def _trace_config() -> aiohttp.TraceConfig:
+    """Time the connection phases of requests, so that slow connections can be told apart from slow servers."""
+
+    trace_config = aiohttp.TraceConfig()
+
+    async def on_queued_start(_session, trace_config_ctx, _params):
+        trace_config_ctx.queued_at = time.perf_counter()
+
+    async def on_queued_end(_session, trace_config_ctx, _params):
+        http_connection_histogram.labels(endpoint=_endpoint_of(trace_config_ctx), phase="queued").observe(
+            time.perf_counter() - trace_config_ctx.queued_at
+        )
+
+    async def on_create_start(_session, trace_config_ctx, _params):
+        trace_config_ctx.connecting_at = time.perf_counter()
+
+    async def on_create_end(_session, trace_config_ctx, _params):
+        endpoint = _endpoint_of(trace_config_ctx)
+        http_connections_counter.labels(endpoint=endpoint, result="opened").inc()
+        http_connection_histogram.labels(endpoint=endpoint, phase="connect").observe(
+            time.perf_counter() - trace_config_ctx.connecting_at
+        )
+
+    async def on_reuse(_session, trace_config_ctx, _params):
+        http_connections_counter.labels(endpoint=_endpoint_of(trace_config_ctx), result="reused").inc()
+
+    trace_config.on_connection_queued_start.append(on_queued_start)
+    trace_config.on_connection_queued_end.append(on_queued_end)
+    trace_config.on_connection_create_start.append(on_create_start)
+    trace_config.on_connection_create_end.append(on_create_end)
+    trace_config.on_connection_reuseconn.append(on_reuse)
+
+    return trace_config
+
+
+class HTTPClient:
+    """The client of every outbound HTTP request made by this project, such as to the bot API and to webhooks.
+
+    Connections are kept alive in a pool per host, which is capped. Every request has a deadline that covers its
+    retries, and only idempotent requests are retried. Requests are labelled with the template of their endpoint,
+    not their URL, so that the metrics of every guild and user are grouped together.
+    """
+
+    __slots__ = ("_session",)
+
+    def __init__(self):
+        self._session: aiohttp.ClientSession | None = None
+
+    def _open_session(self) -> aiohttp.ClientSession:
+        # opened on first use, since the session must be created inside the running event loop
+        self._session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                limit=HTTP_CLIENT["MAX_CONNECTIONS"],
+                limit_per_host=HTTP_CLIENT["MAX_CONNECTIONS_PER_HOST"],
+                keepalive_timeout=HTTP_CLIENT["KEEPALIVE_TIMEOUT"],
+            ),
+            trace_configs=[_trace_config()],
+        )
+
+        return self._session
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        *,
+        endpoint: str,
+        body: Any = None,
+        headers: dict[str, str] = None,
+        deadline: float = None,
+        idempotent: bool = None,
+    ) -> HTTPResponse:
+        """Make a request.
+
+        Args:
+            method (str): The HTTP method.
+            url (str): The URL of the request.
+            endpoint (str): The template of the endpoint, such as "bot-api:/binds/{guild_id}", for the metrics.
+            body (Any, optional): The JSON body of the request, which may contain PreEncodedJSON values.
+                Defaults to None.
+            headers (dict[str, str], optional): The headers of the request. Defaults to None.
+            deadline (float, optional): Seconds for the request, including its retries. Defaults to
+                HTTP_CLIENT["DEADLINE"].
+            idempotent (bool, optional): Whether the request can be retried. Defaults to whether the method is
+                idempotent, so a POST is only retried if it is marked as idempotent.
+
+        Raises:
+            HTTPRequestFailed: The request timed out or could not connect, after any retries.
+
+        Returns:
+            HTTPResponse: The response. Responses with an error status are returned rather than raised.
+        """
+
+        method = method.upper()
+        session = self._session if self._session and not self._session.closed else self._open_session()
+        deadline_at = time.monotonic() + (deadline or HTTP_CLIENT["DEADLINE"])
+        retries = HTTP_CLIENT["RETRIES"] if (method in IDEMPOTENT_METHODS if idempotent is None else idempotent) else 0
+
+        if body is not None:
+            # encoded once, not once per attempt
+            body = encode_json(body)
+            headers = {"Content-Type": "application/json", **(headers or {})}
+        failure: BaseException | None = None
+        response: HTTPResponse | None = None
+
+        for attempt in range(retries + 1):
+            started_at = time.perf_counter()
+
+            try:
+                async with session.request(
+                    method,
+                    url,
+                    data=body,
+                    headers=headers,
+                    timeout=aiohttp.ClientTimeout(total=max(deadline_at - time.monotonic(), 0.001)),
+                    trace_request_ctx={"endpoint": endpoint},
+                ) as raw_response:
+                    if raw_response.content_type == "application/json":
+                        response_body = await raw_response.json()
+                    else:
+                        response_body = await raw_response.text()
+            except TimeoutError as error:
+                outcome, failure = "timeout", error
+            except aiohttp.ClientConnectionError as error:
+                outcome, failure = "connection_error", error
+            else:
+                response = HTTPResponse(status=raw_response.status, body=response_body)
+                outcome, failure = str(raw_response.status), None
+
+            http_request_histogram.labels(endpoint=endpoint, method=method, status=outcome).observe(
+                time.perf_counter() - started_at
+            )
+
+            if response and response.status not in RETRY_STATUSES:
+                return response
+
+            # full jitter, so that requests which failed together are not retried together
+            backoff = random.uniform(0, HTTP_CLIENT["RETRY_BACKOFF"] * 2**attempt)
+
+            if attempt == retries or time.monotonic() + backoff >= deadline_at:
+                break
+
+            http_retries_counter.labels(endpoint=endpoint, reason=outcome).inc()
+            response = None
+
+            await asyncio.sleep(backoff)
+
+        if response:
+            return response
+
+        raise HTTPRequestFailed(f"{method} {endpoint} failed after {attempt + 1} attempt(s).") from failure
+
+    async def request_typed[T: BaseModel](
+        self, model: type[T], method: str, url: str, **kwargs
+    ) -> tuple[T | None, HTTPResponse]:
+        """Make a request with request(), and parse a successful response into a model.
+
+        Returns:
+            tuple[T | None, HTTPResponse]: The parsed body, which is None if the response has an error status,
+                and the response.
+        """
+
+        response = await self.request(method, url, **kwargs)
+
+        return (model.model_validate(response.body) if response.ok else None), response
+
+    async def close(self):
+        """Close every pooled connection."""
+
+        if self._session:
+            await self._session.close()
+            self._session = None
+
+
+http_client = HTTPClient()
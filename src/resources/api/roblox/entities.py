@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import asyncio
+from typing import TYPE_CHECKING, Iterable
+
+from bloxlink_lib import create_entity
+from prometheus_client import Counter
+
+from resources.cache import TTLCache
+from resources.constants import CACHES
+from resources.exceptions import RobloxAPIError, RobloxNotFound
+
+if TYPE_CHECKING:
+    from bloxlink_lib import GuildBind, RobloxEntity
+
+
+MAX_CONCURRENT_FETCHES = 16  # across every render of this node
+
+type EntityKey = tuple[str, int]  # (entity type, entity ID)
+
+entity_lookups_counter = Counter(
+    "roblox_entity_lookups",
+    "Roblox entities requested by renders, by whether they were cached. Errors are also counted as misses.",
+    ["entity_type", "result"],
+)
+
+entity_cache: TTLCache[EntityKey, RobloxEntity] = TTLCache(
+    "roblox_entities", max_size=CACHES["ROBLOX_ENTITIES"]["MAX_SIZE"], ttl=CACHES["ROBLOX_ENTITIES"]["TTL"]
+)
+
+# entities that are being fetched, so that concurrent renders wait for the same request
+_fetching: dict[EntityKey, asyncio.Task[RobloxEntity]] = {}
+_fetch_semaphore = asyncio.Semaphore(MAX_CONCURRENT_FETCHES)
+
+
+async def _fetch_entity(key: EntityKey) -> RobloxEntity:
+    entity = create_entity(*key)
+
+    async with _fetch_semaphore:
+        await entity.sync()
+
+    entity_cache.set(key, entity)
+
+    return entity
+
+
+async def resolve_entities(keys: Iterable[EntityKey]) -> dict[EntityKey, RobloxEntity]:
+    """Get the synced Roblox entities of these keys.
+
+    Duplicate keys are only fetched once, and entities which are not cached are fetched concurrently.
+
+    Args:
+        keys (Iterable[EntityKey]): The type and ID of every entity that is needed.
+
+    Returns:
+        dict[EntityKey, RobloxEntity]: The entities by their key. Entities that could not be fetched from
+            Roblox are left out.
+    """
+
+    resolved: dict[EntityKey, RobloxEntity] = {}
+    pending: dict[EntityKey, asyncio.Task[RobloxEntity]] = {}
+
+    for key in dict.fromkeys(keys):
+        entity = entity_cache.peek(key)
+
+        if entity is not None:
+            entity_lookups_counter.labels(entity_type=key[0], result="hit").inc()
+            resolved[key] = entity
+            continue
+
+        entity_lookups_counter.labels(entity_type=key[0], result="miss").inc()
+
+        if key not in _fetching:
+            _fetching[key] = asyncio.create_task(_fetch_entity(key))
+            _fetching[key].add_done_callback(lambda _, key=key: _fetching.pop(key, None))
+
+        pending[key] = _fetching[key]
+
+    # shielded, since the fetches are shared with other renders which must not be cancelled with this one
+    results = await asyncio.gather(*(asyncio.shield(task) for task in pending.values()), return_exceptions=True)
+
+    for key, result in zip(pending, results):
+        if isinstance(result, (RobloxAPIError, RobloxNotFound)):
+            entity_lookups_counter.labels(entity_type=key[0], result="error").inc()
+            continue
+
+        if isinstance(result, BaseException):
+            raise result
+
+        resolved[key] = result
+
+    return resolved
+
+
+async def resolve_bind_entities(binds: Iterable[GuildBind], *keys: EntityKey) -> dict[EntityKey, RobloxEntity]:
+    """Sync the entities of these binds through resolve_entities(), along with any other entities that are needed.
+
+    Binds whose entity could not be fetched keep their unsynced entity.
+    """
+
+    binds = [bind for bind in binds if bind.entity is not None and bind.criteria.id]
+    resolved = await resolve_entities([*((bind.type, int(bind.criteria.id)) for bind in binds), *keys])
+
+    for bind in binds:
+        bind.entity = resolved.get((bind.type, int(bind.criteria.id)), bind.entity)
+
+    return resolved
@@ -2,12 +2,14 @@ from __future__ import annotations
 
 from datetime import timedelta
 
-from bloxlink_lib import RobloxUser, get_user, fetch, StatusCodes
-from bloxlink_lib.database import fetch_guild_data, redis
+from bloxlink_lib import RobloxUser, get_user, StatusCodes
+from bloxlink_lib.database import redis
 import hikari
 
+from resources.api.http_client import http_client
 from resources.constants import VERIFY_URL, VERIFY_URL_GUILD
-from resources.exceptions import RobloxAPIError, RobloxNotFound
+from resources.database import fetch_guild_data
+from resources.exceptions import HTTPRequestFailed, RobloxAPIError, RobloxNotFound
 from resources.premium import get_premium_status
 
 
@@ -79,24 +81,30 @@ async def format_embed(roblox_account: RobloxUser, user: hikari.User = None, gui
         if webhooks and webhooks.userInfo:
             userinfo_webhook = webhooks.userInfo
 
-            json_response, response = await fetch(
-                "POST",
-                userinfo_webhook.url,
-                headers={
-                    "Content-Type": "application/json",
-                    "Authorization": webhooks.authentication
-                },
-                body={
-                    userinfo_webhook.fieldMapping.discordID: user.id if user else None,
-                    userinfo_webhook.fieldMapping.robloxID: roblox_account.id,
-                    userinfo_webhook.fieldMapping.guildID: guild_id,
-                    userinfo_webhook.fieldMapping.robloxUsername: roblox_account.username,
-                    userinfo_webhook.fieldMapping.discordUsername: user.username if user else None,
-                },
-                raise_on_failure=False
-            )
-
-            if response.status == StatusCodes.OK and json_response.get("fields"):
+            try:
+                response = await http_client.request(
+                    "POST",
+                    userinfo_webhook.url,
+                    endpoint="webhook:userInfo",
+                    headers={
+                        "Content-Type": "application/json",
+                        "Authorization": webhooks.authentication
+                    },
+                    body={
+                        userinfo_webhook.fieldMapping.discordID: user.id if user else None,
+                        userinfo_webhook.fieldMapping.robloxID: roblox_account.id,
+                        userinfo_webhook.fieldMapping.guildID: guild_id,
+                        userinfo_webhook.fieldMapping.robloxUsername: roblox_account.username,
+                        userinfo_webhook.fieldMapping.discordUsername: user.username if user else None,
+                    },
+                )
+            except HTTPRequestFailed:
+                # the webhook is run by the server, so it being down should not break the embed
+                response = None
+
+            json_response = response.body if response and isinstance(response.body, dict) else {}
+
+            if response and response.status == StatusCodes.OK and json_response.get("fields"):
                 custom_embed = hikari.Embed(
                     title=json_response.get("title"),
                     url=json_response.get("titleURL"),
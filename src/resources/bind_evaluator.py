@@ -0,0 +1,451 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Iterable
+
+from bloxlink_lib import StatusCodes, get_binds, parse_template
+from prometheus_client import Counter
+
+from resources.api.http_client import http_client
+from resources.cache import TTLCache
+from resources.constants import CACHES, DEFAULTS
+from resources.database import fetch_guild_data
+from resources.exceptions import RobloxAPIError
+
+if TYPE_CHECKING:
+    import hikari
+    from bloxlink_lib import GuildBind, GuildData, MemberSerializable, RobloxUser
+
+    from resources.guild_snapshot import GuildSnapshot
+
+
+__all__ = (
+    "BindEvaluation",
+    "CompiledBinds",
+    "UnsupportedBind",
+    "compile_binds",
+    "evaluate_binds",
+)
+
+
+MAX_CONCURRENT_OWNERSHIP_CHECKS = 8
+MAX_GROUP_RANK = 255  # group ranks go from 1 to 255, guests have rank 0
+DISABLED_ROLE_NAME = "{disable}"  # the verified and unverified role names when /setup turned them off
+
+# the guild data fields that change how binds are evaluated, other than the binds themselves
+SETTINGS_FIELDS = (
+    "verifiedRoleEnabled",
+    "verifiedRole",
+    "verifiedRoleName",
+    "unverifiedRoleEnabled",
+    "unverifiedRole",
+    "unverifiedRoleName",
+    "nicknameTemplate",
+)
+
+# bind types which are satisfied by owning an item, and the item type of Roblox's inventory API
+OWNERSHIP_ITEM_TYPES = {"asset": "Asset", "badge": "Badge", "gamepass": "GamePass"}
+OWNERSHIP_URL = "https://inventory.roblox.com/v1/users/{user_id}/items/{item_type}/{item_id}/is-owned"
+
+type OwnedItem = tuple[str, int]  # (bind type, item ID)
+
+compiled_binds_cache: TTLCache[int, CompiledBinds] = TTLCache(
+    "compiled_binds", max_size=CACHES["COMPILED_BINDS"]["MAX_SIZE"], ttl=CACHES["COMPILED_BINDS"]["TTL"]
+)
+
+ownership_checks_counter = Counter(
+    "bind_ownership_checks",
+    "Item ownership checks made to evaluate asset, badge and gamepass binds",
+    ["item_type", "result"],
+)
+
+
+class UnsupportedBind(Exception):
+    """A bind of the guild can't be evaluated by this node, so the bind API has to evaluate it."""
+
+
+@dataclass(slots=True, frozen=True)
+class _Bind:
+    """The parts of a bind which decide what it gives, with its role IDs parsed."""
+
+    position: int  # the order of the bind in the guild's binds
+    roles: tuple[int, ...]
+    remove_roles: tuple[int, ...]
+    nickname: str | None
+    role_names: tuple[str, ...] = ()  # found by name if none of the roles exist, like the Verified role
+
+    def guild_roles(self, guild: GuildSnapshot, roles_by_name: dict[str, int]) -> tuple[set[int], list[str]]:
+        """The roles of this bind that exist in the guild, and the names of the roles that have to be created."""
+
+        role_ids = {role_id for role_id in self.roles if role_id in guild.roles}
+
+        if role_ids or not self.role_names:
+            return role_ids, []
+
+        return (
+            {roles_by_name[name] for name in self.role_names if name in roles_by_name},
+            [name for name in self.role_names if name not in roles_by_name],
+        )
+
+
+@dataclass(slots=True)
+class _GroupBinds:
+    """The binds of one group, as a lookup from the rank of the member to the binds that they satisfy."""
+
+    ranks: list[tuple[_Bind, ...]] = field(default_factory=lambda: [()] * (MAX_GROUP_RANK + 1))
+    ranked: list[_Bind] = field(default_factory=list)  # every bind in ranks
+    guests: list[_Bind] = field(default_factory=list)
+    dynamic: list[_Bind] = field(default_factory=list)  # binds which give the role named after the rank
+
+    def add_range(self, bind: _Bind, lowest_rank: int, highest_rank: int):
+        for rank in range(max(lowest_rank, 1), min(highest_rank, MAX_GROUP_RANK) + 1):
+            self.ranks[rank] = (*self.ranks[rank], bind)
+
+        self.ranked.append(bind)
+
+    def for_rank(self, rank: int) -> tuple[_Bind, ...]:
+        return self.ranks[rank] if 0 <= rank <= MAX_GROUP_RANK else ()
+
+
+@dataclass(slots=True, frozen=True)
+class BindEvaluation:
+    """What the binds of a guild give a member: the same fields as the bind API's response."""
+
+    add_roles: list[int]
+    remove_roles: list[int]
+    missing_roles: list[str]
+    nickname: str | None
+
+
+@dataclass(slots=True)
+class CompiledBinds:
+    """The binds of a guild, compiled once per version of the guild's binds and settings.
+
+    Group binds are compiled into a lookup by rank, so evaluating a member does not depend on how many binds
+    the guild has for that group.
+    """
+
+    version: str
+    verified: list[_Bind] = field(default_factory=list)
+    unverified: list[_Bind] = field(default_factory=list)
+    groups: dict[int, _GroupBinds] = field(default_factory=dict)
+    owned_items: dict[OwnedItem, list[_Bind]] = field(default_factory=dict)
+    nickname_template: str | None = None
+
+    def evaluate(
+        self,
+        guild: GuildSnapshot,
+        member_role_ids: Iterable[int],
+        group_ranks: dict[int, tuple[int, str, tuple[str, ...]]] | None,
+        owned_items: set[OwnedItem],
+    ) -> tuple[BindEvaluation, str | None]:
+        """Evaluate the binds for a member.
+
+        Args:
+            guild (GuildSnapshot): The guild, to find roles by ID and by name.
+            member_role_ids (Iterable[int]): The roles that the member has.
+            group_ranks (dict[int, tuple[int, str, tuple[str, ...]]] | None): The groups of the Roblox account
+                of the member, mapped to their rank, the name of their rank and the names of every rank of the
+                group. None if the member is not verified.
+            owned_items (set[OwnedItem]): The items of owned_items which the Roblox account owns.
+
+        Returns:
+            tuple[BindEvaluation, str | None]: The evaluation, whose nickname is left unset, and the nickname
+                template which applies to the member.
+        """
+
+        member_roles = set(member_role_ids)
+        roles_by_name = {role.name: role_id for role_id, role in guild.roles.items()}
+
+        satisfied: list[_Bind] = []
+        unsatisfied: list[_Bind] = []
+        given_names: list[str] = []  # roles named after a group rank
+        ungiven_names: set[str] = set()
+
+        if group_ranks is None:
+            satisfied.extend(self.unverified)
+            unsatisfied.extend(self.verified)
+        else:
+            satisfied.extend(self.verified)
+            unsatisfied.extend(self.unverified)
+
+        for group_id, group_binds in self.groups.items():
+            rank, rank_name, rank_names = (group_ranks or {}).get(group_id, (0, None, ()))
+            rank_binds = group_binds.for_rank(rank)
+
+            satisfied.extend(rank_binds)
+            unsatisfied.extend(bind for bind in group_binds.ranked if bind not in rank_binds)
+            # guests are verified members who are not in the group
+            (satisfied if group_ranks is not None and not rank else unsatisfied).extend(group_binds.guests)
+
+            if group_binds.dynamic:
+                if rank:
+                    satisfied.extend(group_binds.dynamic)
+                    given_names.append(rank_name)
+                else:
+                    unsatisfied.extend(group_binds.dynamic)
+
+                ungiven_names.update(name for name in rank_names if name != rank_name)
+
+        for item, item_binds in self.owned_items.items():
+            (satisfied if group_ranks is not None and item in owned_items else unsatisfied).extend(item_binds)
+
+        satisfied = sorted(set(satisfied), key=lambda bind: bind.position)
+        given_roles: set[int] = set()
+        explicitly_removed: set[int] = set()
+        missing_roles: list[str] = []
+
+        for bind in satisfied:
+            bind_roles, bind_missing_roles = bind.guild_roles(guild, roles_by_name)
+            given_roles.update(bind_roles)
+            missing_roles.extend(bind_missing_roles)
+            explicitly_removed.update(bind.remove_roles)
+
+        for role_name in given_names:
+            if role_name in roles_by_name:
+                given_roles.add(roles_by_name[role_name])
+            else:
+                missing_roles.append(role_name)
+
+        ungiven_roles = {role_id for bind in unsatisfied for role_id in bind.guild_roles(guild, roles_by_name)[0]}
+        ungiven_roles.update(roles_by_name[name] for name in ungiven_names if name in roles_by_name)
+
+        # roles that another bind gives are kept, unless a satisfied bind removes them
+        given_roles -= explicitly_removed
+        removable = (ungiven_roles - given_roles) | explicitly_removed
+        evaluation = BindEvaluation(
+            add_roles=sorted(role_id for role_id in given_roles - member_roles if not guild.roles[role_id].is_managed),
+            remove_roles=sorted(
+                role_id
+                for role_id in removable & member_roles
+                if role_id in guild.roles and not guild.roles[role_id].is_managed
+            ),
+            missing_roles=list(dict.fromkeys(missing_roles)),
+            nickname=None,
+        )
+
+        return evaluation, self._nickname_template(guild, satisfied, verified=group_ranks is not None)
+
+    def _nickname_template(self, guild: GuildSnapshot, satisfied: list[_Bind], verified: bool) -> str | None:
+        """The nickname of the satisfied bind with the highest role, then the nickname template of the guild."""
+
+        def highest_role(bind: _Bind) -> int:
+            return max((guild.roles[role_id].position for role_id in bind.roles if role_id in guild.roles), default=-1)
+
+        nickname_binds = [bind for bind in satisfied if bind.nickname]
+
+        if nickname_binds:
+            # max() keeps the first of equal binds, which is the one that was made first
+            return max(nickname_binds, key=highest_role).nickname
+
+        return self.nickname_template if verified else None
+
+
+def _role_ids(roles: Iterable[str | int] | None) -> tuple[int, ...]:
+    return tuple(int(role_id) for role_id in roles or () if str(role_id).isdigit())
+
+
+def compile_binds(guild_binds: list[GuildBind], guild_data: GuildData, version: str) -> CompiledBinds:
+    """Compile the binds and settings of a guild.
+
+    Raises:
+        UnsupportedBind: A bind has a type or criteria that this node does not know how to evaluate.
+    """
+
+    compiled = CompiledBinds(version=version)
+    compiled.nickname_template = guild_data.nicknameTemplate or DEFAULTS.get("nicknameTemplate")
+
+    for position, guild_bind in enumerate(guild_binds):
+        bind = _Bind(
+            position=position,
+            roles=_role_ids(guild_bind.roles),
+            remove_roles=_role_ids(guild_bind.remove_roles),
+            nickname=guild_bind.nickname,
+        )
+        criteria = guild_bind.criteria
+
+        match criteria.type:
+            case "verified":
+                compiled.verified.append(bind)
+
+            case "unverified":
+                compiled.unverified.append(bind)
+
+            case "group":
+                group_binds = compiled.groups.setdefault(int(criteria.id), _GroupBinds())
+                group = criteria.group
+
+                if not group or group.everyone:
+                    group_binds.add_range(bind, 1, MAX_GROUP_RANK)
+                elif group.dynamicRoles:
+                    group_binds.dynamic.append(bind)
+                elif group.guest:
+                    group_binds.guests.append(bind)
+                elif group.roleset:
+                    if group.roleset < 0:
+                        # a negative rank means that rank and above
+                        group_binds.add_range(bind, abs(group.roleset), MAX_GROUP_RANK)
+                    else:
+                        group_binds.add_range(bind, group.roleset, group.roleset)
+                elif group.min is not None or group.max is not None:
+                    highest_rank = group.max if group.max is not None else MAX_GROUP_RANK
+                    group_binds.add_range(bind, group.min or 1, highest_rank)
+                else:
+                    group_binds.add_range(bind, 1, MAX_GROUP_RANK)
+
+            case bind_type if bind_type in OWNERSHIP_ITEM_TYPES:
+                compiled.owned_items.setdefault((bind_type, int(criteria.id)), []).append(bind)
+
+            case _:
+                raise UnsupportedBind(f"Binds of type {criteria.type} can't be evaluated locally.")
+
+    position = len(guild_binds)
+
+    # the Verified and Unverified roles of the guild's settings are binds without a nickname, given after the others
+    for role_binds, enabled, role_id, role_name, default_name in (
+        (
+            compiled.verified,
+            guild_data.verifiedRoleEnabled,
+            guild_data.verifiedRole,
+            guild_data.verifiedRoleName,
+            "Verified",
+        ),
+        (
+            compiled.unverified,
+            guild_data.unverifiedRoleEnabled,
+            guild_data.unverifiedRole,
+            guild_data.unverifiedRoleName,
+            "Unverified",
+        ),
+    ):
+        if not enabled or role_name == DISABLED_ROLE_NAME:
+            continue
+
+        role_binds.append(
+            _Bind(
+                position=position,
+                roles=_role_ids([role_id] if role_id else []),
+                remove_roles=(),
+                nickname=None,
+                role_names=(role_name or default_name,),
+            )
+        )
+        position += 1
+
+    return compiled
+
+
+def _binds_version(guild_binds: list[GuildBind], guild_data: GuildData) -> str:
+    """Fingerprint the binds and the settings that they are compiled with."""
+
+    fingerprint = hashlib.blake2b(digest_size=16)
+
+    for guild_bind in guild_binds:
+        fingerprint.update(guild_bind.model_dump_json(by_alias=True, exclude={"entity"}).encode())
+
+    fingerprint.update(json.dumps([getattr(guild_data, setting) for setting in SETTINGS_FIELDS], default=str).encode())
+
+    return fingerprint.hexdigest()
+
+
+async def _compiled_binds(guild_id: int) -> CompiledBinds:
+    guild_binds = await get_binds(str(guild_id))
+    guild_data = await fetch_guild_data(guild_id, *SETTINGS_FIELDS)
+    version = _binds_version(guild_binds, guild_data)
+
+    compiled = compiled_binds_cache.get(guild_id)
+
+    if compiled is None or compiled.version != version:
+        compiled = compile_binds(guild_binds, guild_data, version)
+        compiled_binds_cache.set(guild_id, compiled)
+
+    return compiled
+
+
+async def _owns_item(roblox_user: RobloxUser, item: OwnedItem, semaphore: asyncio.Semaphore) -> bool:
+    bind_type, item_id = item
+    item_type = OWNERSHIP_ITEM_TYPES[bind_type]
+
+    async with semaphore:
+        response = await http_client.request(
+            "GET",
+            OWNERSHIP_URL.format(user_id=roblox_user.id, item_type=item_type, item_id=item_id),
+            endpoint="roblox-inventory:/v1/users/{user_id}/items/{item_type}/{item_id}/is-owned",
+        )
+
+    if response.status != StatusCodes.OK:
+        ownership_checks_counter.labels(item_type=item_type, result="error").inc()
+        raise RobloxAPIError(f"Could not check if {roblox_user.id} owns {item_type} {item_id}.")
+
+    owned = response.body is True
+    ownership_checks_counter.labels(item_type=item_type, result="owned" if owned else "not_owned").inc()
+
+    return owned
+
+
+async def evaluate_binds(
+    guild: GuildSnapshot,
+    member: hikari.Member | MemberSerializable,
+    roblox_user: RobloxUser | None = None,
+) -> BindEvaluation:
+    """Evaluate the binds of a guild for a member on this node, instead of through the bind API.
+
+    Args:
+        guild (GuildSnapshot): The guild of the member.
+        member (hikari.Member | MemberSerializable): The member being updated.
+        roblox_user (RobloxUser, optional): The linked account of the member, with their groups synced.
+            Defaults to None.
+
+    Raises:
+        UnsupportedBind: A bind of the guild can't be evaluated locally.
+        ValueError: The groups of the Roblox account were not synced.
+        RobloxAPIError: The ownership of an item could not be checked.
+
+    Returns:
+        BindEvaluation: The roles to add and remove, the roles to create and the nickname of the member.
+    """
+
+    compiled = await _compiled_binds(guild.id)
+    group_ranks: dict[int, tuple[int, str, tuple[str, ...]]] | None = None
+    owned_items: set[OwnedItem] = set()
+
+    if roblox_user:
+        # unsynced groups would look like the member is in no group, and their group roles would be removed
+        if roblox_user.groups is None:
+            raise ValueError(f"The groups of Roblox user {roblox_user.id} were not synced.")
+
+        group_ranks = {}
+
+        for group_id, group in roblox_user.groups.items():
+            if group.user_roleset:
+                rank_names = tuple(roleset.name for roleset in (group.rolesets or {}).values())
+                group_ranks[int(group_id)] = (group.user_roleset.rank, group.user_roleset.name, rank_names)
+
+        if compiled.owned_items:
+            semaphore = asyncio.Semaphore(MAX_CONCURRENT_OWNERSHIP_CHECKS)
+            items = list(compiled.owned_items)
+            ownership = await asyncio.gather(*(_owns_item(roblox_user, item, semaphore) for item in items))
+            owned_items = {item for item, owned in zip(items, ownership) if owned}
+
+    evaluation, nickname_template = compiled.evaluate(guild, member.role_ids, group_ranks, owned_items)
+
+    if not nickname_template:
+        return evaluation
+
+    nickname = await parse_template(
+        guild_id=guild.id,
+        guild_name=guild.name,
+        member=member,
+        roblox_user=roblox_user,
+        template=nickname_template,
+    )
+
+    return BindEvaluation(
+        add_roles=evaluation.add_roles,
+        remove_roles=evaluation.remove_roles,
+        missing_roles=evaluation.missing_roles,
+        nickname=nickname,
+    )
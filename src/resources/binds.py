@@ -1,8 +1,10 @@
 from __future__ import annotations
 
+import asyncio
+import logging
 from collections import defaultdict
 from datetime import timedelta
-from typing import TYPE_CHECKING, Unpack
+from typing import TYPE_CHECKING, TypedDict, Unpack
 
 import hikari
 from bloxlink_lib import (
@@ -10,24 +12,28 @@ from bloxlink_lib import (
     BaseModel,
     BindCriteriaDict,
     GuildBind,
-    GuildSerializable,
     MemberSerializable,
     SnowflakeSet,
     StatusCodes,
     count_binds,
-    fetch_typed,
     get_binds,
     parse_template,
     get_environment,
     Environment
 )
-from bloxlink_lib.database import fetch_guild_data, fetch_user_data, update_guild_data, update_user_data
+from bloxlink_lib.database import fetch_user_data, update_user_data
+from prometheus_client import Counter
 from pydantic import Field
 
 from config import CONFIG
 from resources import restriction
+from resources.api.http_client import PreEncodedJSON, http_client
 from resources.api.roblox import users
+from resources.api.roblox.entities import resolve_bind_entities
+from resources.bind_evaluator import UnsupportedBind, evaluate_binds
 from resources.bloxlink import bloxlink
+from resources.database import fetch_guild_data, update_guild_data
+from resources.member_edits import MemberEditPlan
 from resources.constants import LIMITS, ORANGE_COLOR
 from resources.exceptions import (
     BindConflictError,
@@ -38,16 +44,40 @@ from resources.exceptions import (
     CancelCommand,
 )
 from resources.premium import get_premium_status, PremiumTier
+from resources.task_graph import TaskGraph
 from resources.ui.components import Button, Component
 from resources.ui.embeds import InteractiveMessage
+from resources.ui.pagination import PaginatorItemCodec
 
 if TYPE_CHECKING:
+    from bloxlink_lib import GuildData
+
+    from resources.guild_snapshot import GuildSnapshot
     from resources.response import Response
 
 
 # Set to True to remove the old bind fields from the database (groupIDs and roleBinds)
 POP_OLD_BINDS: bool = False
 
+bind_evaluations_counter = Counter(
+    "bind_evaluations",
+    "Member updates evaluated by this node, by the evaluation mode and whether it agreed with the bind API",
+    ["mode", "result"],
+)
+
+# shadow evaluations run after the update was answered, and are referenced here until they finish
+_shadow_evaluations: set[asyncio.Task] = set()
+
+
+class BindListing(TypedDict):
+    """How a bind is listed by /viewbinds and /unbind, with the name of its entity already resolved."""
+
+    type: VALID_BIND_TYPES
+    id: int | None
+    entity: str
+    description: str
+    short_description: str
+
 
 class UpdateEndpointResponse(BaseModel):
     """The payload that is sent from the bind API when updating a user's roles and nickname."""
@@ -59,6 +89,12 @@ class UpdateEndpointResponse(BaseModel):
     missing_roles: list[str] = Field(alias="missingRoles")
 
 
+class BatchUpdateEndpointResponse(BaseModel):
+    """The payload that is sent from the bind API when updating several members of a guild at once."""
+
+    results: list[UpdateEndpointResponse]
+
+
 async def create_bind(
     guild_id: int | str,
     bind_type: VALID_BIND_TYPES,
@@ -151,7 +187,8 @@ async def create_bind(
             )
 
         if roles:
-            # Remove invalid guild roles
+            # Remove invalid guild roles. Fetched rather than read from the guild snapshot, which may not have
+            # a role that was just created in Discord.
             guild_roles = set((await bloxlink.fetch_roles(guild_id)).keys())
             existing_roles = set(existing_binds[0].roles + roles)
 
@@ -204,19 +241,21 @@ async def delete_bind(
     )
 
 
-async def calculate_bound_roles(
-    guild: hikari.RESTGuild,
+async def _calculate_bound_roles_remote(
+    guild: GuildSnapshot,
     member: hikari.Member | MemberSerializable,
     roblox_user: users.RobloxAccount = None,
 ) -> UpdateEndpointResponse:
     # Get user roles + nickname
-    update_data, update_data_response = await fetch_typed(
+    update_data, update_data_response = await http_client.request_typed(
         UpdateEndpointResponse,
+        "POST",
         f"{CONFIG.BOT_API}/binds/{guild.id}/{member.id}",
-        method="POST",
+        endpoint="bot-api:/binds/{guild_id}/{member_id}",
+        idempotent=True, # the bind API only calculates, the member is changed by this node
         headers={"Authorization": CONFIG.BOT_API_AUTH},
         body={
-            "guild_roles": GuildSerializable.from_hikari(guild).model_dump(by_alias=True)["roles"],
+            "guild_roles": PreEncodedJSON(guild.encoded_role_payloads),
             "guild_name": guild.name,
             "member": MemberSerializable.from_hikari(member).model_dump(by_alias=True),
             "roblox_user": roblox_user.model_dump(by_alias=True) if roblox_user else None,
@@ -229,6 +268,187 @@ async def calculate_bound_roles(
     return update_data
 
 
+async def _calculate_bound_roles_local(
+    guild: GuildSnapshot,
+    member: hikari.Member | MemberSerializable,
+    roblox_user: users.RobloxAccount = None,
+) -> UpdateEndpointResponse:
+    evaluation = await evaluate_binds(guild, member, roblox_user)
+
+    return UpdateEndpointResponse(
+        nickname=evaluation.nickname,
+        addRoles=evaluation.add_roles,
+        removeRoles=evaluation.remove_roles,
+        missingRoles=evaluation.missing_roles,
+    )
+
+
+def bound_roles_differences(
+    expected: UpdateEndpointResponse, actual: UpdateEndpointResponse, member_role_ids: set[int]
+) -> dict[str, tuple]:
+    """Compare two bind evaluations by what they would change about the member.
+
+    Roles to add that the member already has and roles to remove that they don't have change nothing, so they
+    are not differences.
+
+    Returns:
+        dict[str, tuple]: The fields that differ, mapped to the expected and the actual value.
+    """
+
+    differences: dict[str, tuple] = {}
+    fields = {
+        "add_roles": lambda response: set(response.add_roles) - member_role_ids,
+        "remove_roles": lambda response: set(response.remove_roles) & member_role_ids,
+        "missing_roles": lambda response: set(response.missing_roles),
+        "nickname": lambda response: response.nickname,
+    }
+
+    for field_name, effect in fields.items():
+        if (expected_value := effect(expected)) != (actual_value := effect(actual)):
+            differences[field_name] = (expected_value, actual_value)
+
+    return differences
+
+
+async def _shadow_evaluate(
+    guild: GuildSnapshot,
+    member: hikari.Member | MemberSerializable,
+    roblox_user: users.RobloxAccount | None,
+    remote_data: UpdateEndpointResponse,
+):
+    try:
+        local_data = await _calculate_bound_roles_local(guild, member, roblox_user)
+    except UnsupportedBind:
+        bind_evaluations_counter.labels(mode="shadow", result="unsupported").inc()
+        return
+    except Exception:
+        bind_evaluations_counter.labels(mode="shadow", result="error").inc()
+        logging.exception(f"Local bind evaluation failed for member {member.id} of guild {guild.id}")
+        return
+
+    differences = bound_roles_differences(remote_data, local_data, set(member.role_ids))
+
+    if differences:
+        bind_evaluations_counter.labels(mode="shadow", result="mismatch").inc()
+        logging.warning(
+            f"Local bind evaluation disagreed with the bind API for member {member.id} of guild {guild.id} "
+            f"(field: (bind API, local)): {differences}"
+        )
+    else:
+        bind_evaluations_counter.labels(mode="shadow", result="match").inc()
+
+
+async def calculate_bound_roles(
+    guild: GuildSnapshot,
+    member: hikari.Member | MemberSerializable,
+    roblox_user: users.RobloxAccount = None,
+) -> UpdateEndpointResponse:
+    """Calculate the roles and the nickname that the binds of the guild give a member.
+
+    Depending on CONFIG.BIND_EVALUATION, this is done by the bind API, by the bind API while this node evaluates
+    the binds in the background and logs any disagreement, or by this node. Guilds with binds that this node
+    can't evaluate, and local evaluations that fail, are evaluated by the bind API.
+    """
+
+    if CONFIG.BIND_EVALUATION == "local":
+        try:
+            update_data = await _calculate_bound_roles_local(guild, member, roblox_user)
+        except UnsupportedBind:
+            bind_evaluations_counter.labels(mode="local", result="unsupported").inc()
+        except Exception:
+            bind_evaluations_counter.labels(mode="local", result="error").inc()
+            logging.exception(f"Local bind evaluation failed for member {member.id} of guild {guild.id}")
+        else:
+            bind_evaluations_counter.labels(mode="local", result="evaluated").inc()
+            return update_data
+
+    update_data = await _calculate_bound_roles_remote(guild, member, roblox_user)
+
+    if CONFIG.BIND_EVALUATION == "shadow":
+        _start_shadow_evaluation(guild, member, roblox_user, update_data)
+
+    return update_data
+
+
+def _start_shadow_evaluation(
+    guild: GuildSnapshot,
+    member: hikari.Member | MemberSerializable,
+    roblox_user: users.RobloxAccount | None,
+    remote_data: UpdateEndpointResponse,
+):
+    shadow_task = asyncio.create_task(_shadow_evaluate(guild, member, roblox_user, remote_data))
+    _shadow_evaluations.add(shadow_task)
+    shadow_task.add_done_callback(_shadow_evaluations.discard)
+
+
+async def calculate_bound_roles_batch(
+    guild: GuildSnapshot,
+    members: list[tuple[hikari.Member | MemberSerializable, users.RobloxAccount | None]],
+) -> list[UpdateEndpointResponse]:
+    """Calculate the roles and the nickname of several members of a guild with one request to the bind API.
+
+    The roles of the guild are sent once for every member instead of once per member. The groups of the Roblox
+    accounts are synced first, as apply_binds() would.
+
+    Args:
+        guild (GuildSnapshot): The guild of the members.
+        members (list[tuple[hikari.Member | MemberSerializable, users.RobloxAccount | None]]): The members and
+            their linked account, if they have one.
+
+    Raises:
+        Message: Raised if the bind API could not calculate the roles of these members.
+
+    Returns:
+        list[UpdateEndpointResponse]: The result of each member, in the same order as the members.
+    """
+
+    if not members:
+        return []
+
+    await asyncio.gather(
+        *(
+            roblox_user.sync(["groups"])
+            for _, roblox_user in members
+            if roblox_user and roblox_user.groups is None
+        )
+    )
+
+    if CONFIG.BIND_EVALUATION == "local":
+        return list(
+            await asyncio.gather(
+                *(calculate_bound_roles(guild, member, roblox_user) for member, roblox_user in members)
+            )
+        )
+
+    update_data, update_data_response = await http_client.request_typed(
+        BatchUpdateEndpointResponse,
+        "POST",
+        f"{CONFIG.BOT_API}/binds/{guild.id}",
+        endpoint="bot-api:/binds/{guild_id}",
+        headers={"Authorization": CONFIG.BOT_API_AUTH},
+        body={
+            "guild_roles": PreEncodedJSON(guild.encoded_role_payloads),
+            "guild_name": guild.name,
+            "members": [
+                {
+                    "member": MemberSerializable.from_hikari(member).model_dump(by_alias=True),
+                    "roblox_user": roblox_user.model_dump(by_alias=True) if roblox_user else None,
+                }
+                for member, roblox_user in members
+            ],
+        },
+    )
+
+    if update_data_response.status != StatusCodes.OK or len(update_data.results) != len(members):
+        raise Message("Something went wrong internally when trying to update these users!")
+
+    if CONFIG.BIND_EVALUATION == "shadow":
+        for (member, roblox_user), member_data in zip(members, update_data.results):
+            _start_shadow_evaluation(guild, member, roblox_user, member_data)
+
+    return update_data.results
+
+
 async def apply_binds(
     member: hikari.Member | MemberSerializable,
     guild_id: hikari.Snowflake,
@@ -238,6 +458,7 @@ async def apply_binds(
     dm_user: bool = True,
     update_embed_for_unverified: bool = False,
     mention_roles: bool = True,
+    bound_roles: UpdateEndpointResponse = None,
 ) -> InteractiveMessage:
     """Apply bindings to a user, (apply the Verified & Unverified roles, nickname template, and custom bindings).
 
@@ -253,6 +474,8 @@ async def apply_binds(
         update_embed_for_unverified (bool, optional): Should the embed be updated to show the roles added/removed
             for unverified users? Defaults to False.
         mention_roles (bool, optional): Whether the roles be mentioned in the embed. Otherwise, shows role names. Defaults to True.
+        bound_roles (UpdateEndpointResponse, optional): The roles and nickname of the user if they were already
+            calculated, such as by calculate_bound_roles_batch(). Defaults to None.
 
     Raises:
         Message: Raised if there was an issue getting a server's bindings.
@@ -267,68 +490,112 @@ async def apply_binds(
     if member.is_bot:
         return InteractiveMessage(embed_description=("Sorry, bots cannot be updated."))
 
-    if roblox_account and roblox_account.groups is None:
-        await roblox_account.sync(["groups"])
+    show_verification_link = not (roblox_account or update_embed_for_unverified or CONFIG.BOT_RELEASE == "LOCAL")
+
+    async def sync_account_groups():
+        if roblox_account and roblox_account.groups is None:
+            await roblox_account.sync(["groups"])
 
+    async def check_restriction(guild: GuildSnapshot, account_groups: None) -> restriction.Restriction:
+        restriction_check = restriction.Restriction(
+            member=member,
+            guild_id=guild_id,
+            roblox_user=roblox_account,
+            guild_name=guild.name,
+        )
+        await restriction_check.sync()
 
-    guild: hikari.RESTGuild = await bloxlink.rest.fetch_guild(guild_id)
-    guild_roles = guild.roles
-    guild_data = await fetch_guild_data(guild_id, "verifiedDM")
+        return restriction_check
 
-    embed = hikari.Embed()
-    components: list[Component] = []
-    warnings: list[str] = []
+    async def calculate_roles(guild: GuildSnapshot, account_groups: None) -> UpdateEndpointResponse:
+        if bound_roles:
+            return bound_roles
 
-    add_roles = SnowflakeSet(type="role", str_reference=guild_roles if not mention_roles else None)
-    remove_roles = SnowflakeSet(type="role", str_reference=guild_roles if not mention_roles else None)
-    nickname: str = None
+        return await calculate_bound_roles(guild=guild, member=member, roblox_user=roblox_account)
 
-    removed_user = False
+    async def render_verified_dm(guild: GuildSnapshot, guild_data: GuildData, account_groups: None) -> str:
+        if not roblox_account:
+            return "To verify with Bloxlink, click the link below."
 
-    # Check restrictions
-    restriction_check = restriction.Restriction(
-        member=member,
-        guild_id=guild_id,
-        roblox_user=roblox_account,
-        guild_name=guild.name,
-    )
-    await restriction_check.sync()
+        return await parse_template(
+            guild_id=guild_id,
+            guild_name=guild.name,
+            member=member,
+            roblox_user=roblox_account,
+            template=guild_data.verifiedDM,
+            max_length=False,
+        )
 
-    if restriction_check.restricted:
-        # Don't tell the user which account they're evading with.
-        if restriction_check.source == "banEvader":
-            warnings.append(
-                f"({restriction_check.source}): User is evading a ban from a previous Discord account."
+    # The restriction check only gates the steps that change the member. Calculating their roles and rendering
+    # the DM have no side effects, so they run alongside it and are cancelled if the member is restricted.
+    async with TaskGraph("apply_binds") as graph:
+        graph.add("account_groups", sync_account_groups)
+        graph.add("guild", lambda: bloxlink.fetch_guild_snapshot(guild_id))
+        graph.add("guild_data", lambda: fetch_guild_data(guild_id, "verifiedDM"))
+        graph.add("restriction", check_restriction, after=("guild", "account_groups"))
+        graph.add("bound_roles", calculate_roles, after=("guild", "account_groups"))
+        graph.add("verified_dm", render_verified_dm, after=("guild", "guild_data", "account_groups"))
+
+        if show_verification_link:
+            graph.add(
+                "verification_link", lambda: users.get_verification_link(user_id=member.id, guild_id=guild_id)
             )
-        else:
-            warnings.append(f"({restriction_check.source}): {restriction_check.reason}")
 
-        # Remove the user if we're moderating.
-        if moderate_user:
-            try:
-                await restriction_check.moderate(dm_user=dm_user)
-            except (hikari.ForbiddenError, hikari.NotFoundError):
-                warnings.append("User could not be removed from the server.")
+        graph.start()
+
+        guild: GuildSnapshot = await graph.result("guild")
+        guild_roles = dict(guild.roles) # the snapshot is shared, and roles created below are added to this
+
+        embed = hikari.Embed()
+        components: list[Component] = []
+        warnings: list[str] = []
+
+        add_roles = SnowflakeSet(type="role", str_reference=guild_roles if not mention_roles else None)
+        remove_roles = SnowflakeSet(type="role", str_reference=guild_roles if not mention_roles else None)
+        nickname: str = None
+
+        removed_user = False
+
+        # Check restrictions
+        restriction_check: restriction.Restriction = await graph.result("restriction")
+
+        if restriction_check.restricted:
+            # Don't tell the user which account they're evading with.
+            if restriction_check.source == "banEvader":
+                warnings.append(
+                    f"({restriction_check.source}): User is evading a ban from a previous Discord account."
+                )
             else:
-                warnings.append("User was removed from the server.")
-                removed_user = True
+                warnings.append(f"({restriction_check.source}): {restriction_check.reason}")
+
+            # Remove the user if we're moderating.
+            if moderate_user:
+                try:
+                    await restriction_check.moderate(dm_user=dm_user)
+                except (hikari.ForbiddenError, hikari.NotFoundError):
+                    warnings.append("User could not be removed from the server.")
+                else:
+                    warnings.append("User was removed from the server.")
+                    removed_user = True
+
+            # User won't see the response. Stop early. Bot tries to DM them before they are removed.
+            if removed_user:
+                return InteractiveMessage(
+                    embed_description=(
+                        "User was removed from this server as per this server's settings.\n"
+                        "> *Admins, confused? Check the Discord audit log for the reason why this user was removed from the server.*"
+                    )
+                )
 
-        # User won't see the response. Stop early. Bot tries to DM them before they are removed.
-        if removed_user:
             return InteractiveMessage(
                 embed_description=(
-                    "User was removed from this server as per this server's settings.\n"
-                    "> *Admins, confused? Check the Discord audit log for the reason why this user was removed from the server.*"
+                    "Sorry, you are restricted from verifying in this server. Server admins: please run `/restriction view` to learn why."
                 )
             )
 
-        return InteractiveMessage(
-            embed_description=(
-                "Sorry, you are restricted from verifying in this server. Server admins: please run `/restriction view` to learn why."
-            )
-        )
-
-    update_payload = await calculate_bound_roles(guild=guild, member=member, roblox_user=roblox_account)
+        update_payload: UpdateEndpointResponse = await graph.result("bound_roles")
+        verified_dm: str = await graph.result("verified_dm")
+        verification_link: str | None = await graph.result("verification_link") if show_verification_link else None
 
     add_roles.update(update_payload.add_roles)
     remove_roles.update(update_payload.remove_roles)
@@ -336,8 +603,15 @@ async def apply_binds(
 
     if update_payload.missing_roles:
         for role_name in update_payload.missing_roles:
+            # the roles may have been calculated before another member created this role, such as in a
+            # batch of /verifyall, so check a snapshot that is loaded again before creating it
+            if existing_role := (await bloxlink.fetch_guild_snapshot(guild_id)).role_by_name(role_name):
+                add_roles.add(existing_role.id)
+                guild_roles[existing_role.id] = existing_role
+                continue
+
             try:
-                new_role: hikari.Role = await bloxlink.rest.create_role(
+                new_role: hikari.Role = await bloxlink.create_role(
                     guild_id, name=role_name, reason="Creating missing role"
                 )
                 add_roles.add(new_role.id)
@@ -348,30 +622,27 @@ async def apply_binds(
                     embed_description="I don't have permission to create roles on this server."
                 )
 
-    # Apply roles and nickname to the user
-    # We do roles and nickname separately so if the nickname fails, the roles still apply.
-    # (It would take more HTTP requests to fetch the top roles of both the user and the bot)
-    if add_roles or remove_roles:
-        try:
-            await bloxlink.edit_user(
-                member=member, guild_id=guild_id, add_roles=add_roles, remove_roles=remove_roles
-            )
-        except hikari.ForbiddenError:
-            raise BloxlinkForbidden("I don't have permission to add roles to this user.") from None
-        except hikari.NotFoundError:
-            raise CancelCommand()
+    # Apply roles and nickname to the user, skipping what is already applied.
+    # The nickname of the owner can't be changed by anyone.
+    edit_plan = MemberEditPlan.create(
+        member, add_roles, remove_roles, nickname if guild.owner_id != member.id else None
+    )
 
-    if nickname and guild.owner_id != member.id:
-        try:
-            await bloxlink.edit_user(member=member, guild_id=guild_id, nickname=nickname)
-        except hikari.ForbiddenError:
+    try:
+        if not await edit_plan.apply(guild_id):
             warnings.append("I don't have permission to change this user's nickname.")
-        except hikari.NotFoundError:
-            raise CancelCommand()
+    except hikari.ForbiddenError:
+        raise BloxlinkForbidden("I don't have permission to add roles to this user.") from None
+    except hikari.NotFoundError:
+        raise CancelCommand()
+
+    # only list the roles that actually changed
+    add_roles.intersection_update(edit_plan.add_roles)
+    remove_roles.intersection_update(edit_plan.remove_roles)
 
     # Build response embed
     if roblox_account or update_embed_for_unverified or CONFIG.BOT_RELEASE == "LOCAL":
-        if add_roles or remove_roles or warnings or nickname:
+        if add_roles or remove_roles or warnings or edit_plan.nickname:
             embed.title = "Member Updated"
         else:
             embed.title = "Member Unchanged"
@@ -407,10 +678,7 @@ async def apply_binds(
         components = [
             Button(
                 label="Verify with Bloxlink",
-                url=await users.get_verification_link(
-                    user_id=member.id,
-                    guild_id=guild_id,
-                ),
+                url=verification_link,
             ),
             Button(
                 label="Stuck? See a Tutorial",
@@ -419,16 +687,7 @@ async def apply_binds(
         ]
 
     return InteractiveMessage(
-        content="To verify with Bloxlink, click the link below."
-        if not roblox_account
-        else await parse_template(
-            guild_id=guild_id,
-            guild_name=guild.name,
-            member=member,
-            roblox_user=roblox_account,
-            template=guild_data.verifiedDM,
-            max_length=False,
-        ),
+        content=verified_dm,
         embed=embed,
         action_rows=components,
     )
@@ -484,20 +743,47 @@ async def confirm_account(
                 pass
 
 
-async def generate_binds_embed(items: list[GuildBind], embed: hikari.Embed):
-    """Syncs the entities of the given binds and adds them to the embed."""
+async def render_binds(binds: list[GuildBind]) -> list[BindListing]:
+    """Syncs the entities of the given binds and renders how they are listed."""
+
+    listings: list[BindListing] = []
+
+    await resolve_bind_entities(binds)
+
+    for bind in binds:
+        listings.append(
+            BindListing(
+                type=bind.type,
+                id=bind.criteria.id,
+                entity=str(bind.entity),
+                description=str(bind),
+                short_description=bind.short_description,
+            )
+        )
+
+    return listings
+
+
+# binds are rendered once per page and kept in the paginator snapshot, so flipping pages doesn't sync them again
+BIND_PAGINATOR_CODEC: PaginatorItemCodec[GuildBind] = PaginatorItemCodec(
+    dump=lambda bind: bind.model_dump(exclude_unset=True, by_alias=True),
+    load=lambda data: GuildBind(**data),
+    render=render_binds,
+)
+
+
+async def generate_binds_embed(items: list[BindListing], embed: hikari.Embed):
+    """Adds the given binds to the embed, grouped by their entity."""
 
     bind_list: dict[str, list[str]] = {}
 
     for bind in items:
-        await bind.entity.sync()
-
-        bind_entity = str(bind.entity)
+        bind_entity = bind["entity"]
 
         if bind_entity not in bind_list:
             bind_list[bind_entity] = []
 
-        bind_list[bind_entity].append(str(bind))
+        bind_list[bind_entity].append(bind["description"])
 
     for bind_entity, bind_strings in bind_list.items():
         embed.add_field(name=bind_entity, value="\n".join(bind_strings))
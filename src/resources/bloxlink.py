@@ -10,8 +10,14 @@ import yuyo
 from motor.motor_asyncio import AsyncIOMotorClient
 from redis import RedisError
 
-from bloxlink_lib import SnowflakeSet
 from bloxlink_lib.database import redis
+from resources.database import GUILD_DATA_INVALIDATION_CHANNEL, guild_data_cache
+from resources.guild_snapshot import (
+    GUILD_SNAPSHOT_INVALIDATION_CHANNEL,
+    GuildSnapshot,
+    guild_snapshot_cache,
+    invalidate_guild_snapshot,
+)
 from resources.redis import RedisMessageCollector
 from config import CONFIG
 
@@ -38,6 +44,12 @@ class Bloxlink(yuyo.AsgiBot):
         """Start the bot"""
 
         self.redis_messages = RedisMessageCollector()
+        await self.redis_messages.add_listener(
+            GUILD_DATA_INVALIDATION_CHANNEL, lambda message: guild_data_cache.invalidate(message["guild_id"])
+        )
+        await self.redis_messages.add_listener(
+            GUILD_SNAPSHOT_INVALIDATION_CHANNEL, lambda message: guild_snapshot_cache.drop(message["guild_id"])
+        )
 
         return await super().start()
 
@@ -136,38 +148,18 @@ class Bloxlink(yuyo.AsgiBot):
         )
         return res["data"]
 
-    async def edit_user(
-        self,
-        member: hikari.Member,
-        guild_id: str | int,
-        *,
-        add_roles: list[int] | SnowflakeSet = None,
-        remove_roles: list[int] | SnowflakeSet = None,
-        reason: str = "",
-        nickname: str = None,
-    ) -> hikari.Member:
-        """Edits the guild-bound member."""
+    async def fetch_guild_snapshot(self, guild_id: str | int) -> GuildSnapshot:
+        """Get the name, owner and roles of a guild without fetching it for every call. See GuildSnapshot."""
 
-        remove_roles = SnowflakeSet(remove_roles or [])
-        add_roles = SnowflakeSet(add_roles or [])
-        new_roles = SnowflakeSet()
+        return await guild_snapshot_cache.load(int(guild_id), self.rest.fetch_guild)
 
-        if add_roles or remove_roles:
-            new_roles.update(SnowflakeSet(member.role_ids).union(add_roles).difference(remove_roles))
+    async def create_role(self, guild_id: str | int, **kwargs) -> hikari.Role:
+        """rest.create_role() but also invalidates the snapshot of the guild."""
 
-        args = {
-            "user": member.id,
-            "guild": guild_id,
-            "reason": reason or "",
-        }
+        role = await self.rest.create_role(guild_id, **kwargs)
+        await invalidate_guild_snapshot(guild_id)
 
-        if new_roles:
-            args["roles"] = list(new_roles)
-
-        if nickname:
-            args["nickname"] = nickname
-
-        return await self.rest.edit_member(**args)
+        return role
 
     async def fetch_roles(self, guild_id: str | int, key_as_role_name: bool = False) -> dict[str, hikari.Role]:
         """guild.fetch_roles() but returns a dictionary instead"""
@@ -184,14 +176,11 @@ class Bloxlink(yuyo.AsgiBot):
         Returns:
             str: Comma separated string of the names for all the role IDs given.
         """
-        # TODO: Use redis -> gateway comms to get role data/role names.
-        # For now this just makes a http request every time it needs it.
-
-        guild_roles = await self.fetch_roles(guild_id)
+        guild_roles = (await self.fetch_guild_snapshot(guild_id)).roles
 
         return ", ".join(
             [
-                guild_roles.get(str(role_id)).name if guild_roles.get(str(role_id)) else "(Deleted Role)"
+                guild_roles.get(int(role_id)).name if guild_roles.get(int(role_id)) else "(Deleted Role)"
                 for role_id in roles
             ]
         )
@@ -0,0 +1,83 @@
+import time
+from collections import OrderedDict
+from typing import Hashable
+
+from prometheus_client import Counter
+
+
+cache_hits_counter = Counter("cache_hits", "Reads served by a local cache", ["cache"])
+cache_misses_counter = Counter("cache_misses", "Reads that were not served by a local cache", ["cache"])
+cache_evictions_counter = Counter("cache_evictions", "Entries dropped from a local cache", ["cache", "reason"])
+
+
+class TTLCache[K: Hashable, V]:
+    """Bounded, process-local LRU cache whose entries expire after a TTL.
+
+    Hits, misses and evictions are exported to Prometheus, labelled with the name of the cache.
+    """
+
+    def __init__(self, name: str, max_size: int, ttl: float):
+        self.name = name
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: OrderedDict[K, tuple[float, V]] = OrderedDict()
+
+    def get(self, key: K) -> V | None:
+        """Return the value of this key and count it as a hit or a miss."""
+
+        value = self.peek(key)
+
+        if value is None:
+            self.miss()
+        else:
+            self.hit()
+
+        return value
+
+    def peek(self, key: K) -> V | None:
+        """Return the value of this key without counting it as a hit or a miss."""
+
+        entry = self._entries.get(key)
+
+        if entry is None:
+            return None
+
+        if entry[0] <= time.monotonic():
+            del self._entries[key]
+            cache_evictions_counter.labels(cache=self.name, reason="expired").inc()
+            return None
+
+        self._entries.move_to_end(key)
+
+        return entry[1]
+
+    def set(self, key: K, value: V, ttl: float = None):
+        """Cache a value, evicting the least recently used entries if the cache is full."""
+
+        self._entries[key] = (time.monotonic() + (ttl or self.ttl), value)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            cache_evictions_counter.labels(cache=self.name, reason="size").inc()
+
+    def pop(self, key: K) -> V | None:
+        """Drop this key from the cache."""
+
+        entry = self._entries.pop(key, None)
+
+        if entry is None:
+            return None
+
+        cache_evictions_counter.labels(cache=self.name, reason="invalidated").inc()
+
+        return entry[1]
+
+    def hit(self):
+        cache_hits_counter.labels(cache=self.name).inc()
+
+    def miss(self):
+        cache_misses_counter.labels(cache=self.name).inc()
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -1,26 +1,35 @@
 from __future__ import annotations
 
+import asyncio
+import hashlib
+import importlib
 import json
 import logging
 import re
-from typing import Callable, Type, TypedDict, Unpack, Annotated, Any, TYPE_CHECKING
+from dataclasses import dataclass, field
+from typing import Callable, ClassVar, Type, TypedDict, Unpack, Annotated, Any, TYPE_CHECKING
 from abc import ABC, abstractmethod
 from datetime import timedelta
 import hikari
 import humanize
 from pydantic import Field
 from bloxlink_lib import BaseModelArbitraryTypes, find
-from bloxlink_lib.database import redis, fetch_guild_data, update_guild_data
+from bloxlink_lib.database import redis
 from resources.user_permissions import get_user_type, UserTypes
 from resources.exceptions import (
     BloxlinkForbidden, CancelCommand, PremiumRequired, UserNotVerified,
     RobloxNotFound, RobloxDown, Message, BindException
 )
 from resources.ui.modals import ModalCustomID
+from resources.ui.autocomplete import run_autocomplete
 from resources.premium import get_premium_status, PremiumTier
+from resources.cooldowns import CooldownMode, reserve_cooldown, release_cooldown
 from resources.response import Prompt, PromptCustomID, PromptPageData, Response
 from resources.ui.pagination import PaginatorCustomID, Paginator
-from resources.ui.components import CommandCustomID, BaseCommandCustomID, DeprecatedCustomID
+from resources.ui.components import BaseCommandCustomID, DeprecatedCustomID
+from resources.routing import CustomIDRoute, CustomIDRouter
+from resources.manifest import ManifestData, command_manifest
+from resources.database import fetch_guild_data, update_guild_data, use_guild_data_loader
 from resources.bloxlink import bloxlink
 from static.whitelist import WHITELISTED_GUILDS
 from config import CONFIG
@@ -32,6 +41,7 @@ if TYPE_CHECKING:
 command_name_pattern = re.compile("(.+)Command")
 
 slash_commands: dict[str, Command] = {}
+custom_id_router = CustomIDRouter()
 
 
 class Command(BaseModelArbitraryTypes):
@@ -57,13 +67,22 @@ class Command(BaseModelArbitraryTypes):
     guild_ids: list[int] = [] # if empty, it's global
     cooldown: timedelta = None
     cooldown_key: str = "cooldown:{guild_id}:{user_id}:{command_name}"
+    cooldown_mode: CooldownMode = "fixed_window"
+    cooldown_uses: int = 1 # uses per cooldown window, only for token buckets
     paginator_options: Annotated[dict, Field(default_factory=dict)]
+    guild_data_fields: list[str] = [] # guild data this command reads, fetched together with the first read
+    module: str = None # module that defines this command, used for the command manifest
 
-    async def assert_premium(self, interaction: hikari.CommandInteraction):
+    # checks that only use memory, so they run first and fail before any I/O is issued
+    local_preconditions: ClassVar[tuple[str, ...]] = ("whitelisted", "permissions")
+    # checks that do I/O and do not depend on each other, so they run concurrently
+    io_preconditions: ClassVar[tuple[str, ...]] = ("premium", "cooldown")
+
+    async def assert_premium(self, ctx: CommandContext):
         """If the command requires premium, assert whether the server has premium."""
 
         if self.premium or CONFIG.BOT_RELEASE == "PRO":
-            premium_status = await get_premium_status(guild_id=interaction.guild_id, interaction=interaction)
+            premium_status = await get_premium_status(guild_id=ctx.guild_id, interaction=ctx.interaction)
 
             if not self.pro_bypass and ((CONFIG.BOT_RELEASE == "PRO" and premium_status.tier != PremiumTier.PRO) or (self.premium and not premium_status.active)):
                 raise PremiumRequired()
@@ -97,45 +116,35 @@ class Command(BaseModelArbitraryTypes):
         if self.developer_only and get_user_type(member.id) != UserTypes.BLOXLINK_DEVELOPER:
             raise BloxlinkForbidden("This command is only available to developers.", ephemeral=True)
 
-    async def assert_cooldown(self, ctx: CommandContext):
-        """Check if the user can execute this command based on its cooldown."""
+    def format_cooldown_key(self, ctx: CommandContext) -> str:
+        """Return the cooldown key of this command for the context."""
 
-        user_id = ctx.user.id
-        guild_id = ctx.guild_id
-        command_name = self.name
+        return self.cooldown_key.format(
+            guild_id=ctx.guild_id,
+            user_id=ctx.user.id,
+            command_name=self.name,
+        )
+
+    async def assert_cooldown(self, ctx: CommandContext):
+        """Check if the user can execute this command based on its cooldown, and reserve a use of it if so."""
 
         if not self.cooldown:
             return
 
-        cooldown_key = self.cooldown_key.format(
-            guild_id=guild_id,
-            user_id=user_id,
-            command_name=command_name,
+        time_left = await reserve_cooldown(
+            self.format_cooldown_key(ctx), self.cooldown, mode=self.cooldown_mode, uses=self.cooldown_uses
         )
 
-        seconds_left = await redis.ttl(cooldown_key)
-
-        if seconds_left and seconds_left > 0:
-            expiration_datetime = timedelta(seconds=seconds_left)
-            expiration_str = humanize.naturaldelta(expiration_datetime)
+        if time_left:
+            expiration_str = humanize.naturaldelta(time_left)
 
             raise BloxlinkForbidden(f"You are on cooldown for this command. Please wait **{expiration_str}** before using it again.", ephemeral=True)
 
-    async def set_cooldown(self, ctx: CommandContext):
-        """Set the cooldown for the user."""
+    async def release_cooldown(self, ctx: CommandContext):
+        """Give back the use of the cooldown that was reserved by assert_cooldown()."""
 
         if self.cooldown:
-            user_id = ctx.user.id
-            guild_id = ctx.guild_id
-            command_name = self.name
-
-            cooldown_key = self.cooldown_key.format(
-                guild_id=guild_id,
-                user_id=user_id,
-                command_name=command_name,
-            )
-
-            await redis.set(cooldown_key, "1", expire=self.cooldown)
+            await release_cooldown(self.format_cooldown_key(ctx), mode=self.cooldown_mode, uses=self.cooldown_uses)
 
     async def assert_whitelisted(self, ctx: CommandContext):
         """Check if the user is whitelisted to run this command."""
@@ -143,29 +152,62 @@ class Command(BaseModelArbitraryTypes):
         if ctx.guild_id and ctx.guild_id not in WHITELISTED_GUILDS:
             raise BloxlinkForbidden("This command is not available in this server.", ephemeral=True)
 
+    async def assert_preconditions(self, ctx: CommandContext):
+        """Run every check that must pass before this command can execute.
+
+        The local checks run in order, then the I/O checks run concurrently. Each check is timed as a phase
+        of the interaction. If several I/O checks fail, the error of the first one declared is raised.
+
+        Args:
+            ctx (CommandContext): Context for this command.
+        """
+
+        timer = ctx.response.timer
+
+        for precondition in self.local_preconditions:
+            with timer.phase(precondition):
+                await getattr(self, f"assert_{precondition}")(ctx)
+
+        async def run_precondition(precondition: str):
+            with timer.phase(precondition):
+                await getattr(self, f"assert_{precondition}")(ctx)
+
+        results = await asyncio.gather(
+            *(run_precondition(precondition) for precondition in self.io_preconditions), return_exceptions=True
+        )
+        failures = [result for result in results if isinstance(result, BaseException)]
+
+        if failures:
+            results_by_precondition = dict(zip(self.io_preconditions, results))
+
+            if "cooldown" in results_by_precondition and not isinstance(
+                results_by_precondition["cooldown"], BaseException
+            ):
+                # another check failed, so the use of the cooldown that was reserved is given back
+                await self.release_cooldown(ctx)
+
+            raise failures[0]
+
     async def execute(self, ctx: CommandContext, subcommand_name: str = None):
-        """Execute a command (or its subcommand)
+        """Execute a command (or its subcommand). assert_preconditions() must have passed first, and the caller
+        gives back the reserved use of the cooldown if this raises.
 
         Args:
             ctx (CommandContext): Context for this command.
             subcommand_name (str, optional): Name of the subcommand to trigger. Defaults to None.
         """
 
-        await self.assert_whitelisted(ctx)
-        await self.assert_permissions(ctx)
-        await self.assert_cooldown(ctx)
-
-        generator_or_coroutine = self.subcommands[subcommand_name]["fn"](ctx) if subcommand_name else self.fn(ctx)
+        timer = ctx.response.timer
 
-        if hasattr(generator_or_coroutine, "__anext__"):
-            async for generator_response in generator_or_coroutine:
-                yield generator_response
+        with timer.phase("handler"):
+            generator_or_coroutine = self.subcommands[subcommand_name]["fn"](ctx) if subcommand_name else self.fn(ctx)
 
-        else:
-            yield await generator_or_coroutine
+            if hasattr(generator_or_coroutine, "__anext__"):
+                async for generator_response in generator_or_coroutine:
+                    yield generator_response
 
-        # command executed without raising exceptions, so we can set the cooldown
-        await self.set_cooldown(ctx)
+            else:
+                yield await generator_or_coroutine
 
     def return_attr(self, attr_name: str, interaction: hikari.CommandInteraction, subcommand_name: str = None) -> Any:
         """Return the attribute from the subcommand if set; otherwise, return it from this command."""
@@ -185,7 +227,7 @@ class Command(BaseModelArbitraryTypes):
         command_name = interaction.command_name
 
         # find command
-        command: Command = slash_commands.get(command_name)
+        command: Command = get_command(command_name)
 
         if not command:
             return None
@@ -243,10 +285,14 @@ class NewCommandArgs(TypedDict, total=False):
     guild_ids: list[int]
     cooldown: timedelta
     cooldown_key: str
+    cooldown_mode: CooldownMode
+    cooldown_uses: int
     paginator_options: dict
+    guild_data_fields: list[str]
 
 
-class CommandContext(BaseModelArbitraryTypes):
+@dataclass(slots=True, kw_only=True)
+class CommandContext:
     """Data related to a command that has been run.
 
     Attributes:
@@ -269,7 +315,7 @@ class CommandContext(BaseModelArbitraryTypes):
     member: hikari.InteractionMember
     user: hikari.User
     resolved: hikari.ResolvedOptionData | None
-    options: Annotated[dict[str, str | int | None], Field(default_factory=dict)]
+    options: dict[str, str | int | None] = field(default_factory=dict)
 
     interaction: hikari.CommandInteraction | hikari.ModalInteraction | hikari.ComponentInteraction | hikari.AutocompleteInteraction
 
@@ -300,6 +346,8 @@ async def handle_interaction(interaction: hikari.Interaction):
     correct_handler: Callable = None
     response = Response(interaction)
 
+    use_guild_data_loader(response.guild_data)
+
     if get_user_type(interaction.user.id) == UserTypes.BLOXLINK_BLACKLISTED:
         yield await response.send_first("You are banned from using Bloxlink due to a policy violation.", ephemeral=True)
         return
@@ -317,51 +365,59 @@ async def handle_interaction(interaction: hikari.Interaction):
             raise NotImplementedError()
 
     try:
-        returned_already = False # we allow the command to keep executing but we will only return one response to Hikari
-
-        async for command_response in correct_handler(interaction, response=response):
-            if command_response:
-                if not returned_already:
-                    returned_already = True
-                    yield command_response
-                else:
-                    logging.error(f"Interaction {interaction.type} attempted to send multiple responses! This is probably a bug.",
-                                  exc_info=True,
-                                  stack_info=True)
+        # we allow the command to keep executing but we will only return one response to Hikari
+        async for command_response in response.stream(correct_handler(interaction, response=response)):
+            yield command_response
 
-    except PremiumRequired:
+    except PremiumRequired as ex:
+        response.timer.exception(ex)
         await response.send_premium_upsell(raise_exception=False)
     except UserNotVerified as message:
+        response.timer.exception(message)
         await response.send(str(message) or "This user is not verified with Bloxlink!", ephemeral=message.ephemeral)
     except (BloxlinkForbidden, hikari.errors.ForbiddenError) as message:
+        response.timer.exception(message)
         await response.send(
             str(message)
             or "I have encountered a permission error! Please make sure I have the appropriate permissions.",
             ephemeral=getattr(message, "ephemeral", False),
         )
     except RobloxNotFound as message:
+        response.timer.exception(message)
         logging.exception(message)
         await response.send(
             str(message) or "This Roblox entity does not exist! Please check the ID and try again.",
             ephemeral=message.ephemeral,
         )
     except RobloxDown as message:
+        response.timer.exception(message)
         await response.send(
             "Roblox appears to be down, so I was unable to process your command. "
             "Please try again in a few minutes.",
             ephemeral=message.ephemeral,
         )
     except (Message, BindException) as ex:
+        response.timer.exception(ex)
         await response.send(ex.message, ephemeral=ex.ephemeral)
-    except CancelCommand:
-        pass
+    except CancelCommand as ex:
+        response.timer.exception(ex)
     except Exception as ex: # pylint: disable=broad-except
+        response.timer.exception(ex)
         logging.exception(ex)
         await response.send(
             "An unexpected error occurred while processing this command. "
             "Please try again in a few minutes.",
             ephemeral=True,
         )
+    finally:
+        try:
+            # send the message edits which were buffered by this interaction
+            await response.flush_edits()
+        except Exception as ex: # pylint: disable=broad-except
+            response.timer.exception(ex)
+            logging.exception(ex)
+
+        response.timer.finish()
 
 
 async def handle_command(
@@ -377,28 +433,31 @@ async def handle_command(
     command = command_override
     command_options: dict = command_options or {}
 
-    command_name = command_override.name if command_override else interaction.command_name
-    subcommand_name = subcommand_name or (isinstance(interaction, hikari.CommandInteraction) and Command.subcommand_name(interaction)) or None
+    with response.timer.phase("dispatch"):
+        command_name = command_override.name if command_override else interaction.command_name
+        subcommand_name = subcommand_name or (isinstance(interaction, hikari.CommandInteraction) and Command.subcommand_name(interaction)) or None
 
-    command = slash_commands.get(command_name)
+        command = get_command(command_name)
 
     if not command:
         return
 
-    await command.assert_premium(interaction)
+    response.timer.set_labels(command=command.name, subcommand=subcommand_name)
 
-    if not command_override:
-        # get options
-        if interaction.options:
-            for option in interaction.options:
-                if option.name == subcommand_name and option.options:
-                    command_options = {o.name: o.value for o in option.options}
-                    break
-            else:
-                command_options = {o.name: o.value for o in interaction.options}
+    if response.guild_data:
+        response.guild_data.prefetch("hasBot", *command.guild_data_fields)
 
-        if command.return_attr("defer", interaction, subcommand_name):
-            yield await response.defer(ephemeral=command.defer_with_ephemeral)
+        if command.premium or CONFIG.BOT_RELEASE == "PRO":
+            response.guild_data.prefetch("premium")
+
+    if not command_override and interaction.options:
+        # get options
+        for option in interaction.options:
+            if option.name == subcommand_name and option.options:
+                command_options = {o.name: o.value for o in option.options}
+                break
+        else:
+            command_options = {o.name: o.value for o in interaction.options}
 
     ctx = build_context(
         interaction,
@@ -408,20 +467,33 @@ async def handle_command(
         subcommand_name=subcommand_name,
     )
 
-    guild_data = await fetch_guild_data(ctx.guild_id, "hasBot")
+    # checks run before deferring so the premium upsell can still be sent as the initial response
+    await command.assert_preconditions(ctx)
 
-    if not guild_data.hasBot:
-        await update_guild_data(ctx.guild_id, hasBot=True)
+    try:
+        if not command_override and command.return_attr("defer", interaction, subcommand_name):
+            yield await response.defer(ephemeral=command.defer_with_ephemeral)
 
-    async for command_response in command.execute(ctx, subcommand_name=subcommand_name):
-        if command_response:
-            yield command_response
+        guild_data = await fetch_guild_data(ctx.guild_id, "hasBot")
+
+        if not guild_data.hasBot:
+            await update_guild_data(ctx.guild_id, hasBot=True)
+
+        async for command_response in command.execute(ctx, subcommand_name=subcommand_name):
+            if command_response:
+                yield command_response
+    except Exception:
+        # the cooldown only applies to commands that executed without raising exceptions
+        await command.release_cooldown(ctx)
+        raise
 
 
 async def handle_autocomplete(interaction: hikari.AutocompleteInteraction, response: Response):
     """Handle an autocomplete interaction."""
 
-    command: Command = slash_commands.get(interaction.command_name)
+    with response.timer.phase("dispatch"):
+        command: Command = get_command(interaction.command_name)
+
     relevant_options: list[hikari.AutocompleteInteraction] = [] # slash commands has their options nested, so this flattens it
 
     if not command:
@@ -451,74 +523,80 @@ async def handle_autocomplete(interaction: hikari.AutocompleteInteraction, respo
         logging.error(f'Command {command.name} has no auto-complete handler "{focused_option.name}"!')
         return
 
-    generator_or_coroutine = autocomplete_fn(build_context(interaction, response=response), focused_option, relevant_options)
+    subcommand_name = Command.subcommand_name(interaction)
 
-    if hasattr(generator_or_coroutine, "__anext__"):
-        async for generator_response in generator_or_coroutine:
-            yield generator_response
+    # the focused option takes the place of the custom ID section for autocomplete
+    response.timer.set_labels(command=command.name, subcommand=subcommand_name, section=focused_option.name)
 
-    else:
-        yield await generator_or_coroutine
+    with response.timer.phase("handler"):
+        yield await run_autocomplete(
+            build_context(interaction, response=response, subcommand_name=subcommand_name),
+            autocomplete_fn,
+            focused_option,
+            relevant_options,
+        )
 
 
 async def handle_modal(interaction: hikari.ModalInteraction, response: Response):
-    """Handle a modal interaction."""
+    """Handle a modal interaction.
 
-    try:
-        custom_id = interaction.custom_id
-        components = [c for a in interaction.components for c in a.components]
-        parsed_custom_id = ModalCustomID.from_str(custom_id)
+    The modal values are not stored anywhere, build_modal() reads them from this interaction when the
+    handler that opened the modal is executed again.
+    """
 
-        modal_data = {modal_component.custom_id: modal_component.value for modal_component in components}
+    custom_id = interaction.custom_id
+    parsed_custom_id = ModalCustomID.from_str(custom_id)
 
-        # save data from modal to redis
-        await redis.set(f"modal_data:{custom_id}", modal_data, expire=timedelta(hours=1))
+    response.timer.set_labels(
+        command=parsed_custom_id.command_name,
+        subcommand=parsed_custom_id.subcommand_name,
+        section=parsed_custom_id.section,
+    )
 
-        # iterate through commands and find where
-        # they called the modal from, and then execute the function again
-        for command in slash_commands.values():
-            if parsed_custom_id.type == "prompt":
-                # cast it into a prompt custom id
-                prompt_custom_id = PromptCustomID.from_str(custom_id)
-                prompt = await Prompt.find_prompt(prompt_custom_id, interaction, response, command=command)
+    # find where they called the modal from, and then execute the function again
+    match parsed_custom_id.type:
+        case "prompt":
+            with response.timer.phase("dispatch"):
+                route = resolve_custom_id(custom_id)
+
+            if route and route.get("prompt"):
+                with response.timer.phase("handler"):
+                    prompt = await route["prompt"].new_prompt(
+                        prompt_instance=route["prompt"],
+                        interaction=interaction,
+                        response=response,
+                        command_name=route["command"].name,
+                    )
 
-                if prompt:
                     async for generator_response in prompt.entry_point(interaction):
                         if not isinstance(generator_response, PromptPageData):
                             logging.debug("1 %s", generator_response)
                             yield generator_response
 
-                    break
-
-            elif parsed_custom_id.type == "command":
-                # find matching command handler
-                if command.name == parsed_custom_id.command_name and (
-                    parsed_custom_id.subcommand_name
-                    and parsed_custom_id.subcommand_name in command.subcommands
-                    or not parsed_custom_id.subcommand_name
-                ):
-                    command_options_data = await redis.get(f"modal_command_options:{custom_id}")
-                    command_options = json.loads(command_options_data) if command_options_data else {}
-
-                    generator_or_coroutine = handle_command(
-                        interaction,
-                        response,
-                        command_override=command,
-                        command_options=command_options,
-                        subcommand_name=parsed_custom_id.subcommand_name,
-                    )
-
-                    if hasattr(generator_or_coroutine, "__anext__"):
-                        async for generator_response in generator_or_coroutine:
-                            yield generator_response
-                    else:
-                        yield await generator_or_coroutine
-
-                    break
+        case "command":
+            command = get_command(parsed_custom_id.command_name)
+
+            # find matching command handler
+            if command and (
+                parsed_custom_id.subcommand_name
+                and parsed_custom_id.subcommand_name in command.subcommands
+                or not parsed_custom_id.subcommand_name
+            ):
+                command_options = await parsed_custom_id.get_command_options()
+
+                generator_or_coroutine = handle_command(
+                    interaction,
+                    response,
+                    command_override=command,
+                    command_options=command_options,
+                    subcommand_name=parsed_custom_id.subcommand_name,
+                )
 
-    finally:
-        # clear modal data from redis so it doesn't get reused if they execute the command again
-        await redis.delete(f"modal_data:{custom_id}")
+                if hasattr(generator_or_coroutine, "__anext__"):
+                    async for generator_response in generator_or_coroutine:
+                        yield generator_response
+                else:
+                    yield await generator_or_coroutine
 
 
 async def handle_component(interaction: hikari.ComponentInteraction, response: Response):
@@ -526,69 +604,146 @@ async def handle_component(interaction: hikari.ComponentInteraction, response: R
 
     custom_id = interaction.custom_id
 
-    try:
-        parsed_custom_id: CommandCustomID = CommandCustomID.from_str(custom_id)
-    except (TypeError, IndexError):
-        # old custom ID
-        # iterate through commands and find the custom_id mapped function
-        logging.warning(f"Deprecated custom_id: {custom_id}")
-        for command in slash_commands.values():
-            # find matching custom_id handler
-            if command.accepted_custom_ids:
-                for accepted_custom_id, custom_id_fn in command.accepted_custom_ids.items():
-                    if custom_id.startswith(str(accepted_custom_id)):
-                        generator_or_coroutine = custom_id_fn(build_context(interaction, response=response))
-
-                        if hasattr(generator_or_coroutine, "__anext__"):
-                            async for generator_response in generator_or_coroutine:
-                                yield generator_response
-
-                        else:
-                            yield await generator_or_coroutine
-
-                        return
-    else:
-        command_name = parsed_custom_id.command_name
-        command = slash_commands.get(command_name)
+    with response.timer.phase("dispatch"):
+        route = resolve_custom_id(custom_id)
 
-        if not command:
-            return
+    if not route:
+        logging.error(f"Invalid custom_id: {custom_id}")
+        return
 
-        match parsed_custom_id.type:
-            case "paginator":
-                if command.paginator_options and command.paginator_options.get("return_items"):
-                    # use default page switcher
-                    paginator_custom_id = PaginatorCustomID.from_str(custom_id)
-                    yield await Paginator.default_entry_point(build_context(interaction, response=response), paginator_custom_id).__anext__()
-                    return
-            case "prompt":
-                prompt_custom_id = PromptCustomID.from_str(custom_id)
-                prompt = await Prompt.find_prompt(prompt_custom_id, interaction, response, command=command)
-
-                if prompt:
-                    async for generator_response in prompt.entry_point(interaction):
-                        if not isinstance(generator_response, PromptPageData):
-                            logging.debug("1 %s", generator_response)
-                            yield generator_response
+    custom_id_segments = custom_id.split(":")
+    response.timer.set_labels(
+        command=route["command"].name, section=custom_id_segments[1] if len(custom_id_segments) > 1 else None
+    )
 
-                    return
+    if route.get("paginator"):
+        # use default page switcher
+        with response.timer.phase("handler"):
+            paginator_custom_id = PaginatorCustomID.from_str(custom_id)
+            yield await Paginator.default_entry_point(build_context(interaction, response=response), paginator_custom_id).__anext__()
 
-    # everything else failed, so it must be handled by the command itself
-    # find matching command handler
-    for accepted_custom_id, custom_id_fn in command.accepted_custom_ids.items():
-        if custom_id.startswith(str(accepted_custom_id)):
-            generator_or_coroutine = custom_id_fn(build_context(interaction, response=response))
+        return
 
-            if hasattr(generator_or_coroutine, "__anext__"):
-                async for generator_response in generator_or_coroutine:
+    if route.get("prompt"):
+        with response.timer.phase("handler"):
+            prompt = await route["prompt"].new_prompt(
+                prompt_instance=route["prompt"],
+                interaction=interaction,
+                response=response,
+                command_name=route["command"].name,
+            )
+
+            async for generator_response in prompt.entry_point(interaction):
+                if not isinstance(generator_response, PromptPageData):
+                    logging.debug("1 %s", generator_response)
                     yield generator_response
 
-            else:
-                yield await generator_or_coroutine
+        return
+
+    if response.guild_data:
+        response.guild_data.prefetch(*route["command"].guild_data_fields)
+
+    # everything else must be handled by the command itself
+    with response.timer.phase("handler"):
+        generator_or_coroutine = route["handler"](build_context(interaction, response=response))
+
+        if hasattr(generator_or_coroutine, "__anext__"):
+            async for generator_response in generator_or_coroutine:
+                yield generator_response
+
+        else:
+            yield await generator_or_coroutine
+
+
+def command_custom_id_routes(command: Command) -> list[tuple[list[str | None], CustomIDRoute]]:
+    """Return the route paths of the custom IDs, prompts and paginator of this command."""
+
+    routes: list[tuple[list[str | None], CustomIDRoute]] = []
+
+    for accepted_custom_id, custom_id_fn in (command.accepted_custom_ids or {}).items():
+        routes.append((str(accepted_custom_id).split(":"), {"command": command, "handler": custom_id_fn}))
+
+    for command_prompt in command.prompts:
+        for prompt_name in filter(None, (command_prompt.override_prompt_name, command_prompt.__name__)):
+            routes.append((
+                CustomIDRouter.path_for(PromptCustomID, command_name=command.name, type="prompt", prompt_name=prompt_name),
+                {"command": command, "prompt": command_prompt},
+            ))
+
+    if command.paginator_options.get("return_items"):
+        routes.append((
+            CustomIDRouter.path_for(PaginatorCustomID, command_name=command.name, type="paginator"),
+            {"command": command, "paginator": True},
+        ))
+
+    return routes
+
+
+def register_custom_id_routes(command: Command):
+    """Add the custom IDs, prompts and paginator of this command to the custom ID router."""
+
+    for path, route in command_custom_id_routes(command):
+        custom_id_router.add(path, route)
+
+
+def get_command(command_name: str) -> Command | None:
+    """Return a command by its name, importing it first if it is only known by the command manifest."""
+
+    command = slash_commands.get(command_name)
+
+    if not command and command_manifest.lazy and command_manifest.import_command(command_name):
+        command = slash_commands.get(command_name)
+
+    return command
+
+
+def resolve_custom_id(custom_id: str) -> CustomIDRoute | None:
+    """Return the route of a custom ID, importing the command that handles it first if it is not loaded yet."""
+
+    route = custom_id_router.resolve(custom_id)
+
+    if route and route.get("module"):
+        # importing the module registers the real routes over the ones from the manifest
+        importlib.import_module(route["module"])
+        route = custom_id_router.resolve(custom_id)
+
+    return route
 
-            return
 
-    logging.error(f"Invalid custom_id: {custom_id}")
+def load_command_manifest() -> bool:
+    """Register commands from the command manifest instead of importing every command module.
+
+    Returns False if there is no usable manifest, in which case every command module should be imported.
+    """
+
+    if not command_manifest.load():
+        return False
+
+    for path, module_name in command_manifest.custom_id_routes:
+        custom_id_router.add(path, {"module": module_name})
+
+    logging.info(f"Registered {len(command_manifest.commands)} commands from the command manifest.")
+
+    return True
+
+
+def write_command_manifest():
+    """Write the command manifest from the commands that are currently registered."""
+
+    command_manifest.write(ManifestData(
+        fingerprint=command_manifest.fingerprint(),
+        commands={command_name: command.module for command_name, command in slash_commands.items()},
+        custom_id_routes=[
+            (path, command.module)
+            for command in slash_commands.values()
+            for path, _ in command_custom_id_routes(command)
+        ],
+        scopes={
+            str(guild_id or "global"): hash_commands(scope_commands)
+            for guild_id, scope_commands in build_command_scopes().items()
+        },
+    ))
+
 
 def new_command(command: Callable, **command_args: Unpack[NewCommandArgs]):
     """Registers a command with Bloxlink.
@@ -627,26 +782,29 @@ def new_command(command: Callable, **command_args: Unpack[NewCommandArgs]):
         name=command_name,
         rest_subcommands=rest_subcommands,
         subcommands=subcommands,
+        module=command.__module__,
         **command_args,
     )
+    register_custom_id_routes(slash_commands[command_name])
 
     for alias in command_args.get("aliases", []):
         slash_commands[alias] = Command(
             fn=command_fn,
             name=alias,
+            module=command.__module__,
             **command_args,
         )
+        register_custom_id_routes(slash_commands[alias])
 
         logging.info(f"Registered command alias {alias} of {command_name}")
 
     logging.info(f"Registered command {command_name}")
 
 
-async def sync_commands():
-    """Publish our slash commands to Discord."""
+def build_command_scopes() -> dict[int | None, list[hikari.api.SlashCommandBuilder]]:
+    """Build the slash commands of each scope. The global scope is keyed by None."""
 
-    commands: list[hikari.PartialCommand] = []
-    guild_commands: dict[int, list[hikari.PartialCommand]] = {}
+    command_scopes: dict[int | None, list[hikari.api.SlashCommandBuilder]] = {None: []}
 
     for new_command_data in slash_commands.values():
         command: hikari.api.SlashCommandBuilder = bloxlink.rest.slash_command_builder(
@@ -667,34 +825,89 @@ async def sync_commands():
         if new_command_data.dm_enabled is not None:
             command.set_is_dm_enabled(new_command_data.dm_enabled)
 
-        if not new_command_data.guild_ids:
-            commands.append(command)
-        else:
-            for guild_id in new_command_data.guild_ids:
-                guild_commands[guild_id] = guild_commands.get(guild_id, [])
-                guild_commands[guild_id].append(command)
+        for guild_id in new_command_data.guild_ids or [None]:
+            command_scopes[guild_id] = command_scopes.get(guild_id, [])
+            command_scopes[guild_id].append(command)
 
-    await bloxlink.rest.set_application_commands(
-        application=CONFIG.DISCORD_APPLICATION_ID,
-        commands=commands,
-    )
+    return command_scopes
+
+
+async def sync_commands(force: bool = False, concurrency: int = 5):
+    """Publish our slash commands to Discord.
+
+    Each scope (global, or one guild) is only pushed if the hash of its payload differs from the hash
+    that was last pushed, which is kept in Redis. Guild scopes are pushed concurrently.
+
+    Args:
+        force (bool, optional): Push every scope even if it has not changed. Defaults to False.
+        concurrency (int, optional): How many guild scopes to push at once. Defaults to 5.
+    """
+
+    def hash_key(guild_id: int | str | None) -> str:
+        return f"synced_commands:{CONFIG.DISCORD_APPLICATION_ID}:{guild_id or 'global'}"
+
+    if command_manifest.lazy and not force:
+        # avoid importing every command if the manifest shows that nothing changed
+        synced_hashes = await asyncio.gather(*(redis.get(hash_key(scope)) for scope in command_manifest.scopes))
+
+        if list(command_manifest.scopes.values()) == synced_hashes:
+            logging.info("Slash commands are unchanged, skipping sync.")
+            return
+
+        command_manifest.import_all()
+
+    command_scopes = build_command_scopes()
+    commands = command_scopes.pop(None)
+    guild_commands = command_scopes
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def sync_scope(scope_commands: list[hikari.api.SlashCommandBuilder], guild_id: int = None) -> bool:
+        scope_hash = hash_commands(scope_commands)
+
+        if not force and await redis.get(hash_key(guild_id)) == scope_hash:
+            return False
+
+        async with semaphore:
+            await bloxlink.rest.set_application_commands(
+                application=CONFIG.DISCORD_APPLICATION_ID,
+                commands=scope_commands,
+                guild=guild_id or hikari.UNDEFINED,
+            )
+
+        await redis.set(hash_key(guild_id), scope_hash)
+
+        return True
+
+    if await sync_scope(commands):
+        logging.info(f"Registered {len(commands)} global slash commands.")
+    else:
+        logging.info("Global slash commands are unchanged, skipping sync.")
 
     if guild_commands:
-        for guild_id, commands in guild_commands.items():
-            try:
-                await bloxlink.rest.set_application_commands(
-                    application=CONFIG.DISCORD_APPLICATION_ID,
-                    commands=commands,
-                    guild=guild_id
-                )
-            except hikari.HTTPResponseError:
+        guild_ids = list(guild_commands)
+        results = await asyncio.gather(
+            *(sync_scope(guild_commands[guild_id], guild_id) for guild_id in guild_ids), return_exceptions=True
+        )
+
+        for guild_id, result in zip(guild_ids, results):
+            if isinstance(result, hikari.HTTPResponseError):
                 logging.warning(f"Failed to register guild commands for guild {guild_id}.")
+            elif isinstance(result, BaseException):
+                raise result
 
+        synced_guilds = sum(result is True for result in results)
+        logging.info(f"Registered commands for {synced_guilds} guilds, {len(guild_ids) - synced_guilds} were unchanged or failed.")
 
-    logging.info(f"Registered {len(slash_commands)} slash commands.")
 
-    if guild_commands:
-        logging.info(f"Registered commands for {len(guild_commands)} guilds.")
+def hash_commands(commands: list[hikari.api.SlashCommandBuilder]) -> str:
+    """Return a stable hash of the payload that would be sent to Discord for these commands."""
+
+    payload = sorted(
+        (dict(command.build(bloxlink.entity_factory)) for command in commands),
+        key=lambda command_payload: command_payload["name"],
+    )
+
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode("utf-8")).hexdigest()
 
 
 def build_context(
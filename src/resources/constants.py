@@ -21,6 +21,59 @@ LIMITS = {
     }
 }
 
+CACHES = {
+    "GUILD_DATA": {
+        "MAX_SIZE": 10_000,
+        "TTL": 120 # seconds
+    },
+    "AUTOCOMPLETE": {
+        "MAX_SIZE": 20_000,
+        "TTL": 30 # seconds
+    },
+    "COOLDOWNS": {
+        "MAX_SIZE": 50_000,
+        "TTL": 10 # seconds, capped to the time left on the cooldown
+    },
+    "ROBLOX_ENTITIES": {
+        "MAX_SIZE": 20_000,
+        "TTL": 300 # seconds
+    },
+    "GUILD_SNAPSHOTS": {
+        "MAX_SIZE": 10_000,
+        "TTL": 30, # seconds
+        # seconds, shared by every node. Kept at the local TTL, since roles changed outside of the bot are only
+        # seen once snapshots expire
+        "REDIS_TTL": 30
+    },
+    "ROLE_PAYLOADS": {
+        "MAX_SIZE": 10_000,
+        "TTL": 300 # seconds, keyed by the version of the roles so it never serves changed roles
+    },
+    "COMPILED_BINDS": {
+        "MAX_SIZE": 10_000,
+        "TTL": 600 # seconds, binds are also recompiled as soon as they change
+    }
+}
+
+AUTOCOMPLETE_TIME_BUDGET = 2 # seconds, Discord drops autocomplete responses after 3
+
+INLINE_RESPONSE_DEADLINE = 2.5 # seconds before a slow interaction is deferred, Discord fails interactions after 3
+
+PAGINATOR_SNAPSHOT_TTL = 15 * 60 # seconds that the items of a paginator are kept for flipping pages
+
+BIND_CALCULATION_BATCH_SIZE = 100 # members of a /verifyall chunk whose roles are calculated in one request
+
+SINGLE_ROLE_EDIT_MAX = 1 # role changes made with the endpoints that add or remove one role, instead of sending every role
+
+HTTP_CLIENT = {
+    "MAX_CONNECTIONS": 256,
+    "MAX_CONNECTIONS_PER_HOST": 64,
+    "KEEPALIVE_TIMEOUT": 30, # seconds that an idle connection is kept open for the next request
+    "DEADLINE": 10, # seconds for a request and its retries, unless the request sets its own
+    "RETRIES": 2, # only for idempotent requests
+    "RETRY_BACKOFF": 0.1 # seconds, doubled for each retry and jittered
+}
+
 SKU_TIERS: dict[int, str] = {
 	1022662272188952627: "basic/month",
 	1156326821785260102: "pro/month",
@@ -0,0 +1,103 @@
+import time
+from datetime import timedelta
+from typing import Literal
+
+from bloxlink_lib.database import redis
+
+from resources.cache import TTLCache
+from resources.constants import CACHES
+
+
+CooldownMode = Literal["fixed_window", "token_bucket"]
+
+# Both scripts return how many milliseconds are left on the cooldown, or 0 if a use was reserved.
+RESERVE_FIXED_WINDOW = redis.register_script("""
+if redis.call("SET", KEYS[1], "1", "NX", "PX", ARGV[1]) then
+    return 0
+end
+
+return math.max(redis.call("PTTL", KEYS[1]), 1)
+""")
+
+RESERVE_TOKEN_BUCKET = redis.register_script("""
+local window = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local time = redis.call("TIME")
+local now = time[1] * 1000 + math.floor(time[2] / 1000)
+local bucket = redis.call("HMGET", KEYS[1], "tokens", "updated_at")
+local tokens = tonumber(bucket[1]) or capacity
+local updated_at = tonumber(bucket[2]) or now
+local refill_rate = capacity / window
+
+tokens = math.min(capacity, tokens + (now - updated_at) * refill_rate)
+
+if tokens < 1 then
+    return math.ceil((1 - tokens) / refill_rate)
+end
+
+redis.call("HSET", KEYS[1], "tokens", tostring(tokens - 1), "updated_at", now)
+redis.call("PEXPIRE", KEYS[1], window)
+
+return 0
+""")
+
+RELEASE_TOKEN_BUCKET = redis.register_script("""
+local tokens = tonumber(redis.call("HGET", KEYS[1], "tokens"))
+
+if tokens then
+    redis.call("HSET", KEYS[1], "tokens", tostring(math.min(tonumber(ARGV[1]), tokens + 1)))
+end
+""")
+
+# keys that are known to be on cooldown, mapped to when their cooldown ends
+cooldown_cache: TTLCache[str, float] = TTLCache(
+    "cooldowns", max_size=CACHES["COOLDOWNS"]["MAX_SIZE"], ttl=CACHES["COOLDOWNS"]["TTL"]
+)
+
+
+async def reserve_cooldown(
+    key: str, cooldown: timedelta, mode: CooldownMode = "fixed_window", uses: int = 1
+) -> timedelta | None:
+    """Atomically check the cooldown of this key and reserve a use of it.
+
+    Args:
+        key (str): The cooldown key.
+        cooldown (timedelta): Length of the cooldown window.
+        mode (CooldownMode, optional): "fixed_window" allows one use per window. "token_bucket" allows
+            a burst of uses which refill evenly over the window. Defaults to "fixed_window".
+        uses (int, optional): Uses per window for token buckets. Defaults to 1.
+
+    Returns:
+        timedelta | None: Time left on the cooldown, or None if a use was reserved.
+    """
+
+    cooldown_ends_at = cooldown_cache.get(key)
+
+    if cooldown_ends_at and cooldown_ends_at > time.monotonic():
+        return timedelta(seconds=cooldown_ends_at - time.monotonic())
+
+    window = int(cooldown.total_seconds() * 1000)
+
+    if mode == "token_bucket":
+        milliseconds_left = await RESERVE_TOKEN_BUCKET(keys=[key], args=[window, uses])
+    else:
+        milliseconds_left = await RESERVE_FIXED_WINDOW(keys=[key], args=[window])
+
+    if not milliseconds_left:
+        return None
+
+    seconds_left = int(milliseconds_left) / 1000
+    cooldown_cache.set(key, time.monotonic() + seconds_left, ttl=min(seconds_left, cooldown_cache.ttl))
+
+    return timedelta(seconds=seconds_left)
+
+
+async def release_cooldown(key: str, mode: CooldownMode = "fixed_window", uses: int = 1):
+    """Give back a use that was reserved by reserve_cooldown(), such as when the command failed."""
+
+    if mode == "token_bucket":
+        await RELEASE_TOKEN_BUCKET(keys=[key], args=[uses])
+    else:
+        await redis.delete(key)
+
+    cooldown_cache.pop(key)
@@ -0,0 +1,248 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from contextvars import ContextVar
+from typing import TYPE_CHECKING
+
+from bloxlink_lib.database import fetch_guild_data as fetch_guild_data_uncached
+from bloxlink_lib.database import redis
+from bloxlink_lib.database import update_guild_data as update_guild_data_uncached
+
+from resources.cache import TTLCache
+from resources.constants import CACHES
+
+if TYPE_CHECKING:
+    from bloxlink_lib import GuildData
+
+
+__all__ = (
+    "GUILD_DATA_INVALIDATION_CHANNEL",
+    "GuildDataCache",
+    "GuildDataLoader",
+    "fetch_guild_data",
+    "guild_data_cache",
+    "invalidate_guild_data",
+    "update_guild_data",
+    "use_guild_data_loader",
+)
+
+
+GUILD_DATA_INVALIDATION_CHANNEL = "guild_data:invalidate"
+
+_current_loader: ContextVar[GuildDataLoader | None] = ContextVar("guild_data_loader", default=None)
+
+
+class _CachedGuildData:
+    """Guild data held by the cache, along with which of its fields were actually read."""
+
+    __slots__ = ("guild_data", "fields")
+
+    def __init__(self, guild_data: GuildData, fields: set[str] | None):
+        self.guild_data = guild_data
+        self.fields = fields # None if the entire document was read
+
+    def has_fields(self, fields: tuple[str, ...]) -> bool:
+        return self.fields is None or (bool(fields) and self.fields.issuperset(fields))
+
+
+class GuildDataCache:
+    """Bounded, process-local LRU cache of guild data with a TTL.
+
+    Entries are dropped when they expire, when the cache is full, and when any node writes to the guild
+    through update_guild_data() and publishes an invalidation.
+    """
+
+    def __init__(self, max_size: int, ttl: float):
+        self._entries: TTLCache[str, _CachedGuildData] = TTLCache("guild_data", max_size=max_size, ttl=ttl)
+        # guilds that are being read, with how many reads are in flight and a generation that each invalidation of
+        # the guild bumps, so that reads which started before an invalidation are not cached
+        self._reads: dict[str, list[int]] = {}
+
+    def get(self, guild_id: str, fields: tuple[str, ...]) -> GuildData | None:
+        """Return a copy of the cached guild data if every field is cached."""
+
+        entry = self._entries.peek(guild_id)
+
+        if not entry or not entry.has_fields(fields):
+            self._entries.miss()
+            return None
+
+        self._entries.hit()
+
+        return entry.guild_data.model_copy(deep=True)
+
+    def set(self, guild_id: str, guild_data: GuildData, fields: tuple[str, ...], generation: int) -> GuildData:
+        """Cache guild data that was read while the guild was at this generation, see start_read().
+
+        Returns a copy of the guild data merged with the fields that were already cached.
+        """
+
+        if generation != self._reads[guild_id][1]:
+            return guild_data
+
+        entry = self._entries.peek(guild_id)
+
+        if entry and fields:
+            for field in fields:
+                setattr(entry.guild_data, field, getattr(guild_data, field))
+
+            if entry.fields is not None:
+                entry.fields.update(fields)
+        else:
+            entry = _CachedGuildData(guild_data, set(fields) if fields else None)
+            self._entries.set(guild_id, entry)
+
+        return entry.guild_data.model_copy(deep=True)
+
+    def start_read(self, guild_id: str) -> int:
+        """Start a read of this guild, which must be ended with end_read(), and return its generation."""
+
+        reads = self._reads.setdefault(guild_id, [0, 0])
+        reads[0] += 1
+
+        return reads[1]
+
+    def end_read(self, guild_id: str):
+        reads = self._reads[guild_id]
+        reads[0] -= 1
+
+        if not reads[0]:
+            del self._reads[guild_id]
+
+    def invalidate(self, guild_id: int | str):
+        """Drop the cached guild data of this guild."""
+
+        guild_id = str(guild_id)
+
+        if reads := self._reads.get(guild_id):
+            reads[1] += 1
+
+        self._entries.pop(guild_id)
+
+
+guild_data_cache = GuildDataCache(max_size=CACHES["GUILD_DATA"]["MAX_SIZE"], ttl=CACHES["GUILD_DATA"]["TTL"])
+
+
+class GuildDataLoader:
+    """Loads the guild data needed by a single interaction.
+
+    Fields can be declared up-front with prefetch(). The first fetch() then reads every declared and requested
+    field in one projected read, and later fetches for fields that were already loaded are served from memory.
+    """
+
+    def __init__(self, guild_id: int | str):
+        self.guild_id = str(guild_id)
+        self._guild_data: GuildData = None
+        self._loaded_fields: set[str] = set()
+        self._pending_fields: set[str] = set()
+        self._loaded_everything = False
+        self._lock = asyncio.Lock()
+
+    def prefetch(self, *fields: str):
+        """Declare fields that will be needed later in this interaction so they are read with the next fetch."""
+
+        if not self._loaded_everything:
+            self._pending_fields.update(field for field in fields if field not in self._loaded_fields)
+
+    async def fetch(self, *fields: str) -> GuildData:
+        """Return the guild data with these fields loaded. No fields means the entire document."""
+
+        async with self._lock:
+            if self._loaded_everything:
+                return self._guild_data
+
+            if not fields:
+                self._guild_data = await _fetch_guild_data_cached(self.guild_id)
+                self._loaded_everything = True
+                self._pending_fields.clear()
+
+                return self._guild_data
+
+            missing_fields = {field for field in fields if field not in self._loaded_fields}
+
+            if missing_fields:
+                missing_fields.update(self._pending_fields)
+                new_guild_data = await _fetch_guild_data_cached(self.guild_id, *missing_fields)
+
+                if self._guild_data is None:
+                    self._guild_data = new_guild_data
+                else:
+                    for field in missing_fields:
+                        setattr(self._guild_data, field, getattr(new_guild_data, field))
+
+                self._loaded_fields.update(missing_fields)
+                self._pending_fields.clear()
+
+            return self._guild_data
+
+    def update(self, **fields):
+        """Reflect a write to the database in the fields that were already loaded."""
+
+        if self._guild_data is None:
+            return
+
+        for field, value in fields.items():
+            if self._loaded_everything or field in self._loaded_fields:
+                setattr(self._guild_data, field, value)
+
+
+def use_guild_data_loader(loader: GuildDataLoader | None):
+    """Make this loader serve the guild data reads of the current interaction."""
+
+    _current_loader.set(loader)
+
+
+async def _fetch_guild_data_cached(guild_id: int | str, *fields: str) -> GuildData:
+    if guild_id is None:
+        return await fetch_guild_data_uncached(guild_id, *fields)
+
+    guild_id = str(guild_id)
+
+    if (guild_data := guild_data_cache.get(guild_id, fields)) is not None:
+        return guild_data
+
+    generation = guild_data_cache.start_read(guild_id)
+
+    try:
+        guild_data = await fetch_guild_data_uncached(guild_id, *fields)
+
+        return guild_data_cache.set(guild_id, guild_data, fields, generation)
+    finally:
+        guild_data_cache.end_read(guild_id)
+
+
+def _loader_for(guild_id: int | str) -> GuildDataLoader | None:
+    loader = _current_loader.get()
+
+    if loader and guild_id is not None and loader.guild_id == str(guild_id):
+        return loader
+
+    return None
+
+
+async def fetch_guild_data(guild_id: int | str, *fields: str) -> GuildData:
+    """Fetch guild data through the loader of the current interaction if there is one, then the local cache."""
+
+    if loader := _loader_for(guild_id):
+        return await loader.fetch(*fields)
+
+    return await _fetch_guild_data_cached(guild_id, *fields)
+
+
+async def update_guild_data(guild_id: int | str, **fields):
+    """Update guild data, keep the loader of the current interaction in sync and invalidate every node's cache."""
+
+    await update_guild_data_uncached(guild_id, **fields)
+    await invalidate_guild_data(guild_id)
+
+    if loader := _loader_for(guild_id):
+        loader.update(**fields)
+
+
+async def invalidate_guild_data(guild_id: int | str):
+    """Drop the guild data of this guild from every node's cache, such as after it was written outside of
+    update_guild_data()."""
+
+    guild_data_cache.invalidate(guild_id)
+    await redis.publish(GUILD_DATA_INVALIDATION_CHANNEL, json.dumps({"guild_id": str(guild_id)}))
@@ -34,3 +34,6 @@ class BindException(BloxlinkException):
 
 class BindConflictError(BindException):
     """Raised when a bind conflicts with another bind."""
+
+class HTTPRequestFailed(BloxlinkException):
+    """Raised when an outbound HTTP request timed out or could not connect, after any retries."""
@@ -0,0 +1,189 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+from datetime import timedelta
+from typing import Awaitable, Callable, Self
+
+import hikari
+from bloxlink_lib import BaseModel, GuildSerializable
+from bloxlink_lib.database import redis
+from resources.cache import TTLCache
+from resources.constants import CACHES
+
+
+__all__ = (
+    "GUILD_SNAPSHOT_INVALIDATION_CHANNEL",
+    "GuildSnapshot",
+    "RoleSnapshot",
+    "guild_snapshot_cache",
+    "invalidate_guild_snapshot",
+    "role_payloads_cache",
+)
+
+
+# invalidate_guild_snapshot() publishes {"guild_id": ...} here when the bot changes the roles of a guild. Changes
+# made outside of the bot are not published, so they are only seen once the snapshot expires.
+GUILD_SNAPSHOT_INVALIDATION_CHANNEL = "guild_snapshot:invalidate"
+# versioned with the fields of GuildSnapshot, so nodes never read snapshots of another format while deploying
+GUILD_SNAPSHOT_KEY = "guild_snapshot:2:{guild_id}"
+
+# the encoded role payloads of guilds, by the version of their roles
+role_payloads_cache: TTLCache[str, bytes] = TTLCache(
+    "role_payloads", max_size=CACHES["ROLE_PAYLOADS"]["MAX_SIZE"], ttl=CACHES["ROLE_PAYLOADS"]["TTL"]
+)
+
+
+class RoleSnapshot(BaseModel):
+    """A role of a guild snapshot."""
+
+    id: int
+    name: str
+    position: int
+    color: int
+    is_managed: bool
+    permissions: int
+
+    @classmethod
+    def from_hikari(cls, role: hikari.Role) -> Self:
+        return cls(
+            id=role.id,
+            name=role.name,
+            position=role.position,
+            color=int(role.color),
+            is_managed=role.is_managed,
+            permissions=int(role.permissions),
+        )
+
+    @property
+    def mention(self) -> str:
+        return f"<@&{self.id}>"
+
+    def __str__(self) -> str:
+        return self.name
+
+
+class GuildSnapshot(BaseModel):
+    """The parts of a guild that are needed to update its members: its name, owner and roles.
+
+    Roles keep their positions, which are their hierarchy. Snapshots are shared between every caller, so they
+    must not be modified.
+    """
+
+    id: int
+    name: str
+    owner_id: int
+    roles: dict[int, RoleSnapshot]
+    role_payloads_json: str = "{}" # the roles as they are sent to the bind API, already encoded
+    roles_version: str = "" # a fingerprint of role_payloads_json
+
+    @classmethod
+    def from_hikari(cls, guild: hikari.RESTGuild) -> Self:
+        role_payloads = GuildSerializable.from_hikari(guild).model_dump(
+            mode="json", by_alias=True, include={"roles"}
+        )["roles"]
+        role_payloads_json = json.dumps(role_payloads, separators=(",", ":"))
+
+        return cls(
+            id=guild.id,
+            name=guild.name,
+            owner_id=guild.owner_id,
+            roles={role_id: RoleSnapshot.from_hikari(role) for role_id, role in guild.roles.items()},
+            role_payloads_json=role_payloads_json,
+            roles_version=hashlib.blake2b(role_payloads_json.encode(), digest_size=16).hexdigest(),
+        )
+
+    @property
+    def encoded_role_payloads(self) -> bytes:
+        """The roles as they are sent to the bind API, as JSON that can be placed into a request body as is.
+
+        The encoded roles are cached by their version, so they are shared by every snapshot of the guild until its
+        roles change.
+        """
+
+        if not self.roles_version:
+            return self.role_payloads_json.encode()
+
+        if (encoded := role_payloads_cache.get(self.roles_version)) is None:
+            encoded = self.role_payloads_json.encode()
+            role_payloads_cache.set(self.roles_version, encoded)
+
+        return encoded
+
+    def role_by_name(self, name: str) -> RoleSnapshot | None:
+        return next((role for role in self.roles.values() if role.name == name), None)
+
+
+class GuildSnapshotCache:
+    """Guild snapshots cached by this node, in front of the snapshots that every node shares in Redis.
+
+    Snapshots are dropped when they expire and when invalidate_guild_snapshot() is called, such as after roles are
+    created. Concurrent loads of the same guild share one request.
+    """
+
+    def __init__(self, max_size: int, ttl: float, redis_ttl: float):
+        self.redis_ttl = redis_ttl
+        self._entries: TTLCache[int, GuildSnapshot] = TTLCache("guild_snapshots", max_size=max_size, ttl=ttl)
+        self._loading: dict[int, asyncio.Task[GuildSnapshot]] = {}
+        self._generation = 0 # bumped on every invalidation so in-flight loads are not cached
+
+    async def load(self, guild_id: int, fetch_guild: Callable[[int], Awaitable[hikari.RESTGuild]]) -> GuildSnapshot:
+        """Get the snapshot of a guild from this node, then from Redis, and fetch the guild if neither has it."""
+
+        if (snapshot := self._entries.get(guild_id)) is not None:
+            return snapshot
+
+        task = self._loading.get(guild_id)
+
+        if not task:
+            task = self._loading[guild_id] = asyncio.create_task(self._load(guild_id, fetch_guild))
+
+            def forget(loaded_task: asyncio.Task):
+                # an invalidation may have replaced this load with a newer one
+                if self._loading.get(guild_id) is loaded_task:
+                    del self._loading[guild_id]
+
+            task.add_done_callback(forget)
+
+        return await asyncio.shield(task)
+
+    async def _load(self, guild_id: int, fetch_guild: Callable[[int], Awaitable[hikari.RESTGuild]]) -> GuildSnapshot:
+        generation = self._generation
+        key = GUILD_SNAPSHOT_KEY.format(guild_id=guild_id)
+
+        if stored_snapshot := await redis.get(key):
+            snapshot = GuildSnapshot.model_validate_json(stored_snapshot)
+        else:
+            snapshot = GuildSnapshot.from_hikari(await fetch_guild(guild_id))
+
+            if generation == self._generation:
+                await redis.set(key, snapshot.model_dump_json(), expire=timedelta(seconds=self.redis_ttl))
+
+        if generation == self._generation:
+            self._entries.set(guild_id, snapshot)
+
+        return snapshot
+
+    def drop(self, guild_id: int | str):
+        """Drop the snapshot of this guild from this node."""
+
+        self._generation += 1
+        self._entries.pop(int(guild_id))
+        self._loading.pop(int(guild_id), None)
+
+
+guild_snapshot_cache = GuildSnapshotCache(
+    max_size=CACHES["GUILD_SNAPSHOTS"]["MAX_SIZE"],
+    ttl=CACHES["GUILD_SNAPSHOTS"]["TTL"],
+    redis_ttl=CACHES["GUILD_SNAPSHOTS"]["REDIS_TTL"],
+)
+
+
+async def invalidate_guild_snapshot(guild_id: int | str):
+    """Drop the snapshot of this guild from Redis and from every node."""
+
+    guild_snapshot_cache.drop(guild_id)
+
+    await redis.delete(GUILD_SNAPSHOT_KEY.format(guild_id=guild_id))
+    await redis.publish(GUILD_SNAPSHOT_INVALIDATION_CHANNEL, json.dumps({"guild_id": str(guild_id)}))
@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import hashlib
+import importlib
+import json
+import logging
+from pathlib import Path
+from typing import TypedDict
+
+SOURCE_PATH = Path(__file__).parent.parent
+MANIFEST_PATH = SOURCE_PATH / "command_manifest.json"
+
+
+class ManifestData(TypedDict):
+    """Represents how the command manifest is stored on disk."""
+
+    fingerprint: str
+    commands: dict[str, str]
+    custom_id_routes: list[tuple[list[str | None], str]]
+    scopes: dict[str, str]
+
+
+class CommandManifest:
+    """Index of every command, built from a previous run, so commands can be imported on first use.
+
+    Attributes:
+        commands (dict[str, str]): Command names (including aliases) mapped to the module that defines them.
+        custom_id_routes (list[tuple[list[str | None], str]]): Custom ID route paths mapped to the module
+            that handles them.
+        scopes (dict[str, str]): Hash of the payload of each command scope, used to skip command syncing.
+        lazy (bool): Whether commands are being loaded lazily from this manifest.
+    """
+
+    def __init__(self):
+        self.commands: dict[str, str] = {}
+        self.custom_id_routes: list[tuple[list[str | None], str]] = []
+        self.scopes: dict[str, str] = {}
+        self.lazy = False
+
+    def load(self, path: Path = MANIFEST_PATH) -> bool:
+        """Load the manifest from disk. Returns False if it is missing or was built from different source code."""
+
+        try:
+            manifest_data: ManifestData = json.loads(path.read_text("utf-8"))
+        except (OSError, ValueError):
+            return False
+
+        if manifest_data.get("fingerprint") != self.fingerprint():
+            logging.info("Command manifest is out of date, loading every command.")
+            return False
+
+        self.commands = manifest_data["commands"]
+        self.custom_id_routes = manifest_data["custom_id_routes"]
+        self.scopes = manifest_data["scopes"]
+        self.lazy = True
+
+        return True
+
+    def write(self, manifest_data: ManifestData, path: Path = MANIFEST_PATH):
+        """Write the manifest to disk."""
+
+        try:
+            path.write_text(json.dumps(manifest_data, indent=4), "utf-8")
+        except OSError as ex:
+            logging.warning(f"Unable to write the command manifest: {ex}")
+        else:
+            logging.info(f"Wrote the command manifest with {len(manifest_data['commands'])} commands.")
+
+    def import_command(self, command_name: str) -> bool:
+        """Import the module of this command. Returns False if the manifest does not know about it."""
+
+        module_name = self.commands.get(command_name)
+
+        if not module_name:
+            return False
+
+        importlib.import_module(module_name)
+
+        return True
+
+    def import_all(self):
+        """Import every command module, such as when the full command list needs to be synced."""
+
+        for module_name in set(self.commands.values()):
+            importlib.import_module(module_name)
+
+    @staticmethod
+    def fingerprint() -> str:
+        """Hash of the source code, so a manifest is never used with code it was not built from."""
+
+        source_hash = hashlib.sha256()
+
+        for source_file in sorted(SOURCE_PATH.rglob("*.py")):
+            source_hash.update(str(source_file.relative_to(SOURCE_PATH)).encode("utf-8"))
+            source_hash.update(source_file.read_bytes())
+
+        return source_hash.hexdigest()
+
+
+command_manifest = CommandManifest()
@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Iterable, Self
+
+import hikari
+from prometheus_client import Counter
+
+from resources.bloxlink import bloxlink
+from resources.constants import SINGLE_ROLE_EDIT_MAX
+
+if TYPE_CHECKING:
+    from bloxlink_lib import MemberSerializable
+
+
+__all__ = ("MemberEditPlan",)
+
+
+member_edit_calls_counter = Counter(
+    "member_edit_calls",
+    "REST calls made to change the roles and nickname of members, by the kind of call",
+    ["kind"],
+)
+member_edit_calls_avoided_counter = Counter(
+    "member_edit_calls_avoided",
+    "REST calls to change members that were not made, compared to one call for roles and one for the nickname",
+    ["reason"],
+)
+
+
+@dataclass(slots=True, frozen=True)
+class MemberEditPlan:
+    """The smallest set of REST calls that changes a member's roles and nickname to what their binds give them.
+
+    Roles that the member already has are not added again, and roles that they don't have are not removed. Nothing
+    is sent for a member who is unchanged.
+    """
+
+    member_id: int
+    role_ids: frozenset[int]  # the roles of the member before the edit
+    add_roles: frozenset[int]
+    remove_roles: frozenset[int]
+    nickname: str | None  # None if the nickname stays the same
+
+    @classmethod
+    def create(
+        cls,
+        member: hikari.Member | MemberSerializable,
+        add_roles: Iterable[int],
+        remove_roles: Iterable[int],
+        nickname: str | None,
+    ) -> Self:
+        """Compare what the binds give a member with their current roles and nickname.
+
+        Args:
+            member (hikari.Member | MemberSerializable): The member, as they are before the edit.
+            add_roles (Iterable[int]): The roles that the member should have.
+            remove_roles (Iterable[int]): The roles that the member should not have.
+            nickname (str | None): The nickname that the member should have, or None to leave it as it is.
+        """
+
+        role_ids = frozenset(int(role_id) for role_id in member.role_ids)
+        remove_roles = frozenset(int(role_id) for role_id in remove_roles)
+        add_roles = frozenset(int(role_id) for role_id in add_roles) - remove_roles
+
+        # counted against the two calls that were always made when there was something to send
+        if (add_roles or remove_roles) and not (add_roles - role_ids or remove_roles & role_ids):
+            member_edit_calls_avoided_counter.labels(reason="unchanged_roles").inc()
+
+        if nickname and nickname == member.nickname:
+            member_edit_calls_avoided_counter.labels(reason="unchanged_nickname").inc()
+
+        return cls(
+            member_id=int(member.id),
+            role_ids=role_ids,
+            add_roles=add_roles - role_ids,
+            remove_roles=remove_roles & role_ids,
+            nickname=nickname if nickname and nickname != member.nickname else None,
+        )
+
+    @property
+    def changes_roles(self) -> bool:
+        return bool(self.add_roles or self.remove_roles)
+
+    @property
+    def new_roles(self) -> list[int]:
+        return list((self.role_ids | self.add_roles) - self.remove_roles)
+
+    async def apply(self, guild_id: int | str, reason: str = "") -> bool:
+        """Make the REST calls of this plan.
+
+        Roles and the nickname are changed together when both change. If that is forbidden, which happens when
+        the member's nickname can't be changed, they are changed separately so that the roles still apply.
+
+        Raises:
+            hikari.ForbiddenError: The roles of the member could not be changed.
+
+        Returns:
+            bool: False if the nickname could not be changed because it was forbidden, True otherwise.
+        """
+
+        if self.changes_roles and self.nickname:
+            try:
+                member_edit_calls_counter.labels(kind="combined").inc()
+                await bloxlink.rest.edit_member(
+                    guild_id, self.member_id, roles=self.new_roles, nickname=self.nickname, reason=reason
+                )
+            except hikari.ForbiddenError:
+                member_edit_calls_counter.labels(kind="split_after_forbidden").inc()
+            else:
+                member_edit_calls_avoided_counter.labels(reason="combined").inc()
+                return True
+
+        if self.changes_roles:
+            await self._apply_roles(guild_id, reason)
+
+        if self.nickname:
+            try:
+                member_edit_calls_counter.labels(kind="nickname").inc()
+                await bloxlink.rest.edit_member(guild_id, self.member_id, nickname=self.nickname, reason=reason)
+            except hikari.ForbiddenError:
+                return False
+
+        return True
+
+    async def _apply_roles(self, guild_id: int | str, reason: str):
+        if len(self.add_roles) + len(self.remove_roles) > SINGLE_ROLE_EDIT_MAX:
+            member_edit_calls_counter.labels(kind="roles").inc()
+            await bloxlink.rest.edit_member(guild_id, self.member_id, roles=self.new_roles, reason=reason)
+            return
+
+        # these only touch one role, so they can't undo a role change that was made since the member was read
+        for role_id in self.add_roles:
+            member_edit_calls_counter.labels(kind="add_role").inc()
+            await bloxlink.rest.add_role_to_member(guild_id, self.member_id, role_id, reason=reason)
+
+        for role_id in self.remove_roles:
+            member_edit_calls_counter.labels(kind="remove_role").inc()
+            await bloxlink.rest.remove_role_from_member(guild_id, self.member_id, role_id, reason=reason)
@@ -0,0 +1,105 @@
+import time
+from contextlib import contextmanager
+from typing import Literal
+
+import hikari
+from prometheus_client import Counter, Histogram
+
+
+INTERACTION_LABELS = ("type", "command", "subcommand", "section")
+
+INTERACTION_TYPES: dict[hikari.InteractionType, str] = {
+    hikari.InteractionType.APPLICATION_COMMAND: "command",
+    hikari.InteractionType.MESSAGE_COMPONENT: "component",
+    hikari.InteractionType.AUTOCOMPLETE: "autocomplete",
+    hikari.InteractionType.MODAL_SUBMIT: "modal",
+}
+
+interaction_phase_histogram = Histogram(
+    "interaction_phase_seconds",
+    "Time spent in each phase of handling an interaction",
+    ["phase", *INTERACTION_LABELS],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2, 3, 5, 10),
+)
+interaction_exceptions_counter = Counter(
+    "interaction_exceptions",
+    "Exceptions raised while handling interactions",
+    ["exception", *INTERACTION_LABELS],
+)
+interaction_responses_counter = Counter(
+    "interaction_responses",
+    "Responses to interactions, by whether they were returned inline or sent over REST",
+    ["method", *INTERACTION_LABELS],
+)
+
+
+class InteractionTimer:
+    """Times the phases of a single interaction.
+
+    Phases are observed once the interaction is finished, since the command and custom ID labels are
+    not known until the interaction has been routed.
+    """
+
+    __slots__ = ("labels", "started_at", "_phases", "_first_response_at", "_responses")
+
+    def __init__(self, interaction: hikari.PartialInteraction | None):
+        self.labels = {
+            "type": INTERACTION_TYPES.get(interaction.type, "other") if interaction else "other",
+            "command": "",
+            "subcommand": "",
+            "section": "",
+        }
+        self.started_at = time.perf_counter()
+        self._phases: list[tuple[str, float]] = []
+        self._first_response_at: float = None
+        self._responses: list[str] = []
+
+    def set_labels(self, command: str = None, subcommand: str = None, section: str = None):
+        """Set the labels that are known once the interaction was routed."""
+
+        for label_name, label_value in (("command", command), ("subcommand", subcommand), ("section", section)):
+            if label_value:
+                self.labels[label_name] = label_value
+
+    @contextmanager
+    def phase(self, phase_name: str):
+        """Time the code in this block as a phase of the interaction."""
+
+        started_at = time.perf_counter()
+
+        try:
+            yield
+        finally:
+            self._phases.append((phase_name, time.perf_counter() - started_at))
+
+    def first_response(self):
+        """Record that the interaction was responded to or deferred."""
+
+        if self._first_response_at is None:
+            self._first_response_at = time.perf_counter()
+
+    def response_sent(self, method: Literal["inline", "rest"]):
+        """Record a response to the interaction, either returned inline with the HTTP response or sent over REST."""
+
+        self._responses.append(method)
+
+    def exception(self, exception: BaseException):
+        """Count an exception that was raised while handling the interaction."""
+
+        interaction_exceptions_counter.labels(exception=type(exception).__name__, **self.labels).inc()
+
+    def finish(self):
+        """Observe every phase and response of the interaction, along with the time to first response and the total time."""
+
+        for phase_name, seconds in self._phases:
+            interaction_phase_histogram.labels(phase=phase_name, **self.labels).observe(seconds)
+
+        if self._first_response_at is not None:
+            interaction_phase_histogram.labels(phase="first_response", **self.labels).observe(
+                self._first_response_at - self.started_at
+            )
+
+        interaction_phase_histogram.labels(phase="total", **self.labels).observe(time.perf_counter() - self.started_at)
+
+        for method in self._responses:
+            interaction_responses_counter.labels(method=method, **self.labels).inc()
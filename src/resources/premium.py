@@ -5,9 +5,10 @@ from enum import Enum, auto
 import hikari
 from pydantic import Field
 from bloxlink_lib import BaseModel
-from bloxlink_lib.database import fetch_guild_data, redis
+from bloxlink_lib.database import redis
 from resources.user_permissions import get_user_type, UserTypes
 from resources.bloxlink import bloxlink
+from resources.database import fetch_guild_data
 from config import CONFIG
 
 from .constants import SKU_TIERS
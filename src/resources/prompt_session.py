@@ -0,0 +1,203 @@
+import copy
+import json
+from datetime import timedelta
+from itertools import chain
+from typing import Any
+
+from bloxlink_lib.database import redis
+
+from .exceptions import Message
+
+
+# hashes, unlike the strings that prompt data was stored in under prompt_data:*, so the prefix is different
+# to keep nodes from reading keys of the other format while deploying
+PROMPT_SESSION_KEY = "prompt_session:{command_name}:{prompt_name}:{user_id}"
+VERSION_FIELD = "_version"
+SAVE_ATTEMPTS = 3
+
+# Returns the new version of the session, or -1 if the session was changed since it was loaded.
+# ARGV: expected version ("" to skip the check), TTL in ms, clear flag, number of changed fields,
+# the changed fields and their values, then the removed fields.
+SAVE_PROMPT_SESSION = redis.register_script("""
+local version = tonumber(redis.call("HGET", KEYS[1], "_version")) or 0
+
+if ARGV[1] ~= "" and version ~= tonumber(ARGV[1]) then
+    return -1
+end
+
+if ARGV[3] == "1" then
+    redis.call("DEL", KEYS[1])
+end
+
+local changed_count = tonumber(ARGV[4])
+
+for i = 5, 4 + changed_count * 2, 2 do
+    redis.call("HSET", KEYS[1], ARGV[i], ARGV[i + 1])
+end
+
+for i = 5 + changed_count * 2, #ARGV do
+    redis.call("HDEL", KEYS[1], ARGV[i])
+end
+
+version = version + 1
+redis.call("HSET", KEYS[1], "_version", version)
+redis.call("PEXPIRE", KEYS[1], ARGV[2])
+
+return version
+""")
+
+
+def _decode(value: str | bytes) -> str:
+    return value.decode("utf-8") if isinstance(value, bytes) else value
+
+
+class PromptSession:
+    """State of a prompt for one user, stored as a Redis hash with one field per key.
+
+    The hash is read at most once per interaction, and only the keys that changed are written back
+    when save() is called. Every save bumps a version counter so that two interactions which modified
+    the same key concurrently (such as double clicking a button) are detected instead of one silently
+    overwriting the other.
+    """
+
+    __slots__ = ("key", "ttl", "version", "_data", "_base", "_dirty", "_cleared", "_loaded")
+
+    def __init__(self, key: str, ttl: timedelta | int = timedelta(hours=1)):
+        self.key = key
+        self.ttl = ttl
+        self.version: int | None = None  # None if this session was never read, so saves are unconditional
+        self._data: dict[str, Any] = {}
+        self._base: dict[str, str] = {}  # raw values as they were when the session was loaded
+        self._dirty: set[str] = set()
+        self._cleared = False
+        self._loaded = False
+
+    async def load(self) -> dict[str, Any]:
+        """Read the session from Redis, unless it was already read by this interaction."""
+
+        if self._loaded:
+            return self._data
+
+        self._loaded = True
+
+        # a cleared session does not depend on what is stored
+        if self._cleared:
+            return self._data
+
+        self._adopt(await self._fetch())
+
+        return self._data
+
+    async def get(self, key_name: str = None) -> Any:
+        """Return a copy of a key of the session, or of the whole session if no key is given."""
+
+        data = await self.load()
+
+        return copy.deepcopy(data.get(key_name) if key_name else data)
+
+    def update(self, ttl: timedelta | int = None, **data):
+        """Change keys of the session. This is only written to Redis once save() is called."""
+
+        self._data.update(data)
+        self._dirty.update(data)
+
+        if ttl:
+            self.ttl = ttl
+
+    def remove(self, *key_names: str):
+        """Remove keys from the session. This is only written to Redis once save() is called."""
+
+        for key_name in key_names:
+            self._data.pop(key_name, None)
+            self._dirty.add(key_name)
+
+    def clear(self):
+        """Remove every key from the session. This is only written to Redis once save() is called."""
+
+        self._data.clear()
+        self._base.clear()
+        self._dirty.clear()
+        self._cleared = True
+        self._loaded = True
+        self.version = None
+
+    async def save(self):
+        """Write the changed keys to Redis in a single request.
+
+        If another interaction saved this session in the meantime, the session is re-read and the save is
+        retried, unless the other interaction changed one of the same keys.
+
+        Raises:
+            Message: Another interaction changed the same keys of this session.
+        """
+
+        if not self._dirty and not self._cleared:
+            return
+
+        changed = {key_name: json.dumps(self._data[key_name]) for key_name in self._dirty if key_name in self._data}
+        removed = [key_name for key_name in self._dirty if key_name not in self._data]
+        ttl = self.ttl if isinstance(self.ttl, timedelta) else timedelta(seconds=self.ttl)
+
+        for _ in range(SAVE_ATTEMPTS):
+            version = int(
+                await SAVE_PROMPT_SESSION(
+                    keys=[self.key],
+                    args=[
+                        "" if self.version is None else self.version,
+                        int(ttl.total_seconds() * 1000),
+                        int(self._cleared),
+                        len(changed),
+                        *chain.from_iterable(changed.items()),
+                        *removed,
+                    ],
+                )
+            )
+
+            if version != -1:
+                break
+
+            self._rebase(await self._fetch())
+        else:
+            raise self._conflict()
+
+        if self._cleared:
+            self._base.clear()
+
+        self._base.update(changed)
+
+        for key_name in removed:
+            self._base.pop(key_name, None)
+
+        # a session that was never read has no base to detect conflicts against, so its saves stay blind
+        self.version = version if self._loaded else None
+        self._dirty.clear()
+        self._cleared = False
+
+    async def _fetch(self) -> dict[str, str]:
+        return {_decode(key): _decode(value) for key, value in (await redis.hgetall(self.key)).items()}
+
+    def _adopt(self, stored: dict[str, str]):
+        """Use the stored session as the base of this one, keeping the keys that were changed locally."""
+
+        self.version = int(stored.pop(VERSION_FIELD, 0))
+        self._base = stored
+
+        for key_name, value in stored.items():
+            if key_name not in self._dirty:
+                self._data[key_name] = json.loads(value)
+
+    def _rebase(self, stored: dict[str, str]):
+        """Merge a session that was saved by another interaction into this one."""
+
+        for key_name in self._dirty:
+            if stored.get(key_name) != self._base.get(key_name):
+                raise self._conflict()
+
+        for key_name in set(self._base) - set(stored) - self._dirty:
+            self._data.pop(key_name, None)
+
+        self._adopt(stored)
+
+    @staticmethod
+    def _conflict() -> Message:
+        return Message("This prompt was changed by another action at the same time. Please try again.", ephemeral=True)
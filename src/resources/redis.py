@@ -2,6 +2,7 @@ import asyncio
 import logging
 import time
 import json
+from typing import Callable
 from bloxlink_lib import create_task_log_exception, get_node_count, BaseModel, parse_into
 from bloxlink_lib.database import redis
 
@@ -22,6 +23,7 @@ class RedisMessageCollector:
     def __init__(self):
         self.pubsub = redis.pubsub()
         self._futures: dict[str, tuple[FutureMessage, bool, BaseModel | dict, list[dict]]] = {}
+        self._listeners: dict[str, Callable[[dict], None]] = {}
         self._listener_task = create_task_log_exception(self._listen_for_message())
 
     async def _listen_for_message(self):
@@ -42,6 +44,16 @@ class RedisMessageCollector:
 
             # Required to be converted from a byte array.
             channel: str = message["channel"]
+            listener = self._listeners.get(channel, None)
+
+            if listener:
+                try:
+                    listener(json.loads(message["data"]))
+                except Exception as ex: # pylint: disable=broad-except
+                    self.logger.exception(ex)
+
+                continue
+
             current_future = self._futures.get(channel, None)
 
             if not current_future:
@@ -86,3 +98,17 @@ class RedisMessageCollector:
             return await asyncio.wait_for(future, timeout=timeout)
         finally:
             await self.pubsub.unsubscribe(channel)
+
+    async def add_listener(self, channel: str, listener: Callable[[dict], None]):
+        """Call the listener with every message published to this channel.
+
+        Unlike get_message(), the channel stays subscribed for as long as the bot is running.
+
+        Args:
+            channel (str): Channel to listen to.
+            listener (Callable[[dict], None]): Called with the decoded JSON of each message.
+        """
+
+        self._listeners[channel] = listener
+
+        await self.pubsub.subscribe(channel)
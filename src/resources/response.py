@@ -1,19 +1,25 @@
+import asyncio
+import copy
 import functools
-import json
 import logging
+import time
 import uuid
+from dataclasses import dataclass, field
 from datetime import timedelta
-from typing import TYPE_CHECKING, Any, Callable, Generic, Self, Type, TypeVar
+from typing import TYPE_CHECKING, Any, AsyncIterator, Callable, ClassVar, Generic, Self, Type, TypeVar
 
 import hikari
-from bloxlink_lib import UNDEFINED, BaseModel, BloxlinkException
-from bloxlink_lib.database import redis
-from pydantic import Field
+from hikari.api import InteractionResponseBuilder
+from bloxlink_lib import UNDEFINED, BloxlinkException
 
 from resources import commands
 import resources.ui.components as Components
 import resources.ui.modals as modal
 from resources.bloxlink import bloxlink
+from resources.constants import INLINE_RESPONSE_DEADLINE
+from resources.database import GuildDataLoader
+from resources.metrics import InteractionTimer
+from resources.prompt_session import PROMPT_SESSION_KEY, PromptSession
 from resources.ui.embeds import InteractiveMessage
 
 from .exceptions import CancelCommand, PageNotFound
@@ -40,17 +46,19 @@ class PromptCustomID(Components.CommandCustomID):
         self.type = "prompt"
 
 
-class PromptPageData(BaseModel):
+@dataclass(slots=True, kw_only=True)
+class PromptPageData:
     """Represents the data for a page of a prompt."""
 
     description: str
-    components: list[Components.Component] = Field(default_factory=list)
+    components: list[Components.Component] = field(default_factory=list)
     title: str = None
-    fields: list["Field"] = Field(default_factory=list)
+    fields: list["Field"] = field(default_factory=list)
     color: int = None
     footer_text: str = None
 
-    class Field(BaseModel):  # TODO: RENAME THIS TO PromptField
+    @dataclass(slots=True, kw_only=True)
+    class Field:  # TODO: RENAME THIS TO PromptField
         """Represents a field in a prompt embed."""
 
         name: str
@@ -58,7 +66,8 @@ class PromptPageData(BaseModel):
         inline: bool = False
 
 
-class Page(BaseModel):
+@dataclass(slots=True, kw_only=True)
+class Page:
     """Represents a page of a prompt."""
 
     func: Callable
@@ -66,6 +75,50 @@ class Page(BaseModel):
     page_number: int
     programmatic: bool = False
     edited: bool = False
+    template: "PageTemplate" = None
+
+
+@dataclass(slots=True, kw_only=True)
+class PageTemplate:
+    """Parts of a static page which are the same for every interaction, so they are only built once."""
+
+    embed: hikari.Embed
+
+    @classmethod
+    def from_details(cls, details: PromptPageData) -> Self:
+        embed = hikari.Embed(
+            description=details.description,
+            title=details.title or "Prompt",
+        )
+
+        embed.set_footer(details.footer_text or None)
+
+        for field in details.fields:
+            embed.add_field(field.name, field.value, inline=field.inline)
+
+        if details.color:
+            embed.color = details.color
+
+        return cls(embed=embed)
+
+    def build_embed(self) -> hikari.Embed:
+        """Return a copy of the embed that can be changed without changing the template, which every prompt
+        shares. The copy is deep, since the fields and footer of the embed are mutable too."""
+
+        return copy.deepcopy(self.embed)
+
+
+@dataclass(slots=True, frozen=True)
+class PageDefinition:
+    """A page method of a Prompt class, discovered once when the class is created."""
+
+    attr_name: str
+    details: PromptPageData | None
+    template: PageTemplate | None
+
+    @property
+    def programmatic(self) -> bool:
+        return self.details is None
 
 
 T = TypeVar("T", bound="PromptCustomID")
@@ -79,16 +132,49 @@ class Response:
         user_id (hikari.Snowflake): The user ID who triggered this interaction.
         responded (bool): Has this interaction been responded to. Default is False.
         deferred (bool): Is this response a deferred response. Default is False.
+        defer_as_update (bool): Defer component and modal interactions as an update to their message,
+            instead of with a loading message. Default is False.
+        guild_data (GuildDataLoader): Loads the guild data for this interaction. None outside of guilds.
+        timer (InteractionTimer): Times the phases of this interaction for the metrics.
+        pending_edits (dict[tuple[int, int], dict]): Message edits that will be sent by flush_edits(), keyed
+            by channel ID and message ID.
     """
 
+    __slots__ = (
+        "interaction",
+        "user_id",
+        "timer",
+        "_responded",
+        "deferred",
+        "defer_as_update",
+        "autocomplete_choices",
+        "guild_data",
+        "pending_edits",
+    )
+
     def __init__(
         self, interaction: hikari.CommandInteraction | hikari.ComponentInteraction | hikari.ModalInteraction | None
     ):
         self.interaction = interaction # None if this is being sent to a DM only
         self.user_id = interaction.user.id if interaction else None
-        self.responded = False
+        self.timer = InteractionTimer(interaction)
+        self._responded = False
         self.deferred = False
-        self.defer_through_rest = False
+        self.defer_as_update = False
+        self.autocomplete_choices: list["AutocompleteOption"] = None # set by send_autocomplete() for caching
+        self.guild_data = GuildDataLoader(interaction.guild_id) if interaction and interaction.guild_id else None
+        self.pending_edits: dict[tuple[int, int], dict[str, Any]] = {}
+
+    @property
+    def responded(self) -> bool:
+        return self._responded
+
+    @responded.setter
+    def responded(self, value: bool):
+        if value:
+            self.timer.first_response()
+
+        self._responded = value
 
     async def defer(self, ephemeral: bool = False):
         """Defer this interaction. This needs to be yielded and called as the first response.
@@ -104,26 +190,77 @@ class Response:
         self.responded = True
         self.deferred = True
 
-        if self.defer_through_rest:
-            logging.debug("Deferring via create_initial_response (REST)")
-            if ephemeral:
-                return await self.interaction.create_initial_response(
-                    hikari.ResponseType.DEFERRED_MESSAGE_UPDATE, flags=hikari.messages.MessageFlag.EPHEMERAL
-                )
-
-            return await self.interaction.create_initial_response(hikari.ResponseType.DEFERRED_MESSAGE_UPDATE)
-
         if self.interaction.type == hikari.InteractionType.APPLICATION_COMMAND:
             logging.debug("Deferring via build_deferred_response for application command.")
             return self.interaction.build_deferred_response().set_flags(
                 hikari.messages.MessageFlag.EPHEMERAL if ephemeral else None
             )
 
-        logging.debug("Deferring via build_deferred_response")
+        logging.debug("Deferring via build_deferred_response, update=%s", self.defer_as_update)
         return self.interaction.build_deferred_response(
-            hikari.ResponseType.DEFERRED_MESSAGE_CREATE
+            hikari.ResponseType.DEFERRED_MESSAGE_UPDATE
+            if self.defer_as_update
+            else hikari.ResponseType.DEFERRED_MESSAGE_CREATE
         ).set_flags(hikari.messages.MessageFlag.EPHEMERAL if ephemeral else None)
 
+    async def stream(self, responses: AsyncIterator[Any]) -> AsyncIterator[InteractionResponseBuilder]:
+        """Return the responses of a handler to Discord, preferring the inline HTTP response over REST.
+
+        The first response builder the handler yields is returned inline. If the handler has not responded
+        within INLINE_RESPONSE_DEADLINE, the interaction is deferred inline instead and the handler carries on
+        over REST. Interactions on a message which the handler never responded to are acknowledged inline once
+        it is done.
+
+        Args:
+            responses (AsyncIterator[Any]): The handler of the interaction.
+        """
+
+        inline_used = False
+        can_defer = isinstance(
+            self.interaction, (hikari.CommandInteraction, hikari.ComponentInteraction, hikari.ModalInteraction)
+        )
+
+        while True:
+            if can_defer and not inline_used and not self.responded:
+                next_response = asyncio.ensure_future(anext(responses, StopAsyncIteration))
+                time_left = self.timer.started_at + INLINE_RESPONSE_DEADLINE - time.perf_counter()
+                done, _ = await asyncio.wait((next_response,), timeout=max(time_left, 0))
+
+                if not done and not self.responded:
+                    logging.debug("Handler missed the inline response deadline, deferring %s", self.interaction.id)
+
+                    inline_used = True
+                    self.timer.response_sent("inline")
+                    yield await self.defer()
+
+                response = await next_response
+            else:
+                response = await anext(responses, StopAsyncIteration)
+
+            if response is StopAsyncIteration:
+                break
+
+            # REST responses return messages, which were already sent
+            if not isinstance(response, InteractionResponseBuilder):
+                continue
+
+            if inline_used:
+                logging.error(
+                    f"Interaction {self.interaction.type} attempted to send multiple responses! This is probably a bug.",
+                    stack_info=True,
+                )
+                continue
+
+            inline_used = True
+            self.timer.response_sent("inline")
+            yield response
+
+        if not inline_used and not self.responded and can_defer and getattr(self.interaction, "message", None):
+            # acknowledge the interaction so it doesn't fail, this leaves the message as it is
+            self.responded = True
+            self.timer.response_sent("inline")
+            yield self.interaction.build_deferred_response(hikari.ResponseType.DEFERRED_MESSAGE_UPDATE)
+
     async def send_first(
         self,
         content: str = None,
@@ -146,6 +283,10 @@ class Response:
 
         logging.debug("responded=%s", self.responded)
 
+        if edit_original:
+            # the buffered edits must not overwrite this response
+            await self.flush_edits()
+
         if components and build_components:
             components = Components.clean_action_rows(
                 functools.reduce(
@@ -159,6 +300,7 @@ class Response:
 
             if edit_original:
                 logging.debug("send_first() editing original interaction response, i=%s", self.interaction)
+                self.timer.response_sent("rest")
                 return await self.interaction.edit_initial_response(
                     content, embed=embed, components=components
                 )
@@ -268,6 +410,10 @@ class Response:
         if ephemeral:
             kwargs["flags"] = hikari.messages.MessageFlag.EPHEMERAL
 
+        if self.deferred or (edit_original and not self.responded):
+            # the buffered edits must not overwrite this response
+            await self.flush_edits()
+
         if self.deferred:
             self.deferred = False
             self.responded = True
@@ -279,6 +425,7 @@ class Response:
                 self.interaction.id,
                 content,
             )
+            self.timer.response_sent("rest")
             return await self.interaction.edit_initial_response(content, components=components, **kwargs)
 
         if self.responded:
@@ -288,6 +435,7 @@ class Response:
                 self.responded,
                 content,
             )
+            self.timer.response_sent("rest")
             return await self.interaction.execute(
                 content, components=components, mentions_everyone=False, role_mentions=False, **kwargs
             )
@@ -301,6 +449,7 @@ class Response:
                 self.deferred,
                 content,
             )
+            self.timer.response_sent("rest")
             return await self.interaction.edit_initial_response(
                 content, components=components, mentions_everyone=False, role_mentions=False, **kwargs
             )
@@ -308,6 +457,7 @@ class Response:
         logging.debug(
             "Creating initial interaction response, id=%s, content=%s", self.interaction.id, content
         )
+        self.timer.response_sent("rest")
         await self.interaction.create_initial_response(
             hikari.ResponseType.MESSAGE_CREATE,
             content,
@@ -327,7 +477,7 @@ class Response:
         embed: hikari.Embed = None,
         components: list[hikari.ActionRowComponent] = None,
     ):
-        """Edit the original message of the interaction."""
+        """Edit the original message of the interaction. This is sent by flush_edits()."""
 
         message = self.interaction.message
 
@@ -340,7 +490,36 @@ class Response:
         if content:
             message.content = content
 
-        await Components.set_components(message, components=components)
+        self.queue_edit(
+            message.channel_id,
+            message.id,
+            embeds=message.embeds,
+            components=Components.rebuild_components(message, components=components),
+        )
+
+    def queue_edit(self, channel_id: int, message_id: int, **edit):
+        """Buffer an edit to a message. Edits to the same message are merged and sent as one request by flush_edits().
+
+        Args:
+            channel_id (int): Channel of the message.
+            message_id (int): Message to edit.
+            **edit: match what hikari expects for rest.edit_message(). Later edits override earlier ones.
+        """
+
+        self.pending_edits.setdefault((channel_id, message_id), {}).update(edit)
+
+    def pending_edit(self, channel_id: int, message_id: int) -> dict[str, Any] | None:
+        """Get the buffered edit to a message, if there is one."""
+
+        return self.pending_edits.get((channel_id, message_id))
+
+    async def flush_edits(self):
+        """Send the buffered message edits, one request per message."""
+
+        pending_edits, self.pending_edits = self.pending_edits, {}
+
+        for (channel_id, message_id), edit in pending_edits.items():
+            await bloxlink.rest.edit_message(channel_id, message_id, **edit)
 
     async def send_modal(self, modal: "modal.Modal"):
         """Send a modal response. This needs to be yielded."""
@@ -353,9 +532,7 @@ class Response:
 
         # we save the command options so we can re-execute the command correctly
         if modal.command_options:
-            await redis.set(
-                f"modal_command_options:{modal.custom_id}", modal.command_options, expire=timedelta(hours=1)
-            )
+            await modal.save_command_options()
 
         return modal.builder
 
@@ -363,6 +540,7 @@ class Response:
         """Send an autocomplete response to Discord. Limited to 25 items."""
 
         items = items or []
+        self.autocomplete_choices = items
 
         return self.interaction.build_response(
             [hikari.impl.AutocompleteChoiceBuilder(c.name.title(), c.value) for c in items[:25]]
@@ -388,10 +566,14 @@ class Response:
         hash_ = uuid.uuid4().hex
         logging.debug("prompt() hash=%s", hash_)
 
-        return await new_prompt.run_page(
+        prompt_response = await new_prompt.run_page(
             custom_id_data, hash_=hash_, changing_page=True, initial_prompt=True
         ).__anext__()
 
+        await new_prompt.save()
+
+        return prompt_response
+
     async def send_premium_upsell(self, raise_exception=True):
         """Send a premium upsell message. This cancels out of the command."""
 
@@ -408,6 +590,21 @@ class Response:
 
 class Prompt(Generic[T]):
     override_prompt_name: str = None
+    page_definitions: ClassVar[tuple[PageDefinition, ...]] = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+
+        # class attributes are in insertion-order, so this is the order of the pages
+        cls.page_definitions = tuple(
+            PageDefinition(
+                attr_name=attr_name,
+                details=None if attr.__programmatic_page__ else attr.__page_details__,
+                template=None if attr.__programmatic_page__ else PageTemplate.from_details(attr.__page_details__),
+            )
+            for attr_name, attr in cls.__dict__.items()
+            if hasattr(attr, "__page__")
+        )
 
     def __init__(
         self,
@@ -429,10 +626,15 @@ class Prompt(Generic[T]):
         self.start_with_fresh_data = start_with_fresh_data
 
         self.custom_id: T = None  # this is set in prompt.new_prompt()
+        self.session = PromptSession(
+            PROMPT_SESSION_KEY.format(
+                command_name=command_name, prompt_name=self.prompt_name, user_id=response.user_id
+            )
+        )
 
         self.edited = False
 
-        response.defer_through_rest = True
+        response.defer_as_update = True
 
     @staticmethod
     async def new_prompt(
@@ -481,49 +683,21 @@ class Prompt(Generic[T]):
     ) -> Self | None:
         """Returns the matching prompt from the command."""
 
-        if not command:
-            for command_ in filter(lambda c: c.prompts, commands.slash_commands.values()):
-                for command_prompt in command_.prompts:
-                    try:
-                        parsed_custom_id = PromptCustomID.from_str(str(custom_id))  # TODO
-                    except (TypeError, IndexError):
-                        # Keeps prompts from preventing normal components from firing on iteration.
-                        # Since we check for a valid handler
-                        continue
+        route = commands.resolve_custom_id(str(custom_id))
+        command_prompt: Type[Prompt] = route.get("prompt") if route else None
 
-                    if parsed_custom_id.command_name == command_.name and parsed_custom_id.prompt_name in (
-                        command_prompt.override_prompt_name,
-                        command_prompt.__name__,
-                    ):
-                        command = command_
-                        break
-
-                if command:
-                    break
-
-        if not command:
-            raise BloxlinkException("No matching command found.")
-
-        for command_prompt in command.prompts:
-            try:
-                parsed_custom_id = PromptCustomID.from_str(str(custom_id))  # TODO
-            except (TypeError, IndexError):
-                # Keeps prompts from preventing normal components from firing on iteration.
-                # Since we check for a valid handler
-                continue
+        if not command_prompt or (command and route["command"].name != command.name):
+            if not command:
+                raise BloxlinkException("No matching command found.")
 
-            if parsed_custom_id.command_name == command.name and parsed_custom_id.prompt_name in (
-                command_prompt.override_prompt_name,
-                command_prompt.__name__,
-            ):
-                new_prompt = await command_prompt.new_prompt(
-                    prompt_instance=command_prompt,
-                    interaction=interaction,
-                    response=response or Response(interaction),
-                    command_name=command.name,
-                )
+            return None
 
-                return new_prompt
+        return await command_prompt.new_prompt(
+            prompt_instance=command_prompt,
+            interaction=interaction,
+            response=response or Response(interaction),
+            command_name=route["command"].name,
+        )
 
     @staticmethod
     def page(page_details: PromptPageData):
@@ -553,12 +727,11 @@ class Prompt(Generic[T]):
         """Build a PromptEmbed from a prompt and page."""
 
         action_rows: list[Components.Component] = []
-        embed = hikari.Embed(
-            description=page.details.description,
-            title=page.details.title or "Prompt",
-        )
 
-        embed.set_footer(page.details.footer_text or None)
+        if page.template:
+            embed = page.template.build_embed()
+        else:
+            embed = PageTemplate.from_details(page.details).embed
 
         # the message will only exist if this is a component interaction
         if (
@@ -570,31 +743,17 @@ class Prompt(Generic[T]):
         self.custom_id.page_number = page.page_number
 
         if page.details.components:
-            for component in page.details.components:
-                logging.debug("Setting custom ID: class=%s", self.custom_id_format)
+            # the custom IDs of the components only differ by the component ID
+            custom_id_parts = str(self.custom_id).split(":")
+            component_id_index = list(self.custom_id.model_fields).index("component_custom_id")
 
-                component_custom_id = self.custom_id.set_fields(
-                    component_custom_id=component.component_id,
-                    prompt_message_id=self.custom_id.prompt_message_id,
-                )
-                component.custom_id = str(component_custom_id)
+            for component in page.details.components:
+                custom_id_parts[component_id_index] = component.component_id or ""
+                component.custom_id = ":".join(custom_id_parts)
 
                 logging.debug("Custom ID made: %s", component.custom_id)
 
-            action_rows = Components.clean_action_rows(
-                functools.reduce(
-                    lambda a, c: c.build(a),
-                    page.details.components,
-                    [bloxlink.rest.build_message_action_row()],
-                )
-            )
-
-        if page.details.fields:
-            for field in page.details.fields:
-                embed.add_field(field.name, field.value, inline=field.inline)
-
-        if page.details.color:
-            embed.color = page.details.color
+            action_rows = Components.build_action_rows(page.details.components)
 
         if self._pending_embed_changes:
             if self._pending_embed_changes.get("description"):
@@ -610,38 +769,19 @@ class Prompt(Generic[T]):
         )
 
     def insert_pages(self, prompt: Type["Prompt"]):
-        """Get all pages from the prompt.
-
-        This needs to be called OUTSIDE of self to get the class attributes in insertion-order.
-
-        """
-
-        page_number = 0
-
-        for (
-            attr_name,
-            attr,
-        ) in prompt.__dict__.items():  # so we can get the class attributes in insertion-order
-            if hasattr(attr, "__page__"):
-                if getattr(attr, "__programmatic_page__", False):
-                    self.pages.append(
-                        Page(
-                            func=getattr(self, attr_name),
-                            programmatic=True,
-                            details=PromptPageData(description="Unparsed programmatic page", components=[]),
-                            page_number=page_number,
-                        )
-                    )
-                else:
-                    self.pages.append(
-                        Page(
-                            func=getattr(self, attr_name),
-                            details=attr.__page_details__,
-                            page_number=page_number,
-                        )
-                    )
-
-                page_number += 1
+        """Get all pages from the prompt. The pages are discovered once when the prompt class is created."""
+
+        self.pages = [
+            Page(
+                func=getattr(self, page_definition.attr_name),
+                programmatic=page_definition.programmatic,
+                details=page_definition.details
+                or PromptPageData(description="Unparsed programmatic page", components=[]),
+                template=page_definition.template,
+                page_number=page_number,
+            )
+            for page_number, page_definition in enumerate(prompt.page_definitions)
+        ]
 
     async def populate_programmatic_page(
         self, interaction: hikari.ComponentInteraction, fired_component_id: str | None = None
@@ -682,8 +822,13 @@ class Prompt(Generic[T]):
             if isinstance(generator_response, hikari.Message):
                 continue
             logging.debug("%s generator_response entry_point() %s", hash_, generator_response)
+
+            # the data needs to be saved before the response is sent, since the user can act on it right away
+            await self.save()
             yield generator_response
 
+        await self.save()
+
     async def run_page(
         self, custom_id_data: dict = None, hash_=None, changing_page=False, initial_prompt=False
     ):
@@ -787,65 +932,45 @@ class Prompt(Generic[T]):
                     yield async_result
 
     async def current_data(self, *, key_name: str = None, raise_exception: bool = True):
-        """Get the data for the current page from Redis."""
+        """Get the data for the current page. This is only read from Redis once per interaction."""
 
-        redis_data = await redis.get(
-            f"prompt_data:{self.command_name}:{self.prompt_name}:{self.response.interaction.user.id}"
-        )
+        data = await self.session.get()
 
-        if not redis_data:
+        if not data:
             if raise_exception:
                 raise CancelCommand("Previous data not found. Please restart this command.")
 
             return {}
 
-        return json.loads(redis_data).get(key_name) if key_name else json.loads(redis_data)
+        return data.get(key_name) if key_name else data
 
     async def save_data_from_interaction(self, interaction: hikari.ComponentInteraction):
-        """Save the data from the interaction from the current page to Redis."""
+        """Save the data from the interaction from the current page. This is written to Redis by save()."""
 
         custom_id = PromptCustomID.from_str(interaction.custom_id)
         component_custom_id = custom_id.component_custom_id
 
-        data = await self.current_data(raise_exception=False)
-        data[component_custom_id] = Components.component_values_to_dict(interaction)
-
-        await redis.set(
-            f"prompt_data:{self.command_name}:{self.prompt_name}:{interaction.user.id}",
-            data,
-            expire=timedelta(hours=1),
+        self.session.update(
+            ttl=timedelta(hours=1), **{component_custom_id: Components.component_values_to_dict(interaction)}
         )
 
     async def save_stateful_data(self, ex: int = 3600, **save_data):
-        """Save custom data for this prompt to Redis."""
+        """Save custom data for this prompt. This is written to Redis by save()."""
 
-        data = await self.current_data(raise_exception=False) or {}
-        data.update(save_data)
-
-        await redis.set(
-            f"prompt_data:{self.command_name}:{self.prompt_name}:{self.response.interaction.user.id}",
-            data,
-            expire=ex,
-        )
+        self.session.update(ttl=ex, **save_data)
 
     async def clear_data(self, *remove_data_keys: list[str]):
-        """Clear the data for the current page from Redis."""
+        """Clear the data for the current page. This is written to Redis by save()."""
 
         if remove_data_keys:
-            data = await self.current_data(raise_exception=False) or {}
+            self.session.remove(*remove_data_keys)
+        else:
+            self.session.clear()
 
-            for key in remove_data_keys:
-                data.pop(key, None)
+    async def save(self):
+        """Write the changes to the data of this prompt to Redis in one request."""
 
-            await redis.set(
-                f"prompt_data:{self.command_name}:{self.prompt_name}:{self.response.interaction.user.id}",
-                data,
-                expire=timedelta(hours=1),
-            )
-        else:
-            await redis.delete(
-                f"prompt_data:{self.command_name}:{self.prompt_name}:{self.response.interaction.user.id}"
-            )
+        await self.session.save()
 
     async def previous(self, _content: str = None):
         """Go to the previous page of the prompt."""
@@ -887,18 +1012,42 @@ class Prompt(Generic[T]):
         await self.ack()
 
         if disable_components:
-            if self.custom_id.prompt_message_id:
-                message = await bloxlink.rest.fetch_message(
-                    self.response.interaction.channel_id, self.custom_id.prompt_message_id
-                )
+            channel_id = self.response.interaction.channel_id
+            message_id = self.custom_id.prompt_message_id or self.response.interaction.message.id
+            pending_edit = self.response.pending_edit(channel_id, message_id)
+
+            if pending_edit and "components" in pending_edit:
+                # the buffered edit has the components of the current page, so disable those instead
+                if pending_edit["components"]:
+                    self.response.queue_edit(
+                        channel_id,
+                        message_id,
+                        components=Components.build_action_rows(
+                            [
+                                component.model_copy(update={"is_disabled": True})
+                                if hasattr(component, "is_disabled")
+                                else component
+                                for component in self.current_page.details.components
+                            ]
+                        ),
+                    )
+
+                return
+
+            held_message: hikari.Message | None = getattr(self.response.interaction, "message", None)
+
+            if held_message and held_message.id == message_id:
+                message = held_message
             else:
-                message = self.response.interaction.message
+                message = await bloxlink.rest.fetch_message(channel_id, message_id)
 
             for action_row in message.components:
                 for component in action_row.components:
                     component.is_disabled = True
 
-            await Components.set_components(message, components=message.components)
+            self.response.queue_edit(
+                channel_id, message_id, components=Components.rebuild_components(message, components=message.components)
+            )
 
     async def ack(self):
         """Acknowledge the interaction. This should be used if no response will be sent."""
@@ -908,6 +1057,9 @@ class Prompt(Generic[T]):
         if not self.response.responded:
             # this stops the interaction from erroring
             logging.debug("Deferring via ack()")
+            self.response.responded = True
+            self.response.deferred = True
+            self.response.timer.response_sent("rest")
             await self.response.interaction.create_initial_response(
                 hikari.ResponseType.DEFERRED_MESSAGE_UPDATE
             )
@@ -934,7 +1086,7 @@ class Prompt(Generic[T]):
 
         self.current_page.edited = True
 
-        await bloxlink.rest.edit_message(
+        self.response.queue_edit(
             self.response.interaction.channel_id,
             self.custom_id.prompt_message_id,
             embed=built_page.embed,
@@ -973,7 +1125,7 @@ class Prompt(Generic[T]):
 
         built_page = await self.build_page(self.current_page, hash_=hash_)
 
-        await bloxlink.rest.edit_message(
+        self.response.queue_edit(
             self.response.interaction.channel_id,
             self.custom_id.prompt_message_id,
             content=content,
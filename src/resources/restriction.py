@@ -2,8 +2,9 @@ from typing import Literal, Annotated
 
 import hikari
 from pydantic import Field
-from bloxlink_lib import MemberSerializable, fetch_typed, StatusCodes, get_user, RobloxUser, get_accounts, reverse_lookup, BaseModelArbitraryTypes, BaseModel
+from bloxlink_lib import MemberSerializable, StatusCodes, get_user, RobloxUser, get_accounts, reverse_lookup, BaseModelArbitraryTypes, BaseModel
 
+from resources.api.http_client import http_client
 from resources.bloxlink import bloxlink
 from resources.exceptions import Message, UserNotVerified
 from resources.constants import RED_COLOR, SERVER_INVITE
@@ -56,11 +57,13 @@ class Restriction(BaseModelArbitraryTypes):
             except UserNotVerified:
                 pass
 
-        restriction_data, restriction_response = await fetch_typed(
+        restriction_data, restriction_response = await http_client.request_typed(
             RestrictionResponse,
+            "POST",
             f"{CONFIG.BOT_API}/restrictions/evaluate/{self.guild_id}",
+            endpoint="bot-api:/restrictions/evaluate/{guild_id}",
+            idempotent=True,
             headers={"Authorization": CONFIG.BOT_API_AUTH},
-            method="POST",
             body={
                 "member": MemberSerializable.from_hikari(self.member).model_dump(),
                 "roblox_user": self.roblox_user.model_dump(by_alias=True) if self.roblox_user else None,
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Callable, Sequence, Type, TypedDict
+
+from resources.ui.components import BaseCustomID
+
+if TYPE_CHECKING:
+    from resources.commands import Command
+    from resources.response import Prompt
+
+
+class CustomIDRoute(TypedDict, total=False):
+    """Represents where a custom ID should be dispatched to."""
+
+    command: Command
+    handler: Callable
+    prompt: Type[Prompt]
+    paginator: bool
+
+
+class _RouteNode:
+    """A single segment of the routing trie."""
+
+    __slots__ = ("children", "route")
+
+    def __init__(self):
+        self.children: dict[str | None, _RouteNode] = {}
+        self.route: CustomIDRoute | None = None
+
+
+class CustomIDRouter:
+    """Prefix trie over the ":"-separated segments of custom IDs.
+
+    Routes are registered once when commands are loaded, so resolving a custom ID only walks
+    its own segments instead of scanning every command, accepted custom ID and prompt.
+    """
+
+    def __init__(self):
+        self._root = _RouteNode()
+
+    def add(self, path: Sequence[str | None], route: CustomIDRoute):
+        """Register a route. A None segment in the path matches any value at that position."""
+
+        node = self._root
+
+        for segment in path:
+            node = node.children.setdefault(segment, _RouteNode())
+
+        node.route = route
+
+    def resolve(self, custom_id: str) -> CustomIDRoute | None:
+        """Return the route with the longest matching prefix for this custom ID, if any."""
+
+        return self._walk(self._root, custom_id.split(":"), 0)[1]
+
+    def _walk(self, node: _RouteNode, segments: list[str], depth: int) -> tuple[int, CustomIDRoute | None]:
+        best_match = (depth, node.route) if node.route else (-1, None)
+
+        if depth < len(segments):
+            # exact segments take priority over wildcards of the same depth
+            for segment in (segments[depth], None):
+                child = node.children.get(segment)
+
+                if child:
+                    match = self._walk(child, segments, depth + 1)
+
+                    if match[0] > best_match[0]:
+                        best_match = match
+
+        return best_match
+
+    @staticmethod
+    def path_for(custom_id_format: Type[BaseCustomID], **segments: str) -> list[str | None]:
+        """Build a route path from the positional fields of a custom ID class.
+
+        Fields that are not given are left as wildcards, up to the last field that was given.
+        """
+
+        field_names = list(custom_id_format.model_fields)
+        last_index = max(field_names.index(field_name) for field_name in segments)
+
+        return [segments.get(field_name) for field_name in field_names[: last_index + 1]]
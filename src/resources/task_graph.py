@@ -0,0 +1,75 @@
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Self
+
+from prometheus_client import Histogram
+
+
+task_graph_node_histogram = Histogram(
+    "task_graph_node_seconds",
+    "Time spent running each node of a task graph, not counting the time spent waiting for its dependencies",
+    ["graph", "node"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2, 3, 5, 10),
+)
+
+
+class TaskGraph:
+    """Runs async steps as soon as the steps they depend on are done, so that independent steps run concurrently.
+
+    Nodes are called with the results of their dependencies as keyword arguments. Used as an async context
+    manager, nodes that are still running when the block exits are cancelled, such as when an early result
+    made the rest of the graph unnecessary.
+    """
+
+    __slots__ = ("name", "_nodes", "_tasks")
+
+    def __init__(self, name: str):
+        self.name = name
+        self._nodes: dict[str, tuple[Callable[..., Awaitable[Any]], tuple[str, ...]]] = {}
+        self._tasks: dict[str, asyncio.Task] = {}
+
+    def add(self, node_name: str, func: Callable[..., Awaitable[Any]], after: tuple[str, ...] = ()):
+        """Add a node to the graph. Its dependencies must be added before it, so the graph can't have cycles."""
+
+        for dependency in after:
+            if dependency not in self._nodes:
+                raise ValueError(f"{node_name} depends on {dependency}, which is not in the {self.name} graph.")
+
+        self._nodes[node_name] = (func, after)
+
+    def start(self):
+        """Start every node of the graph."""
+
+        for node_name in self._nodes:
+            self._task(node_name)
+
+    async def result(self, node_name: str) -> Any:
+        """Wait for the result of a node, starting it if it was not started yet."""
+
+        return await self._task(node_name)
+
+    def _task(self, node_name: str) -> asyncio.Task:
+        if node_name not in self._tasks:
+            self._tasks[node_name] = asyncio.create_task(self._run(node_name), name=f"{self.name}:{node_name}")
+
+        return self._tasks[node_name]
+
+    async def _run(self, node_name: str) -> Any:
+        func, after = self._nodes[node_name]
+        dependencies = {dependency: await self._task(dependency) for dependency in after}
+
+        started_at = time.perf_counter()
+        result = await func(**dependencies)
+        task_graph_node_histogram.labels(graph=self.name, node=node_name).observe(time.perf_counter() - started_at)
+
+        return result
+
+    async def __aenter__(self) -> Self:
+        return self
+
+    async def __aexit__(self, *_exc_info):
+        for task in self._tasks.values():
+            task.cancel()
+
+        # also retrieves the exceptions of nodes whose results were never awaited
+        await asyncio.gather(*self._tasks.values(), return_exceptions=True)
@@ -1,15 +1,28 @@
-from typing import TYPE_CHECKING
+import asyncio
+import logging
+from typing import TYPE_CHECKING, Callable
 import hikari
+from prometheus_client import Counter
 
 from bloxlink_lib import BaseModel, RobloxUser, RobloxGroup, get_binds, get_group, find
 
 from resources.api.roblox import users
+from resources.cache import TTLCache
+from resources.constants import AUTOCOMPLETE_TIME_BUDGET, CACHES
 from resources.exceptions import RobloxAPIError, RobloxNotFound
 
 if TYPE_CHECKING:
     from resources.commands import CommandContext
 
 
+autocomplete_cache: TTLCache[tuple, list["AutocompleteOption"]] = TTLCache(
+    "autocomplete", max_size=CACHES["AUTOCOMPLETE"]["MAX_SIZE"], ttl=CACHES["AUTOCOMPLETE"]["TTL"]
+)
+autocomplete_timeouts_counter = Counter(
+    "autocomplete_timeouts", "Autocomplete handlers that ran out of their time budget", ["command", "option"]
+)
+
+
 class AutocompleteOption(BaseModel):
     """Represents an autocomplete option."""
 
@@ -17,6 +30,102 @@ class AutocompleteOption(BaseModel):
     value: str
 
 
+def autocomplete_handler(prefix_filter: Callable[[AutocompleteOption, str], bool] = None):
+    """Describe how the results of an autocomplete handler can be reused.
+
+    Args:
+        prefix_filter (Callable[[AutocompleteOption, str], bool], optional): Returns whether a choice matches
+            the user's input. If set, the choices cached for a shorter input are filtered with it instead of
+            calling the handler again. Defaults to None, which only reuses choices for the same input.
+    """
+
+    def wrapper(fn: Callable):
+        fn.__autocomplete_prefix_filter__ = prefix_filter
+        return fn
+
+    return wrapper
+
+
+async def run_autocomplete(
+    ctx: "CommandContext",
+    autocomplete_fn: Callable,
+    focused_option: hikari.AutocompleteInteractionOption,
+    relevant_options: list[hikari.AutocompleteInteractionOption],
+) -> hikari.api.InteractionAutocompleteBuilder:
+    """Run an autocomplete handler within the time budget, answering from the cache when possible.
+
+    Choices are cached per guild, command, option and input, along with the values of the other options.
+    If the handler runs out of time, it keeps running in the background to fill the cache for the next
+    keystroke, and the choices of the closest shorter input are sent instead.
+    """
+
+    user_input = str(focused_option.value or "").lower().strip()
+    scope = (
+        ctx.guild_id,
+        ctx.command_name,
+        ctx.subcommand_name,
+        focused_option.name,
+        tuple(sorted((option.name, str(option.value)) for option in relevant_options if not option.is_focused)),
+    )
+    prefix_filter: Callable[[AutocompleteOption, str], bool] = getattr(
+        autocomplete_fn, "__autocomplete_prefix_filter__", None
+    )
+
+    choices = autocomplete_cache.peek((scope, user_input))
+
+    if choices is None and prefix_filter:
+        for prefix_length in range(len(user_input) - 1, -1, -1):
+            shorter_choices = autocomplete_cache.peek((scope, user_input[:prefix_length]))
+
+            if shorter_choices is not None:
+                choices = [choice for choice in shorter_choices if prefix_filter(choice, user_input)]
+                autocomplete_cache.set((scope, user_input), choices)
+                break
+
+    if choices is not None:
+        autocomplete_cache.hit()
+        return ctx.response.send_autocomplete(choices)
+
+    autocomplete_cache.miss()
+
+    def cache_choices(task: asyncio.Task):
+        if task.cancelled():
+            return
+
+        if task.exception():
+            if timed_out:
+                logging.error(f"Autocomplete handler for {ctx.command_name} failed", exc_info=task.exception())
+        elif ctx.response.autocomplete_choices is not None:
+            autocomplete_cache.set((scope, user_input), ctx.response.autocomplete_choices)
+
+    timed_out = False
+    task = asyncio.create_task(autocomplete_fn(ctx, focused_option, relevant_options))
+    task.add_done_callback(cache_choices)
+
+    done, _ = await asyncio.wait((task,), timeout=AUTOCOMPLETE_TIME_BUDGET)
+
+    if done:
+        return task.result()
+
+    timed_out = True
+    autocomplete_timeouts_counter.labels(command=ctx.command_name, option=focused_option.name).inc()
+
+    fallback_choices: list[AutocompleteOption] = []
+
+    for prefix_length in range(len(user_input) - 1, -1, -1):
+        shorter_choices = autocomplete_cache.peek((scope, user_input[:prefix_length]))
+
+        if shorter_choices is not None:
+            fallback_choices = shorter_choices
+            break
+
+    fallback_response = ctx.response.send_autocomplete(fallback_choices)
+    ctx.response.autocomplete_choices = None # only cache the choices of the handler once it finishes
+
+    return fallback_response
+
+
+@autocomplete_handler(prefix_filter=lambda choice, user_input: True)
 async def bind_category_autocomplete(ctx: "CommandContext", focused_option: hikari.AutocompleteInteractionOption, relevant_options: list[hikari.AutocompleteInteractionOption]):
     """Autocomplete for a bind category input based upon the binds the user has."""
 
@@ -120,6 +229,9 @@ async def roblox_group_lookup_autocomplete(ctx: "CommandContext", focused_option
 
     return ctx.response.send_autocomplete(result_list)
 
+@autocomplete_handler(
+    prefix_filter=lambda choice, user_input: choice.value == "no_group" or choice.name.lower().startswith(user_input)
+)
 async def roblox_group_roleset_autocomplete(ctx: "CommandContext", focused_option: hikari.AutocompleteInteractionOption, relevant_options: list[hikari.AutocompleteInteractionOption]):
     """Return a matching Roblox roleset from the user's input."""
 
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
-from typing import Type, Literal, Self, Annotated
+import functools
+from typing import Type, Literal, Self, Annotated, ClassVar
 from enum import Enum
 from abc import ABC, abstractmethod
 from pydantic import Field, field_validator
@@ -9,58 +10,31 @@ import hikari
 
 from resources.bloxlink import bloxlink
 from resources import commands
+from resources.ui.custom_id_codec import codec_for
 
 
 class BaseCustomID(BaseModel):
     """Base class for interactive custom IDs."""
 
+    # fields that are kept as written when serialized, since they are matched against custom ID routes
+    verbatim_fields: ClassVar[tuple[str, ...]] = ()
+
     @classmethod
     def from_str(cls: Type[Self], custom_id: str, **kwargs) -> Self:
         """Converts a custom_id string into a custom_id object."""
 
-        # Split the custom_id into parts
-        parts = custom_id.split(':')
-        attrs_parts: dict[str, str] = {field_tuple[0]: parts[index] for index, field_tuple in enumerate(cls.model_fields_index())}
-
-        for field_name, value in dict(attrs_parts).items():
-            if value == "":
-                del attrs_parts[field_name]
-
-        # Create an instance of the attrs dataclass with the custom_id values
-        custom_id_instance = cls(**attrs_parts, **kwargs)
-
-        # Return the dataclass instance, discarding additional values
-        return custom_id_instance
+        return codec_for(cls).decode(custom_id, **kwargs)
 
     def set_fields(self, **kwargs) -> Self:
         """Sets the fields in the custom_id object."""
 
-        # Split the existing custom_id into parts
-        parts = str(self).split(':')
-        attrs_parts: dict[str, str] = {field_tuple[0]: parts[index] for index, field_tuple in enumerate(self.model_fields_index())}
-
-        for field_name, value in dict(attrs_parts).items():
-            if value == "":
-                del attrs_parts[field_name]
-
-        # Update specified fields with the provided keyword arguments
         for field_name, value in kwargs.items():
             setattr(self, field_name, value)
 
         return self
 
     def __str__(self):
-        field_values: list[str] = []
-
-        for field_name in self.model_fields:
-            field_value = getattr(self, field_name)
-
-            if field_value is None:
-                field_values.append("")
-            else:
-                field_values.append(str(field_value))
-
-        return ":".join(field_values)
+        return codec_for(type(self)).encode(self)
 
     def __hash__(self) -> int:
         return hash(str(self))
@@ -79,6 +53,8 @@ class BaseCommandCustomID(BaseCustomID):
     command_name: str
     section: str = "" # used to differentiate between different sections of the same command
 
+    verbatim_fields = ("command_name", "section")
+
 class CommandCustomID(BaseCommandCustomID):
     """Custom ID containing more information for commands."""
 
@@ -88,6 +64,8 @@ class CommandCustomID(BaseCommandCustomID):
     type: Literal["command", "prompt", "paginator"] = "command"
     user_id: int = 0
 
+    verbatim_fields = ("command_name", "section", "subcommand_name", "type")
+
 
 class Component(BaseModelArbitraryTypes, ABC):
     """Abstract base class for components."""
@@ -300,6 +278,14 @@ async def get_component(message: hikari.Message, custom_id: str):
                 return component
 
 
+def build_action_rows(components: list[Component]) -> list[hikari.impl.MessageActionRowBuilder]:
+    """Build custom components into the action rows of a message."""
+
+    return clean_action_rows(
+        functools.reduce(lambda a, c: c.build(a), components, [bloxlink.rest.build_message_action_row()])
+    )
+
+
 async def set_components(message: hikari.Message, *, values: list = None, components: list = None):
     """Update the components on a message
 
@@ -309,9 +295,19 @@ async def set_components(message: hikari.Message, *, values: list = None, compon
         components (list, optional): The components to set on this message. Defaults to None.
     """
 
+    await message.edit(embeds=message.embeds, components=rebuild_components(message, components=components))
+
+
+def rebuild_components(message: hikari.Message, *, components: list = None) -> list:
+    """Rebuild the components of a message (or the given components) into builders that can be sent again.
+
+    Args:
+        message (hikari.Message): The message to rebuild the components of.
+        components (list, optional): Components to rebuild instead of the ones on the message. Defaults to None.
+    """
+
     new_components = []
     components = components or []
-    values = values or []
 
     iterate_components = []
 
@@ -422,7 +418,7 @@ async def set_components(message: hikari.Message, *, values: list = None, compon
 
             new_components.append(row)
 
-    await message.edit(embeds=message.embeds, components=new_components)
+    return new_components
 
 async def disable_components(
     interaction: hikari.ComponentInteraction | hikari.CommandInteraction,
@@ -564,7 +560,7 @@ def component_author_validation(parse_into: CommandCustomID=CommandCustomID, eph
             interaction = ctx.interaction
             parsed_custom_id = custom_id or parse_into.from_str(interaction.custom_id)
 
-            command_context = commands.build_context(interaction)
+            command_context = commands.build_context(interaction, response=ctx.response)
             response = command_context.response
 
             # Only accept input from the author of the command
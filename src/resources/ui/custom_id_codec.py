@@ -0,0 +1,213 @@
+from __future__ import annotations
+
+import logging
+import string
+import types
+from enum import Enum
+from functools import cache
+from typing import TYPE_CHECKING, Any, Callable, Literal, Union, get_args, get_origin
+
+from config import CONFIG
+
+if TYPE_CHECKING:
+    from resources.ui.components import BaseCustomID
+
+
+MAX_CUSTOM_ID_LENGTH = 100
+COMPACT_PREFIX = "~"  # marks a compacted value, so custom IDs made before compacting can still be decoded
+BASE62_ALPHABET = string.digits + string.ascii_letters
+SNOWFLAKE_MIN = 1 << 22  # anything smaller is not worth compacting, such as page numbers
+
+type Encoder = Callable[[Any], str]
+type Decoder = Callable[[str], Any]
+
+
+def encode_base62(number: int) -> str:
+    encoded = []
+
+    while True:
+        number, remainder = divmod(number, 62)
+        encoded.append(BASE62_ALPHABET[remainder])
+
+        if not number:
+            return "".join(reversed(encoded))
+
+
+def decode_base62(encoded: str) -> int:
+    number = 0
+
+    for character in encoded:
+        number = number * 62 + BASE62_ALPHABET.index(character)
+
+    return number
+
+
+def _encode_int(value: int) -> str:
+    if value >= SNOWFLAKE_MIN:
+        return COMPACT_PREFIX + encode_base62(value)
+
+    return str(value)
+
+
+def _encode_int_verbatim(value: int) -> str:
+    return str(value)
+
+
+def _decode_int(value: str) -> int:
+    if value.startswith(COMPACT_PREFIX):
+        return decode_base62(value[1:])
+
+    return int(value)
+
+
+def _encode_bool(value: bool) -> str:
+    return "1" if value else "0"
+
+
+def _decode_bool(value: str) -> bool:
+    match value.lower():
+        case "1" | "true":
+            return True
+        case "0" | "false":
+            return False
+
+    raise ValueError(f"Invalid boolean: {value}")
+
+
+def _choice_codec(choices: tuple[Any, ...]) -> tuple[Encoder, Decoder]:
+    """Encode the values of a Literal or an Enum as they are written, so that the choices can be reordered.
+
+    Enum members are written with str() as they always were, and their values are also accepted.
+    """
+
+    by_value = {str(getattr(choice, "value", choice)): choice for choice in choices}
+    by_value.update({str(choice): choice for choice in choices})
+
+    def decode(value: str) -> Any:
+        return by_value[value]
+
+    return str, decode
+
+
+class _UnsupportedField(Exception):
+    """The values of this field need to be validated by pydantic."""
+
+
+def _field_codec(annotation: Any, compact: bool) -> tuple[Encoder, Decoder] | None:
+    """Return the encoder and decoder for a field, or None if it is stored as a plain string."""
+
+    if get_origin(annotation) in (Union, types.UnionType):
+        field_types = [field_type for field_type in get_args(annotation) if field_type is not type(None)]
+
+        if len(field_types) != 1:
+            raise _UnsupportedField()
+
+        annotation = field_types[0]
+
+    if annotation is str:
+        return None
+
+    if annotation is bool:
+        return _encode_bool, _decode_bool
+
+    if annotation is int:
+        # compacted values are always decoded, so that they can be read by every node before any node writes them
+        return (_encode_int if compact else _encode_int_verbatim), _decode_int
+
+    if get_origin(annotation) is Literal:
+        return _choice_codec(get_args(annotation))
+
+    if isinstance(annotation, type) and issubclass(annotation, Enum):
+        return _choice_codec(tuple(annotation))
+
+    raise _UnsupportedField()
+
+
+class CustomIDCodec:
+    """Positional encoder and decoder for the fields of a custom ID class, compiled once per class.
+
+    Snowflakes are stored in base 62 when CONFIG.COMPACT_CUSTOM_IDS is enabled, to keep custom IDs under
+    Discord's length limit. Fields which are used for routing are never compacted.
+    """
+
+    __slots__ = ("custom_id_format", "field_names", "encoders", "decoders", "required_fields", "validate")
+
+    def __init__(self, custom_id_format: type[BaseCustomID]):
+        self.custom_id_format = custom_id_format
+        self.field_names: tuple[str, ...] = tuple(custom_id_format.model_fields)
+        self.encoders: list[Encoder | None] = []
+        self.decoders: list[Decoder | None] = []
+        self.required_fields = frozenset(
+            field_name for field_name, field in custom_id_format.model_fields.items() if field.is_required()
+        )
+        self.validate = False  # if any field has a type the codec can't decode, pydantic validates the values
+
+        for field_name, field in custom_id_format.model_fields.items():
+            try:
+                field_codec = _field_codec(
+                    field.annotation,
+                    CONFIG.COMPACT_CUSTOM_IDS and field_name not in custom_id_format.verbatim_fields,
+                )
+            except _UnsupportedField:
+                field_codec = None
+                self.validate = True
+
+            self.encoders.append(field_codec and field_codec[0])
+            self.decoders.append(field_codec and field_codec[1])
+
+    def encode(self, custom_id: BaseCustomID) -> str:
+        """Serialize a custom ID."""
+
+        values: list[str] = []
+
+        for field_name, encoder in zip(self.field_names, self.encoders):
+            value = getattr(custom_id, field_name)
+
+            if value is None:
+                values.append("")
+            elif encoder:
+                values.append(encoder(value))
+            else:
+                values.append(str(value))
+
+        encoded = ":".join(values)
+
+        if len(encoded) > MAX_CUSTOM_ID_LENGTH:
+            logging.warning(f"Custom ID is longer than {MAX_CUSTOM_ID_LENGTH} characters: {encoded}")
+
+        return encoded
+
+    def decode(self, custom_id: str, **kwargs) -> BaseCustomID:
+        """Parse a custom ID. Values that are missing are left to the defaults of the class."""
+
+        parts = {
+            field_name: value for field_name, value in zip(self.field_names, custom_id.split(":")) if value != ""
+        }
+
+        if self.validate:
+            return self.custom_id_format(**parts, **kwargs)
+
+        try:
+            values = {
+                field_name: decoder(parts[field_name]) if decoder else parts[field_name]
+                for field_name, decoder in zip(self.field_names, self.decoders)
+                if field_name in parts
+            }
+        except (ValueError, KeyError, IndexError):
+            # let pydantic raise the error for the invalid values
+            return self.custom_id_format(**parts, **kwargs)
+
+        values.update(kwargs)
+
+        if not self.required_fields.issubset(values):
+            # let pydantic raise the error for the missing fields
+            return self.custom_id_format(**values)
+
+        return self.custom_id_format.model_construct(**values)
+
+
+@cache
+def codec_for(custom_id_format: type[BaseCustomID]) -> CustomIDCodec:
+    """Get the codec of a custom ID class, compiling it on first use."""
+
+    return CustomIDCodec(custom_id_format)
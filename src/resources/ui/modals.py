@@ -1,4 +1,6 @@
+import base64
 import json
+from datetime import timedelta
 from typing import TypedDict
 from pydantic import Field
 import hikari
@@ -8,10 +10,41 @@ from resources.ui.components import TextInput, CommandCustomID, BaseCustomID
 from resources import response
 
 
+MAX_CUSTOM_ID_LENGTH = 100
+OPTIONS_IN_REDIS = "~" # not part of the base64 alphabet
+
+
 class ModalCustomID(CommandCustomID):
     """Represents a custom ID for a modal component."""
 
     component_custom_id: str = Field(default="")
+    command_options: str = Field(default="") # the options of the command, encoded if they fit in the custom ID
+
+    def set_command_options(self, options: dict | None):
+        """Encode the options of the command into this custom ID, or mark them as stored in Redis if they don't fit."""
+
+        if not options:
+            self.command_options = ""
+            return
+
+        self.command_options = base64.urlsafe_b64encode(
+            json.dumps(options, separators=(",", ":"), sort_keys=True).encode("utf-8")
+        ).decode("utf-8").rstrip("=")
+
+        if len(str(self)) > MAX_CUSTOM_ID_LENGTH:
+            self.command_options = OPTIONS_IN_REDIS
+
+    async def get_command_options(self) -> dict:
+        """Get the options of the command which opened this modal."""
+
+        if not self.command_options:
+            return {}
+
+        if self.command_options == OPTIONS_IN_REDIS:
+            command_options = await redis.get(f"modal_command_options:{self}")
+            return json.loads(command_options) if command_options else {}
+
+        return json.loads(base64.urlsafe_b64decode(self.command_options + "=" * (-len(self.command_options) % 4)))
 
 
 class ModalPromptArgs(TypedDict):
@@ -41,42 +74,41 @@ class Modal(BaseModelArbitraryTypes):
     async def submitted(self):
         """Returns whether the modal was submitted."""
 
-        if self.data is None:
-            await self.get_data()
-
         return self.data is not None
 
     async def get_data(self, *keys: tuple[str]):
-        """Returns the data from the modal."""
+        """Returns the data from the modal. This is only set when the modal is built from its own submission."""
 
-        modal_data = {}
-
-        if self.data is not None:
-            modal_data = self.data
-        else:
-            modal_data = await redis.get(f"modal_data:{self.custom_id}")
-
-            if modal_data is None:
-                return None
-
-            modal_data = json.loads(modal_data) if modal_data else {}
-
-        self.data = modal_data
+        if self.data is None:
+            return None
 
         if keys:
             if len(keys) == 1:
-                return modal_data.get(keys[0])
+                return self.data.get(keys[0])
 
-            return {key: modal_data.get(key) for key in keys}
+            return {key: self.data.get(key) for key in keys}
 
         return self.data
 
     async def clear_data(self):
         """Clears the data from the modal."""
 
-        await redis.delete(f"modal_data:{self.custom_id}")
         self.data = None
 
+    async def save_command_options(self):
+        """Save the options of the command to Redis, if they did not fit in the custom ID."""
+
+        if isinstance(self.custom_id, ModalCustomID) and self.custom_id.command_options == OPTIONS_IN_REDIS:
+            await redis.set(
+                f"modal_command_options:{self.custom_id}", self.command_options, expire=timedelta(hours=1)
+            )
+
+
+def modal_values(interaction: hikari.ModalInteraction) -> dict[str, str]:
+    """Get the values of the text inputs of a submitted modal."""
+
+    return {component.custom_id: component.value for action_row in interaction.components for component in action_row.components}
+
 
 async def build_modal(title: str, components: list[TextInput], *, interaction: hikari.ComponentInteraction | hikari.CommandInteraction, command_name: str, prompt_data: ModalPromptArgs = None, command_data: ModalCommandArgs = None) -> Modal:
     """Build a modal response. This needs to be separately returned."""
@@ -93,6 +125,7 @@ async def build_modal(title: str, components: list[TextInput], *, interaction: h
             subcommand_name=command_data.get("subcommand_name") or "",
             user_id=interaction.user.id,
         )
+        new_custom_id.set_command_options(command_data.get("options"))
     elif prompt_data is not None:
         custom_id_format: ModalCustomID = (await response.Prompt.find_prompt(prompt_data["original_custom_id"], interaction)).custom_id_format
 
@@ -107,8 +140,13 @@ async def build_modal(title: str, components: list[TextInput], *, interaction: h
         )
 
     modal_builder: hikari.impl.InteractionModalBuilder = None
+    modal_data: dict | None = None
 
-    if not isinstance(interaction, hikari.ModalInteraction):
+    if isinstance(interaction, hikari.ModalInteraction):
+        # this is the submission of the modal, so the handler can read the values straight from it
+        if interaction.custom_id == str(new_custom_id):
+            modal_data = modal_values(interaction)
+    else:
         modal_builder = interaction.build_modal_response(title, str(new_custom_id))
 
         for component in components:
@@ -130,5 +168,6 @@ async def build_modal(title: str, components: list[TextInput], *, interaction: h
     return Modal(
         builder=modal_builder,
         custom_id=new_custom_id,
+        data=modal_data,
         command_options=command_data.get("options") if command_data else None
     )
@@ -1,11 +1,15 @@
 from __future__ import annotations
 
+import json
 import math
-from typing import Any, Sequence, Coroutine, Literal, TYPE_CHECKING
+import secrets
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Sequence, Coroutine, Literal, Self, TYPE_CHECKING
 
 import hikari
+from bloxlink_lib.database import redis
 
-from resources.constants import UNICODE_LEFT, UNICODE_RIGHT
+from resources.constants import PAGINATOR_SNAPSHOT_TTL, UNICODE_LEFT, UNICODE_RIGHT
 from resources.ui.components import CommandCustomID, Component, Button, Separator, component_author_validation, disable_components
 
 if TYPE_CHECKING:
@@ -14,6 +18,22 @@ if TYPE_CHECKING:
 
 DEFAULT_MAX_PER_PAGE = 10
 
+# Returns 0 without writing anything if the snapshot must exist but expired, otherwise 1.
+# ARGV: TTL in ms, "1" if the snapshot must already exist, then the fields and their values.
+SAVE_PAGINATOR_SNAPSHOT = redis.register_script("""
+if ARGV[2] == "1" and redis.call("EXISTS", KEYS[1]) == 0 then
+    return 0
+end
+
+for i = 3, #ARGV, 2 do
+    redis.call("HSET", KEYS[1], ARGV[i], ARGV[i + 1])
+end
+
+redis.call("PEXPIRE", KEYS[1], ARGV[1])
+
+return 1
+""")
+
 
 class PaginatorCustomID(CommandCustomID):
     """Represents the custom ID for the paginator"""
@@ -23,11 +43,101 @@ class PaginatorCustomID(CommandCustomID):
     max_per_page: int = DEFAULT_MAX_PER_PAGE
     generate_components: bool = True
     include_cancel_button: bool = False
+    nonce: str = "" # key of the snapshot of the paginated items
 
     def model_post_init(self, __context: Any) -> None:
         self.type = "paginator"
 
 
+@dataclass(slots=True, frozen=True)
+class PaginatorItemCodec[T]:
+    """How the items of a paginator are stored in its snapshot.
+
+    Attributes:
+        dump: Converts an item into JSON serializable data.
+        load: Converts the stored data back into an item.
+        render: Optionally converts the items of a page into what is given to the formatter and the component
+            generator, such as binds with the names of their entities. The result must be JSON serializable,
+            since it is stored in the snapshot so that every page is only rendered once.
+    """
+
+    dump: Callable[[T], Any]
+    load: Callable[[Any], T]
+    render: Callable[[list[T]], Awaitable[list[Any]]] | None = None
+
+
+class PaginatorSnapshot:
+    """Ordered items of a paginator stored in Redis, so flipping pages doesn't load, filter and sort them again.
+
+    Every item is stored in its own hash field along with what was rendered for it, so a page flip only reads
+    the items of that page. The nonce of the snapshot is carried in the custom IDs of the paginator.
+    """
+
+    __slots__ = ("nonce", "item_count", "items", "rendered")
+
+    def __init__(self, nonce: str, item_count: int, items: dict[int, Any], rendered: dict[int, Any]):
+        self.nonce = nonce
+        self.item_count = item_count
+        self.items = items  # stored data of the items that were loaded, by index
+        self.rendered = rendered
+
+    @property
+    def key(self) -> str:
+        return f"paginator_snapshot:{self.nonce}"
+
+    @classmethod
+    async def create(cls, items: list[Any]) -> Self:
+        """Store a new snapshot of the given item data."""
+
+        snapshot = cls(secrets.token_urlsafe(6), len(items), dict(enumerate(items)), {})
+
+        await snapshot._save(
+            {"count": len(items), **{f"item:{index}": json.dumps(item) for index, item in enumerate(items)}},
+            must_exist=False,
+        )
+
+        return snapshot
+
+    @classmethod
+    async def load(cls, nonce: str, indexes: range) -> Self | None:
+        """Read the given items of a snapshot, or return None if it expired."""
+
+        snapshot = cls(nonce, 0, {}, {})
+        values = await redis.hmget(
+            snapshot.key, ["count", *(f"item:{index}" for index in indexes), *(f"rendered:{index}" for index in indexes)]
+        )
+
+        if values[0] is None:
+            return None
+
+        snapshot.item_count = int(values[0])
+
+        for index, item, rendered in zip(indexes, values[1 : len(indexes) + 1], values[len(indexes) + 1 :]):
+            if item is not None:
+                snapshot.items[index] = json.loads(item)
+
+            if rendered is not None:
+                snapshot.rendered[index] = json.loads(rendered)
+
+        return snapshot
+
+    async def save_rendered(self, rendered: dict[int, Any]):
+        """Store what was rendered for these items, unless the snapshot expired in the meantime."""
+
+        self.rendered.update(rendered)
+
+        await self._save({f"rendered:{index}": json.dumps(value) for index, value in rendered.items()}, must_exist=True)
+
+    async def delete(self):
+        await redis.delete(self.key)
+
+    async def _save(self, fields: dict[str, Any], must_exist: bool):
+        await SAVE_PAGINATOR_SNAPSHOT(
+            keys=[self.key],
+            args=[PAGINATOR_SNAPSHOT_TTL * 1000, int(must_exist), *(value for field in fields.items() for value in field)],
+        )
+
+
 class Paginator[T: PaginatorCustomID]:
     """Dynamically create prompts that may require more than one embed to cleanly show data."""
 
@@ -44,6 +154,7 @@ class Paginator[T: PaginatorCustomID]:
         custom_id_format: PaginatorCustomID = PaginatorCustomID,
         item_filter: Coroutine | None = None,
         include_cancel_button: bool = False,
+        item_codec: PaginatorItemCodec[T] | None = None,
     ):
         """Create a paginator handler.
 
@@ -64,6 +175,8 @@ class Paginator[T: PaginatorCustomID]:
                 Used to provide additional information to the additional components dynamically.
             item_filter (Callable, optional): Callable used to filter the entire item list. Defaults to None.
             include_cancel_button (bool, optional): Optionally include a button to cancel this prompt. Defaults to False.
+            item_codec (PaginatorItemCodec, optional): Used to snapshot the items, so that flipping pages reads them
+                from Redis instead of loading them again. See load() and save_snapshot(). Defaults to None.
         """
 
         self.guild_id = guild_id
@@ -71,10 +184,15 @@ class Paginator[T: PaginatorCustomID]:
 
         self.page_number = page_number
 
+        self.item_filter = item_filter
         self.items = items if not item_filter else item_filter(items)
-        self.max_pages = math.ceil(len(self.items) / max_items)
         self.max_items = max_items
 
+        self.item_codec = item_codec
+        self.snapshot: PaginatorSnapshot | None = None
+        self._page_items: list[T] | None = None  # only set if the items of this page were read from the snapshot
+        self._rendered_items: list | None = None
+
         self.custom_formatter = custom_formatter
         self.component_generation = component_generation
 
@@ -93,9 +211,8 @@ class Paginator[T: PaginatorCustomID]:
 
         from resources.commands import slash_commands
 
-        # TODO: Support deferring via yield for paginator.
-        ctx.response.defer_through_rest = True
-        await ctx.response.defer()
+        # the page is returned inline, or edited in over REST if this is deferred for being too slow
+        ctx.response.defer_as_update = True
 
         interaction = ctx.interaction
         guild_id = interaction.guild_id
@@ -122,7 +239,7 @@ class Paginator[T: PaginatorCustomID]:
             guild_id,
             author_id,
             max_items=max_items,
-            items=await command.paginator_options["return_items"](ctx),
+            items=(),
             page_number=page_number,
             custom_formatter=command.paginator_options["format_items"],
             component_generation=generate_components and command.paginator_options.get("component_generator"),
@@ -132,17 +249,72 @@ class Paginator[T: PaginatorCustomID]:
                 user_id=author_id,
             ),
             include_cancel_button=include_cancel_button,
+            item_codec=command.paginator_options.get("item_codec"),
         )
+        await paginator.load(lambda: command.paginator_options["return_items"](ctx), nonce=custom_id.nonce)
 
         embed = await paginator.embed
         components = await paginator.components
 
-        await ctx.response.send(embed=embed, components=components, edit_original=True)
+        return await ctx.response.send_first(embed=embed, components=components, edit_original=True)
+
+    async def load(self, load_items: Callable[[], Awaitable[Sequence[T]]], nonce: str = ""):
+        """Load the items of this paginator.
+
+        With an item codec, only the items of this page are read from the snapshot of the given nonce. If there is
+        no such snapshot, such as when it expired, every item is loaded again and a new snapshot is saved.
+
+        Args:
+            load_items (Callable): Returns every item of the paginator, before they are filtered.
+            nonce (str, optional): The nonce of the snapshot, from the custom ID. Defaults to "".
+        """
+
+        if self.item_codec and nonce:
+            offset = self.page_number * self.max_items
+            self.snapshot = await PaginatorSnapshot.load(nonce, range(offset, offset + self.max_items))
+
+        if self.snapshot:
+            self.items = None
+            self._page_items = [self.item_codec.load(self.snapshot.items[index]) for index in self.page_indexes]
+            self.custom_id_format.set_fields(nonce=self.snapshot.nonce)
+
+            return
+
+        items = await load_items()
+        self.items = items if not self.item_filter else self.item_filter(items)
+
+        if self.item_codec:
+            await self.save_snapshot()
+
+    async def save_snapshot(self):
+        """Store the items of this paginator in Redis, so flipping pages only needs to read the items of that page."""
+
+        self.snapshot = await PaginatorSnapshot.create([self.item_codec.dump(item) for item in self.items])
+        self.custom_id_format.set_fields(nonce=self.snapshot.nonce)
+
+    @property
+    def item_count(self) -> int:
+        return self.snapshot.item_count if self.snapshot else len(self.items)
+
+    @property
+    def max_pages(self) -> int:
+        return math.ceil(self.item_count / self.max_items)
+
+    @property
+    def page_indexes(self) -> range:
+        """Indexes of the items that apply to this page number."""
+
+        offset = self.page_number * self.max_items
+
+        return range(offset, min(offset + self.max_items, self.item_count))
 
     @property
     def current_items(self) -> list[T]:
         """Get the items that apply to this page number."""
 
+        if self._page_items is not None:
+            return self._page_items
+
         offset = self.page_number * self.max_items
         max_items = (
             len(self.items) if (offset + self.max_items >= len(self.items)) else offset + self.max_items
@@ -150,16 +322,43 @@ class Paginator[T: PaginatorCustomID]:
 
         return self.items[offset:max_items]
 
+    async def rendered_items(self) -> list:
+        """The items of this page as they are given to the formatter and the component generator.
+
+        Items are rendered by the item codec if it has a renderer, reusing what the snapshot has already rendered.
+        """
+
+        if not self.item_codec or not self.item_codec.render:
+            return self.current_items
+
+        if self._rendered_items is not None:
+            return self._rendered_items
+
+        rendered = dict(self.snapshot.rendered) if self.snapshot else {}
+        page_items = dict(zip(self.page_indexes, self.current_items))
+        missing = [index for index in self.page_indexes if index not in rendered]
+
+        if missing:
+            newly_rendered = dict(zip(missing, await self.item_codec.render([page_items[index] for index in missing])))
+            rendered.update(newly_rendered)
+
+            if self.snapshot:
+                await self.snapshot.save_rendered(newly_rendered)
+
+        self._rendered_items = [rendered[index] for index in self.page_indexes]
+
+        return self._rendered_items
+
     @property
     async def embed(self) -> hikari.Embed:
         """The embed that will be displayed to the user."""
 
         if self.custom_formatter:
             embed: hikari.Embed = await self.custom_formatter(
-                self.page_number, self.current_items, self.guild_id, self.max_pages
+                self.page_number, await self.rendered_items(), self.guild_id, self.max_pages
             )
         else:
-            embed = hikari.Embed(description="\n".join(str(item) for item in self.current_items))
+            embed = hikari.Embed(description="\n".join(str(item) for item in await self.rendered_items()))
             embed.set_footer(f"Page {self.page_number + 1}/{self.max_pages or 1}")
 
         self._embed = embed
@@ -210,8 +409,8 @@ class Paginator[T: PaginatorCustomID]:
 
         if self.component_generation:
             generated_components = await self.component_generation(
-                self.current_items,
-                self.custom_id_format,
+                await self.rendered_items(),
+                self.custom_id_format.set_fields(page_number=self.page_number),
             )
 
             if generated_components:
@@ -1,7 +1,8 @@
 import asyncio
 from asgi_prometheus import PrometheusMiddleware
-from prometheus_client import Histogram, Gauge
+from prometheus_client import Gauge
 from resources.commands import slash_commands
+from resources.manifest import command_manifest
 from ..webserver import application
 
 
@@ -9,14 +10,14 @@ prometheus = PrometheusMiddleware(application, metrics_url="/", group_paths=['/'
 
 
 commands_gauge = Gauge('commands_count', 'Number of commands registered')
-# commands_histogram = Histogram('commands_histogram', 'Time spent on commands')
+# interaction latency histograms are defined in resources.metrics
 
 
 
 async def main():
     """Starts/records all of the Prometheus counters"""
 
-    commands_gauge.set(len(slash_commands))
+    commands_gauge.set(len(slash_commands.keys() | command_manifest.commands.keys()))
 
 
 asyncio.run(main())
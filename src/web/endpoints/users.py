@@ -4,14 +4,18 @@ import logging
 import hikari
 from blacksheep import FromJSON, Request, ok, status_code
 from blacksheep.server.controllers import APIController, post, get
-from bloxlink_lib import BaseModel, MemberSerializable, RobloxDown, StatusCodes, get_user_account
-from bloxlink_lib.database import fetch_guild_data, redis
+from bloxlink_lib import BaseModel, MemberSerializable, RobloxDown, RobloxUser, StatusCodes, get_user_account
+from bloxlink_lib.database import redis
 
 from resources import binds
 from resources.bloxlink import bloxlink
-from resources.exceptions import BloxlinkForbidden
+from resources.constants import BIND_CALCULATION_BATCH_SIZE
+from resources.database import fetch_guild_data
+from resources.exceptions import BloxlinkForbidden, HTTPRequestFailed, Message
 from resources.user_permissions import get_user_type
 
+from config import CONFIG
+
 from ..decorators import authenticate
 
 
@@ -209,24 +213,58 @@ class Users(APIController):
 
 
 async def process_update_members(members: list[MemberSerializable], guild_id: str, nonce: str, dm_users: bool=False):
-    """Process a list of members to update from the gateway."""
+    """Process a list of members to update from the gateway.
+
+    When CONFIG.BATCH_BIND_CALCULATION is enabled, the roles of the members are calculated in batches, which send
+    the roles of the guild to the bind API once per batch instead of once per member.
+    """
 
-    for member in members:
+    members = [member for member in members if not member.is_bot]
+
+    for batch_start in range(0, len(members), BIND_CALCULATION_BATCH_SIZE):
         if await redis.get(f"progress:{nonce}:cancelled"):
             raise asyncio.CancelledError
 
-        if member.is_bot:
-            continue
+        batch = members[batch_start:batch_start + BIND_CALCULATION_BATCH_SIZE]
+        batch_accounts: list[tuple[MemberSerializable, RobloxUser | None]] = []
 
-        logging.debug(f"Update endpoint: updating member: {member.username}")
+        for member in batch:
+            try:
+                batch_accounts.append(
+                    (member, await get_user_account(member.id, guild_id=guild_id, raise_errors=False))
+                )
+            except RobloxDown:
+                continue
 
-        try:
-            roblox_account = await get_user_account(member.id, guild_id=guild_id, raise_errors=False)
-            await binds.apply_binds(member, guild_id, roblox_account, moderate_user=False, dm_user=dm_users)
-        except (BloxlinkForbidden, RobloxDown):
-            # bloxlink doesn't have permissions to give roles... might be good to
-            # TODO: stop after n attempts where this is received so that way we don't flood discord with
-            # 403 codes.
-            continue
-
-        await asyncio.sleep(1)
+        # without a batch, each member is calculated on its own by apply_binds()
+        batch_bound_roles = [None] * len(batch_accounts)
+
+        if CONFIG.BATCH_BIND_CALCULATION:
+            try:
+                guild = await bloxlink.fetch_guild_snapshot(guild_id)
+                batch_bound_roles = await binds.calculate_bound_roles_batch(guild, batch_accounts)
+            except (Message, RobloxDown, HTTPRequestFailed):
+                logging.warning(f"Update endpoint: could not calculate the roles of a batch of guild {guild_id}")
+
+        for (member, roblox_account), bound_roles in zip(batch_accounts, batch_bound_roles):
+            if await redis.get(f"progress:{nonce}:cancelled"):
+                raise asyncio.CancelledError
+
+            logging.debug(f"Update endpoint: updating member: {member.username}")
+
+            try:
+                await binds.apply_binds(
+                    member,
+                    guild_id,
+                    roblox_account,
+                    moderate_user=False,
+                    dm_user=dm_users,
+                    bound_roles=bound_roles,
+                )
+            except (BloxlinkForbidden, RobloxDown, HTTPRequestFailed):
+                # bloxlink doesn't have permissions to give roles... might be good to
+                # TODO: stop after n attempts where this is received so that way we don't flood discord with
+                # 403 codes.
+                continue
+
+            await asyncio.sleep(1)